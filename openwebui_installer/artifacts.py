@@ -0,0 +1,244 @@
+"""
+Content-addressed store of downloaded artifacts
+"""
+
+import logging
+import os
+import re
+import shutil
+import stat
+import sys
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Size the store is trimmed to after every addition unless configured otherwise
+DEFAULT_MAX_BYTES = 20 * 1024 ** 3
+# Overrides the cap, e.g. 5G or 500M
+MAX_SIZE_ENV = "OPENWEBUI_CACHE_MAX_SIZE"
+# Linux FICLONE ioctl: make a file share another's extents (Btrfs, XFS)
+_FICLONE = 0x40049409
+_SIZE_RE = re.compile(r"^(\d+(?:\.\d+)?)\s*([KMGT]?)(?:I?B)?$", re.IGNORECASE)
+_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+_DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+# Sidecar whose mtime is the artifact's last use
+_USED_SUFFIX = ".used"
+_READ_ONLY = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+
+
+def default_root() -> str:
+    return os.path.expanduser("~/.openwebui/cache")
+
+
+def parse_size(value: Union[str, int]) -> int:
+    """Bytes in ``value``: a number with an optional K, M, G or T (powers of 1024).
+
+    Raises ``ValueError`` for anything else.
+    """
+    match = _SIZE_RE.match(str(value).strip())
+    if match is None:
+        raise ValueError(f"Invalid size {value!r}; use e.g. 500M, 10G or a number of bytes")
+    return int(float(match.group(1)) * _UNITS[match.group(2).upper()])
+
+
+def _reflink(source: str, target: str) -> bool:
+    """Create ``target`` sharing ``source``'s blocks, where the filesystem can."""
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+
+    try:
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        return True
+    except OSError:
+        if os.path.exists(target):
+            os.remove(target)
+        return False
+
+
+def _share(source: str, target: str) -> bool:
+    """Make ``target`` a hard link to ``source``, else a reflink; ``False`` if neither works."""
+    try:
+        os.link(source, target)
+        return True
+    except FileNotFoundError:
+        raise
+    except OSError as e:
+        # Another filesystem, or one without hard links
+        logger.debug("Cannot link %s to %s: %s", source, target, e)
+    return _reflink(source, target)
+
+
+@dataclass
+class CacheEntry:
+    """One stored artifact; ``links`` counts destinations sharing its file."""
+
+    digest: str
+    size: int
+    last_used: float
+    links: int = 0
+
+
+@dataclass
+class CacheStats:
+    """Totals of an :class:`ArtifactStore`.
+
+    ``linked_bytes`` are also held by destinations through hard links, so
+    evicting them frees no space until those files go too.
+    """
+
+    root: str
+    count: int
+    bytes: int
+    max_bytes: int
+    linked_bytes: int
+
+
+class ArtifactStore:
+    """Downloaded files kept once each under ``root``, named by their SHA-256.
+
+    The store only keeps files it can share with their destinations, as
+    hard links or reflinks, so a file wanted in several places takes its
+    space once and keeping it costs nothing extra; a file on a filesystem
+    that allows neither is not stored. Stored and placed files are all
+    read-only, however they were placed, because writing to one would
+    change every destination linked to it.
+
+    Every use is recorded, and :meth:`prune` evicts the least recently
+    used artifacts until the store fits ``max_bytes``
+    (``OPENWEBUI_CACHE_MAX_SIZE`` or 20 GB by default). Destinations keep
+    their files when an artifact is evicted.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.root = root or default_root()
+        if max_bytes is None:
+            max_bytes = parse_size(os.environ.get(MAX_SIZE_ENV) or DEFAULT_MAX_BYTES)
+        self.max_bytes = max_bytes
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest)
+
+    def __contains__(self, digest: str) -> bool:
+        return os.path.exists(self.path(digest))
+
+    def add(self, path: str, digest: str) -> bool:
+        """Keep the file at ``path``, whose SHA-256 is ``digest``, by sharing its data.
+
+        ``path`` stays where it is and becomes read-only. A stored file
+        with that digest is replaced. Returns ``False``, storing nothing,
+        when the store's filesystem cannot share ``path``.
+        """
+        target = self.path(digest)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.chmod(path, _READ_ONLY)
+        tmp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            if not _share(path, tmp):
+                return False
+            os.replace(tmp, target)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self._touch(digest)
+        return True
+
+    def link(self, digest: str, dest: str, copy: bool = True) -> bool:
+        """Put the stored ``digest`` at ``dest``, replacing it.
+
+        Falls back to a (read-only) copy where the data cannot be shared,
+        unless ``copy`` is false. Returns ``False`` if ``digest`` is not
+        stored or could not be placed.
+        """
+        tmp = f"{dest}.{os.getpid()}.{threading.get_ident()}.link"
+        try:
+            if not _share(self.path(digest), tmp):
+                if not copy:
+                    return False
+                shutil.copyfile(self.path(digest), tmp)
+                os.chmod(tmp, _READ_ONLY)
+            os.replace(tmp, dest)
+        except FileNotFoundError:
+            # Never stored, or evicted meanwhile
+            return False
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self._touch(digest)
+        return True
+
+    def _touch(self, digest: str) -> None:
+        stamp = self.path(digest) + _USED_SUFFIX
+        try:
+            with open(stamp, "a"):
+                pass
+            os.utime(stamp)
+        except OSError as e:
+            logger.debug("Could not record use of %s: %s", digest, e)
+
+    def _last_used(self, path: str, st: os.stat_result) -> float:
+        try:
+            return os.stat(path + _USED_SUFFIX).st_mtime
+        except OSError:
+            return st.st_mtime
+
+    def entries(self) -> List[CacheEntry]:
+        """Every stored artifact, in no particular order."""
+        found = []
+        try:
+            prefixes = os.listdir(self.root)
+        except FileNotFoundError:
+            return []
+        for prefix in prefixes:
+            directory = os.path.join(self.root, prefix)
+            if not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                if not _DIGEST_RE.match(name):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                found.append(CacheEntry(name, st.st_size, self._last_used(path, st), st.st_nlink - 1))
+        return found
+
+    def stats(self) -> CacheStats:
+        entries = self.entries()
+        return CacheStats(
+            root=self.root,
+            count=len(entries),
+            bytes=sum(e.size for e in entries),
+            max_bytes=self.max_bytes,
+            linked_bytes=sum(e.size for e in entries if e.links),
+        )
+
+    def remove(self, digest: str) -> None:
+        for path in (self.path(digest), self.path(digest) + _USED_SUFFIX):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def prune(self, max_bytes: Optional[int] = None) -> List[CacheEntry]:
+        """Evict least recently used artifacts until the store fits ``max_bytes``.
+
+        ``max_bytes`` defaults to the store's cap. Returns what was evicted.
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = sorted(self.entries(), key=lambda e: e.last_used)
+        total = sum(e.size for e in entries)
+        evicted = []
+        for entry in entries:
+            if total <= limit:
+                break
+            self.remove(entry.digest)
+            total -= entry.size
+            evicted.append(entry)
+        if evicted:
+            logger.info("Evicted %d artifacts from %s", len(evicted), self.root)
+        return evicted
@@ -0,0 +1,287 @@
+"""
+Blue/green replacement of the Open WebUI container behind a port proxy
+"""
+
+import logging
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+CONTAINER_NAME = "open-webui"
+GREEN_CONTAINER_NAME = "open-webui-green"
+PROXY_CONTAINER_NAME = "open-webui-proxy"
+NETWORK_NAME = "open-webui-net"
+# DNS name the proxy forwards to; whichever container holds it gets traffic
+ACTIVE_ALIAS = "open-webui-active"
+DATA_VOLUME = "open-webui"
+SNAPSHOT_VOLUME = "open-webui-rollback"
+
+# Seconds a new container gets to answer its health check before rollback
+READY_TIMEOUT = 180
+# Seconds the proxy gets to answer on the published port after cutover
+PROXY_READY_TIMEOUT = 30
+# Seconds the old container gets to finish in-flight requests
+DRAIN_TIMEOUT = 10
+
+# TCP forwarder run with the Open WebUI image's own Python. The upstream name
+# is resolved for every new connection, so moving ACTIVE_ALIAS to another
+# container switches traffic without touching the published port.
+PROXY_SCRIPT = """
+import asyncio, os
+
+UPSTREAM = os.environ["UPSTREAM"]
+
+
+async def pipe(reader, writer):
+    try:
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+    finally:
+        writer.close()
+
+
+async def handle(client_reader, client_writer):
+    try:
+        reader, writer = await asyncio.open_connection(UPSTREAM, 8080)
+    except OSError:
+        client_writer.close()
+        return
+    await asyncio.gather(
+        pipe(client_reader, writer), pipe(reader, client_writer), return_exceptions=True
+    )
+
+
+async def main():
+    server = await asyncio.start_server(handle, "0.0.0.0", 8080)
+    async with server:
+        await server.serve_forever()
+
+
+asyncio.run(main())
+"""
+
+HEALTH_PROBE = (
+    "import urllib.request; "
+    "urllib.request.urlopen('http://localhost:8080/health', timeout=2)"
+)
+
+SNAPSHOT_SCRIPT = "rm -f /to/webui.db*; cp -a /from/webui.db* /to/ 2>/dev/null; true"
+
+
+class SwapError(Exception):
+    """Raised when a replacement container cannot be brought into service."""
+
+
+def remove_leftovers(client) -> None:
+    """Remove the proxy and any green container left by an interrupted swap."""
+    names = (GREEN_CONTAINER_NAME, PROXY_CONTAINER_NAME)
+    for container in client.containers.list(all=True, filters={"name": "open-webui-"}):
+        if container.name in names:
+            container.remove(force=True)
+
+
+def remove_resources(client) -> None:
+    """Remove the swap network and the database snapshot volume."""
+    for network in client.networks.list(names=[NETWORK_NAME]):
+        network.remove()
+    for volume in client.volumes.list(filters={"name": SNAPSHOT_VOLUME}):
+        if volume.name == SNAPSHOT_VOLUME:
+            volume.remove(force=True)
+
+
+class BlueGreenSwap:
+    """Replace the serving (blue) container with a new (green) one.
+
+    Green starts unpublished and must pass its health check from inside
+    the container before traffic moves; if it never does, it is discarded
+    and blue keeps serving its own database (see below). Traffic then moves to green through a
+    proxy container that owns the published port and forwards to whichever
+    container holds :data:`ACTIVE_ALIAS`. The first swap of a container that
+    publishes the port itself hands the port to the proxy, which costs one
+    proxy start rather than an Open WebUI boot. Blue is drained and removed
+    once the proxy answers through green.
+
+    Green shares blue's data volume, so a newer image may migrate the
+    database while blue still serves it. The database files are therefore
+    copied to :data:`SNAPSHOT_VOLUME` (with blue paused for consistency)
+    before green starts, and restored whenever a swap fails: blue is
+    stopped for the copy and started again, so it never serves a database
+    green may have migrated. The snapshot stays available until the next
+    swap.
+
+    ``start_container(port, image, name)`` starts an Open WebUI container
+    (``port=None`` leaves it unpublished), and ``wait(probe, timeout)``
+    polls ``probe`` until it returns ``True`` or the timeout passes.
+    """
+
+    def __init__(
+        self,
+        client,
+        image: str,
+        port: int,
+        start_container: Callable,
+        wait: Callable[[Callable[[], bool], float], bool],
+        http_ready: Callable[[int], bool],
+        ready_timeout: float = READY_TIMEOUT,
+    ):
+        self.client = client
+        self.image = image
+        self.port = port
+        self.start_container = start_container
+        self.wait = wait
+        self.http_ready = http_ready
+        self.ready_timeout = ready_timeout
+        self._created_proxy = False
+
+    def _get(self, name: str):
+        import docker
+
+        try:
+            return self.client.containers.get(name)
+        except docker.errors.NotFound:
+            return None
+
+    def _copy_database(self, source: str, target: str) -> None:
+        """Copy the Open WebUI database files between volumes."""
+        self.client.containers.run(
+            self.image,
+            entrypoint=["sh", "-c", SNAPSHOT_SCRIPT],
+            volumes={
+                source: {"bind": "/from", "mode": "ro"},
+                target: {"bind": "/to", "mode": "rw"},
+            },
+            remove=True,
+        )
+
+    def _snapshot(self, blue) -> None:
+        running = blue is not None and blue.status == "running"
+        if running:
+            blue.pause()
+        try:
+            self._copy_database(DATA_VOLUME, SNAPSHOT_VOLUME)
+        finally:
+            if running:
+                blue.unpause()
+
+    def _restore(self, blue) -> None:
+        """Put the snapshot back under blue, stopping it for the copy."""
+        running = blue is not None and blue.status == "running"
+        if running:
+            blue.stop(timeout=DRAIN_TIMEOUT)
+        try:
+            self._copy_database(SNAPSHOT_VOLUME, DATA_VOLUME)
+        finally:
+            if running:
+                blue.start()
+
+    def _network(self):
+        networks = self.client.networks.list(names=[NETWORK_NAME])
+        if networks:
+            return networks[0]
+        return self.client.networks.create(NETWORK_NAME, driver="bridge")
+
+    def green_ready(self, green) -> bool:
+        """Whether green answers its health endpoint from inside the container."""
+        result = green.exec_run(["python3", "-c", HEALTH_PROBE])
+        return result.exit_code == 0
+
+    def _start_proxy(self, network) -> None:
+        self.client.containers.run(
+            self.image,
+            name=PROXY_CONTAINER_NAME,
+            entrypoint=["python3", "-c", PROXY_SCRIPT],
+            environment={"UPSTREAM": ACTIVE_ALIAS},
+            ports={"8080/tcp": self.port},
+            network=network.name,
+            detach=True,
+            restart_policy={"Name": "unless-stopped"},
+        )
+        self._created_proxy = True
+
+    def _cut_over(self, green, blue) -> None:
+        import docker
+
+        network = self._network()
+        network.connect(green, aliases=[ACTIVE_ALIAS])
+        proxy = self._get(PROXY_CONTAINER_NAME)
+        if proxy is None:
+            # Blue publishes the port itself; hand it to the proxy
+            if blue is not None:
+                blue.stop(timeout=DRAIN_TIMEOUT)
+            self._start_proxy(network)
+        else:
+            if proxy.status != "running":
+                proxy.start()
+            if blue is not None:
+                try:
+                    network.disconnect(blue)
+                except docker.errors.APIError:
+                    pass  # Not attached to the proxy network
+
+        if not self.wait(lambda: self.http_ready(self.port), PROXY_READY_TIMEOUT):
+            raise SwapError(f"Open WebUI did not answer on port {self.port} after the switch")
+
+    def _roll_back(self, green, blue) -> None:
+        import docker
+
+        logger.warning("Swap to %s failed, restoring the previous container", self.image)
+        green.remove(force=True)
+        if blue is None:
+            return
+        blue.reload()
+        if blue.status == "running":
+            self._restore(blue)
+            try:
+                self._network().connect(blue, aliases=[ACTIVE_ALIAS])
+            except docker.errors.APIError:
+                pass  # Still attached
+            return
+
+        if self._created_proxy:
+            proxy = self._get(PROXY_CONTAINER_NAME)
+            if proxy is not None:
+                proxy.remove(force=True)
+        self._copy_database(SNAPSHOT_VOLUME, DATA_VOLUME)
+        blue.start()
+
+    def _retire(self, green, blue) -> None:
+        if blue is not None:
+            blue.stop(timeout=DRAIN_TIMEOUT)
+            blue.remove()
+        green.rename(CONTAINER_NAME)
+
+    def run(self) -> None:
+        """Perform the swap, rolling back on failure."""
+        blue = self._get(CONTAINER_NAME)
+        if blue is None and self._get(PROXY_CONTAINER_NAME) is None:
+            # Nothing is serving yet, so there is nothing to keep up
+            self.start_container(self.port, self.image)
+            return
+
+        self._snapshot(blue)
+        stale = self._get(GREEN_CONTAINER_NAME)
+        if stale is not None:
+            stale.remove(force=True)
+        green = self.start_container(None, self.image, GREEN_CONTAINER_NAME)
+
+        if not self.wait(lambda: self.green_ready(green), self.ready_timeout):
+            green.remove(force=True)
+            if blue is not None:
+                blue.reload()
+            self._restore(blue)
+            raise SwapError(
+                f"New container for {self.image} did not become ready; kept the current one running"
+                " on its own data"
+            )
+
+        try:
+            self._cut_over(green, blue)
+        except Exception:
+            self._roll_back(green, blue)
+            raise
+        self._retire(green, blue)
+        logger.info("Swapped Open WebUI container to %s", self.image)
@@ -3,26 +3,107 @@ Command-line interface for Open WebUI Installer
 """
 
 import sys
+import json
 import logging
 import os
-import shutil
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 import click
-from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from . import __version__
-from .installer import Installer
-
-console = Console()
+from .console import LazyConsole, LineWriter
+from .diagnostics import DEFAULT_CONTAINER_LINES
+from .models import DEFAULT_CONCURRENCY
+from .readiness import ReadinessResult
+from .runtime import RuntimeConnection
+
+if TYPE_CHECKING:
+    from .installer import Installer
+
+# Heavy modules (docker, requests, rich) are imported inside the commands that
+# use them so ``--help``, ``--version`` and ``status`` start quickly.
+console = LazyConsole()
 logger = logging.getLogger(__name__)
 
 
-def validate_system(runtime: str, verbose: bool = False) -> bool:
+def _spinner():
+    """Create the spinner shown while a command runs."""
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console.unwrap(),
+    )
+
+
+def _transfer_progress():
+    """Create the progress display used for image and model pulls."""
+    from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn
+
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TextColumn("{task.fields[detail]}"),
+        console=console.unwrap(),
+    )
+
+
+class TransferDisplay:
+    """Render :class:`~openwebui_installer.progress.ProgressEvent` updates.
+
+    One bar is kept per transfer (image or model); events may arrive from
+    the installer's worker threads.
+    """
+
+    def __init__(self, progress):
+        self.progress = progress
+        self._tasks = {}
+
+    def __call__(self, event) -> None:
+        key = (event.source, event.name)
+        detail = event.detail()
+        if key not in self._tasks:
+            self._tasks[key] = self.progress.add_task(
+                f"{event.source.capitalize()} {event.name}", total=None, detail=""
+            )
+        task = self._tasks[key]
+        if event.stalled:
+            detail = f"[yellow]{detail}[/yellow]"
+        self.progress.update(task, completed=event.completed, total=event.total, detail=detail)
+
+
+def _ready_note(result) -> str:
+    """`` (ready in 12.3s)`` for a readiness measurement, else nothing."""
+    if isinstance(result, ReadinessResult) and result.ready:
+        return f" (ready in {result.elapsed:.1f}s)"
+    return ""
+
+
+timeout_option = click.option(
+    "--timeout",
+    type=float,
+    default=None,
+    help="Seconds to wait for Open WebUI to become ready (default 180)",
+)
+
+
+def _make_installer(ctx) -> "Installer":
+    """Create an installer bound to the command's shared runtime connection."""
+    from .installer import Installer
+
+    obj = ctx.obj or {}
+    return Installer(
+        runtime=obj.get("runtime", "docker"),
+        verbose=obj.get("verbose", False),
+        connection=obj.get("connection"),
+    )
+
+
+def validate_system(installer: "Installer", verbose: bool = False) -> bool:
     """Validate system requirements."""
     try:
-        installer = Installer(runtime=runtime, verbose=verbose)
         installer._check_system_requirements()
         return True
     except Exception as e:
@@ -48,41 +129,103 @@ def cli(ctx, runtime, verbose):
     ctx.obj["runtime"] = runtime
     ctx.obj["verbose"] = verbose
 
+    # Opened lazily, so commands that never touch the runtime pay nothing for it
+    connection = RuntimeConnection(runtime)
+    ctx.obj["connection"] = connection
+    ctx.call_on_close(connection.close)
+
     if verbose:
         logging.basicConfig(level=logging.INFO)
         logger.info("CLI initialized with runtime: %s, verbose: %s", runtime, verbose)
 
 
+def _collect_models(models: Tuple[str, ...], manifest: Optional[str]) -> List[str]:
+    """Model names from repeated ``--model`` options plus a manifest file."""
+    from .models import load_manifest, unique_models
+
+    names = list(models)
+    if manifest:
+        names.extend(load_manifest(manifest))
+    return unique_models(names)
+
+
+def _print_model_results(results) -> None:
+    """Render the outcome and timing of each model pull."""
+    for result in results:
+        if result.status == "pulled":
+            console.print(f"[green]✓[/green] {result.name} pulled in {result.duration:.1f}s")
+        elif result.status == "present":
+            console.print(f"[green]✓[/green] {result.name} already available")
+        elif result.status == "failed":
+            console.print(f"[red]✗[/red] {result.name} failed after {result.duration:.1f}s: {result.error}")
+        else:
+            console.print(f"[yellow]-[/yellow] {result.name} not pulled")
+
+
+models_file_option = click.option(
+    "--models-file",
+    type=click.Path(exists=True, dir_okay=False),
+    help="File listing Ollama models (JSON list or one per line)",
+)
+concurrency_option = click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CONCURRENCY,
+    show_default=True,
+    help="Number of models to pull at once",
+)
+
+
 @cli.command()
-@click.option("--model", "-m", help="Ollama model to install", default="llama2")
+@click.option("--model", "-m", "models", multiple=True, help="Ollama model to install (repeatable, default llama2)")
+@models_file_option
+@concurrency_option
 @click.option("--port", "-p", help="Port to run Open WebUI on", default=3000, type=int)
 @click.option("--force", "-f", is_flag=True, help="Force installation even if already installed")
 @click.option("--image", help="Custom Open WebUI image to use")
+@timeout_option
 @click.pass_context
-def install(ctx, model: str, port: int, force: bool, image: Optional[str]):
+def install(
+    ctx,
+    models: Tuple[str, ...],
+    models_file: Optional[str],
+    concurrency: int,
+    port: int,
+    force: bool,
+    image: Optional[str],
+    timeout: Optional[float],
+):
     """Install Open WebUI and configure Ollama integration."""
     try:
-        runtime = (ctx.obj or {}).get("runtime", "docker")
         verbose = (ctx.obj or {}).get("verbose", False)
+        names = _collect_models(models, models_file) or ["llama2"]
+        model = names[0] if len(names) == 1 else names
 
         if verbose:
-            logger.info("CLI install command invoked with model: %s, port: %d", model, port)
-
-        if not validate_system(runtime, verbose):
-            sys.exit(1)
-
-        with Installer(runtime=runtime, verbose=verbose) as installer:
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=console,
-            ) as progress:
-                task = progress.add_task("Installing Open WebUI...", total=None)
-                installer.install(model=model, port=port, force=force, image=image)
+            logger.info("CLI install command invoked with models: %s, port: %d", ", ".join(names), port)
+
+        with _make_installer(ctx) as installer:
+            if not validate_system(installer, verbose):
+                sys.exit(1)
+            if timeout is not None:
+                installer.ready_timeout = timeout
+            installer.model_concurrency = concurrency
+
+            with _transfer_progress() as progress:
+                task = progress.add_task("Installing Open WebUI...", total=None, detail="")
+                installer.progress_callback = TransferDisplay(progress)
+                report = installer.install(model=model, port=port, force=force, image=image)
                 progress.update(task, completed=True)
+            readiness = installer.readiness
+            model_results = installer.model_results
 
         console.print("[green]✓[/green] Installation complete!")
-        console.print(f"\nOpen WebUI is now available at: http://localhost:{port}")
+        if len(names) > 1:
+            _print_model_results(model_results)
+        if verbose:
+            for phase in report.phases:
+                console.print(f"  {phase.name}: {phase.status} in {phase.duration:.1f}s")
+        console.print(f"\nOpen WebUI is now available at: http://localhost:{port}{_ready_note(readiness)}")
 
     except Exception as e:
         if (ctx.obj or {}).get("verbose", False):
@@ -100,18 +243,13 @@ def uninstall(ctx):
         return
 
     try:
-        runtime = (ctx.obj or {}).get("runtime", "docker")
         verbose = (ctx.obj or {}).get("verbose", False)
 
         if verbose:
             logger.info("CLI uninstall command invoked")
 
-        with Installer(runtime=runtime, verbose=verbose) as installer:
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=console,
-            ) as progress:
+        with _make_installer(ctx) as installer:
+            with _spinner() as progress:
                 task = progress.add_task("Uninstalling Open WebUI...", total=None)
                 installer.uninstall()
                 progress.update(task, completed=True)
@@ -125,28 +263,73 @@ def uninstall(ctx):
         sys.exit(1)
 
 
+def _print_status(status) -> None:
+    """Render the installation status."""
+    if status["installed"]:
+        console.print("[green]✓[/green] Open WebUI is installed")
+        console.print(f"Version: {status['version']}")
+        console.print(f"Port: {status['port']}")
+        console.print(f"Model: {status['model']}")
+        console.print(f"Status: {'Running' if status['running'] else 'Stopped'}")
+    else:
+        console.print("[yellow]![/yellow] Open WebUI is not installed")
+
+
+def _describe_change(change) -> str:
+    """One line for a watched status change."""
+    import time
+
+    status = change.status
+    parts = ["running" if status["running"] else "stopped"]
+    if status.get("health"):
+        parts.append(f"health {status['health']}")
+    if status.get("exit_code") is not None:
+        parts.append(f"exit code {status['exit_code']}")
+    if status.get("oom"):
+        parts.append("out of memory")
+    stamp = time.strftime("%H:%M:%S", time.localtime(change.time))
+    return f"{stamp} {change.action}: {', '.join(parts)}"
+
+
+def _watch_status(installer, as_json: bool) -> None:
+    """Print every status change until interrupted."""
+    from .watcher import StatusWatcher
+
+    def show(change):
+        if as_json:
+            click.echo(json.dumps(change.to_dict()))
+        else:
+            console.print(_describe_change(change))
+
+    watcher = StatusWatcher(installer, show)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        watcher.stop()
+
+
 @cli.command()
+@click.option("--watch", "-w", is_flag=True, help="Keep running and report every state change")
+@click.option("--json", "as_json", is_flag=True, help="Print status as JSON (one line per change with --watch)")
 @click.pass_context
-def status(ctx):
+def status(ctx, watch: bool, as_json: bool):
     """Check Open WebUI installation status."""
     try:
-        runtime = (ctx.obj or {}).get("runtime", "docker")
         verbose = (ctx.obj or {}).get("verbose", False)
 
         if verbose:
             logger.info("CLI status command invoked")
 
-        with Installer(runtime=runtime, verbose=verbose) as installer:
+        with _make_installer(ctx) as installer:
+            if watch:
+                _watch_status(installer, as_json)
+                return
             status = installer.get_status()
 
-        if status["installed"]:
-            console.print("[green]✓[/green] Open WebUI is installed")
-            console.print(f"Version: {status['version']}")
-            console.print(f"Port: {status['port']}")
-            console.print(f"Model: {status['model']}")
-            console.print(f"Status: {'Running' if status['running'] else 'Stopped'}")
+        if as_json:
+            click.echo(json.dumps(status))
         else:
-            console.print("[yellow]![/yellow] Open WebUI is not installed")
+            _print_status(status)
 
     except Exception as e:
         if (ctx.obj or {}).get("verbose", False):
@@ -155,28 +338,70 @@ def status(ctx):
         sys.exit(1)
 
 
+def _print_preflight(report) -> None:
+    """Render a preflight report, one line per check."""
+    for result in report.results:
+        if result.ok:
+            mark = "[green]✓[/green]"
+        elif result.required:
+            mark = "[red]✗[/red]"
+        else:
+            mark = "[yellow]-[/yellow]"
+        line = f"{mark} {result.name} ({result.duration:.2f}s)"
+        if result.message and not result.ok:
+            line += f": {result.message}"
+        console.print(line)
+
+
 @cli.command()
+@click.option("--json", "as_json", is_flag=True, help="Print the report as JSON")
 @click.pass_context
-def start(ctx):
+def preflight(ctx, as_json: bool):
+    """Check system requirements and report every failure."""
+    try:
+        verbose = (ctx.obj or {}).get("verbose", False)
+
+        if verbose:
+            logger.info("CLI preflight command invoked")
+
+        with _make_installer(ctx) as installer:
+            report = installer.preflight()
+
+        if as_json:
+            click.echo(json.dumps(report.to_dict(), indent=2))
+        else:
+            _print_preflight(report)
+
+        if not report.ok:
+            sys.exit(1)
+
+    except Exception as e:
+        if (ctx.obj or {}).get("verbose", False):
+            logger.error("Preflight command failed: %s", str(e))
+        console.print(f"[red]Error:[/red] {str(e)}")
+        sys.exit(1)
+
+
+@cli.command()
+@timeout_option
+@click.pass_context
+def start(ctx, timeout: Optional[float]):
     """Start Open WebUI container."""
     try:
-        runtime = (ctx.obj or {}).get("runtime", "docker")
         verbose = (ctx.obj or {}).get("verbose", False)
 
         if verbose:
             logger.info("CLI start command invoked")
 
-        with Installer(runtime=runtime, verbose=verbose) as installer:
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=console,
-            ) as progress:
+        with _make_installer(ctx) as installer:
+            if timeout is not None:
+                installer.ready_timeout = timeout
+            with _spinner() as progress:
                 task = progress.add_task("Starting Open WebUI...", total=None)
-                installer.start()
+                readiness = installer.start()
                 progress.update(task, completed=True)
 
-        console.print("[green]✓[/green] Open WebUI started!")
+        console.print(f"[green]✓[/green] Open WebUI started!{_ready_note(readiness)}")
 
     except Exception as e:
         if (ctx.obj or {}).get("verbose", False):
@@ -190,18 +415,13 @@ def start(ctx):
 def stop(ctx):
     """Stop Open WebUI container."""
     try:
-        runtime = (ctx.obj or {}).get("runtime", "docker")
         verbose = (ctx.obj or {}).get("verbose", False)
 
         if verbose:
             logger.info("CLI stop command invoked")
 
-        with Installer(runtime=runtime, verbose=verbose) as installer:
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=console,
-            ) as progress:
+        with _make_installer(ctx) as installer:
+            with _spinner() as progress:
                 task = progress.add_task("Stopping Open WebUI...", total=None)
                 installer.stop()
                 progress.update(task, completed=True)
@@ -216,27 +436,25 @@ def stop(ctx):
 
 
 @cli.command()
+@timeout_option
 @click.pass_context
-def restart(ctx):
+def restart(ctx, timeout: Optional[float]):
     """Restart Open WebUI container."""
     try:
-        runtime = (ctx.obj or {}).get("runtime", "docker")
         verbose = (ctx.obj or {}).get("verbose", False)
 
         if verbose:
             logger.info("CLI restart command invoked")
 
-        with Installer(runtime=runtime, verbose=verbose) as installer:
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=console,
-            ) as progress:
+        with _make_installer(ctx) as installer:
+            if timeout is not None:
+                installer.ready_timeout = timeout
+            with _spinner() as progress:
                 task = progress.add_task("Restarting Open WebUI...", total=None)
-                installer.restart()
+                readiness = installer.restart()
                 progress.update(task, completed=True)
 
-        console.print("[green]✓[/green] Open WebUI restarted!")
+        console.print(f"[green]✓[/green] Open WebUI restarted!{_ready_note(readiness)}")
 
     except Exception as e:
         if (ctx.obj or {}).get("verbose", False):
@@ -246,27 +464,29 @@ def restart(ctx):
 
 
 @cli.command()
+@timeout_option
 @click.pass_context
-def update(ctx):
+def update(ctx, timeout: Optional[float]):
     """Update Open WebUI to the latest version."""
     try:
-        runtime = (ctx.obj or {}).get("runtime", "docker")
         verbose = (ctx.obj or {}).get("verbose", False)
 
         if verbose:
             logger.info("CLI update command invoked")
 
-        with Installer(runtime=runtime, verbose=verbose) as installer:
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=console,
-            ) as progress:
-                task = progress.add_task("Updating Open WebUI...", total=None)
-                installer.update()
+        with _make_installer(ctx) as installer:
+            if timeout is not None:
+                installer.ready_timeout = timeout
+            with _transfer_progress() as progress:
+                task = progress.add_task("Updating Open WebUI...", total=None, detail="")
+                installer.progress_callback = TransferDisplay(progress)
+                updated = installer.update()
                 progress.update(task, completed=True)
 
-        console.print("[green]✓[/green] Open WebUI updated!")
+        if updated is False:
+            console.print("[green]✓[/green] Open WebUI is already up to date")
+        else:
+            console.print("[green]✓[/green] Open WebUI updated!")
 
     except Exception as e:
         if (ctx.obj or {}).get("verbose", False):
@@ -275,6 +495,129 @@ def update(ctx):
         sys.exit(1)
 
 
+@cli.group()
+def models():
+    """Manage Ollama models."""
+
+
+@models.command("pull")
+@click.argument("names", nargs=-1)
+@models_file_option
+@concurrency_option
+@click.pass_context
+def models_pull(ctx, names: Tuple[str, ...], models_file: Optional[str], concurrency: int):
+    """Pull Ollama models, skipping those already available."""
+    verbose = (ctx.obj or {}).get("verbose", False)
+    try:
+        wanted = _collect_models(names, models_file)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--models-file")
+    if not wanted:
+        raise click.UsageError("Name at least one model or pass --models-file")
+
+    try:
+        if verbose:
+            logger.info("CLI models pull command invoked with: %s", ", ".join(wanted))
+
+        with _make_installer(ctx) as installer:
+            with _transfer_progress() as progress:
+                installer.progress_callback = TransferDisplay(progress)
+                results = installer.pull_models(wanted, concurrency=concurrency)
+
+        _print_model_results(results)
+        if not all(result.ok for result in results):
+            sys.exit(1)
+
+    except Exception as e:
+        if verbose:
+            logger.error("Models pull command failed: %s", str(e))
+        console.print(f"[red]Error:[/red] {str(e)}")
+        sys.exit(1)
+
+
+@cli.group()
+def cache():
+    """Manage the local artifact cache."""
+
+
+@cache.command("stats")
+@click.option("--json", "as_json", is_flag=True, help="Print the statistics as JSON")
+@click.pass_context
+def cache_stats(ctx, as_json: bool):
+    """Show what the artifact cache holds."""
+    from dataclasses import asdict
+
+    from .artifacts import ArtifactStore
+    from .progress import format_bytes
+
+    try:
+        stats = ArtifactStore().stats()
+        if as_json:
+            click.echo(json.dumps(asdict(stats)))
+            return
+        console.print(f"Location:  {stats.root}")
+        console.print(f"Artifacts: {stats.count}")
+        console.print(f"Size:      {format_bytes(stats.bytes)} of {format_bytes(stats.max_bytes)}")
+        console.print(f"Linked:    {format_bytes(stats.linked_bytes)} also in use outside the cache")
+
+    except Exception as e:
+        if (ctx.obj or {}).get("verbose", False):
+            logger.error("Cache stats command failed: %s", str(e))
+        console.print(f"[red]Error:[/red] {str(e)}")
+        sys.exit(1)
+
+
+@cache.command("prune")
+@click.option("--max-size", help="Shrink the cache to this size (e.g. 500M, 5G) instead of its cap")
+@click.option("--all", "prune_all", is_flag=True, help="Remove every cached artifact")
+@click.pass_context
+def cache_prune(ctx, max_size: Optional[str], prune_all: bool):
+    """Evict least recently used artifacts until the cache fits its size cap.
+
+    Files already placed elsewhere are kept; only the cache's copy goes.
+    """
+    from .artifacts import ArtifactStore, parse_size
+    from .progress import format_bytes
+
+    try:
+        limit = 0 if prune_all else parse_size(max_size) if max_size else None
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--max-size")
+
+    try:
+        evicted = ArtifactStore().prune(limit)
+        freed = sum(entry.size for entry in evicted)
+        console.print(f"[green]✓[/green] Removed {len(evicted)} artifacts ({format_bytes(freed)})")
+
+    except Exception as e:
+        if (ctx.obj or {}).get("verbose", False):
+            logger.error("Cache prune command failed: %s", str(e))
+        console.print(f"[red]Error:[/red] {str(e)}")
+        sys.exit(1)
+
+
+def _show_installer_log(path: str, lines: int, follow: bool, line_filter, count: bool) -> int:
+    """Print the end of the installer log (and its backups), then optionally follow it.
+
+    Returns the number of lines that passed ``line_filter``.
+    """
+    from . import logtail
+
+    matched = 0
+    lines_iter = logtail.tail(path, lines)
+    try:
+        # Log lines are printed verbatim, not as rich markup
+        with LineWriter(console) as out:
+            for source in (lines_iter, logtail.follow(path) if follow else ()):
+                for line in line_filter.apply(source):
+                    matched += 1
+                    if not count:
+                        out.write(line)
+    except KeyboardInterrupt:
+        pass
+    return matched
+
+
 @cli.command()
 @click.option(
     "--lines",
@@ -282,49 +625,68 @@ def update(ctx):
     "--tail",
     "-t",
     "lines",
-    help="Number of log lines to show",
-    default=50,
-    type=int,
+    help="Number of log lines to show [default: 50, or all when filtering container logs]",
+    default=None,
+    type=click.IntRange(min=0),
 )
 @click.option("--follow", "-f", is_flag=True, help="Follow log output")
+@click.option("--container", "-c", is_flag=True, help="Show the Open WebUI container logs instead")
+@click.option("--since", help="Container logs since a time (10m, 2h, 1d, Unix time or ISO 8601)")
+@click.option("--until", help="Container logs until a time (same formats as --since)")
+@click.option("--grep", "-g", "pattern", help="Only lines matching this regular expression")
+@click.option("--ignore-case", "-i", is_flag=True, help="Match --grep case-insensitively")
+@click.option(
+    "--level",
+    type=click.Choice(["debug", "info", "warning", "error", "critical"], case_sensitive=False),
+    help="Only lines at or above this level",
+)
+@click.option("--count", is_flag=True, help="Print the number of matching lines instead of the lines")
 @click.option(
     "--export",
     "export_path",
     type=click.Path(dir_okay=False, writable=True),
-    help="Copy installer log file to PATH",
+    help="Write a diagnostics bundle to PATH (same as export-diagnostics)",
 )
 @click.pass_context
-def logs(ctx, lines: int, follow: bool, export_path: Optional[str]):
-    """Show installer logs or export the log file."""
+def logs(ctx, lines: Optional[int], follow: bool, container: bool, since: Optional[str], until: Optional[str],
+         pattern: Optional[str], ignore_case: bool, level: Optional[str], count: bool, export_path: Optional[str]):
+    """Show installer or container logs, optionally filtered, or export them.
+
+    --since and --until select container logs and are applied by the
+    runtime, so only that window is transferred.
+    """
+    from .logfilter import LineFilter
+
     try:
-        runtime = (ctx.obj or {}).get("runtime", "docker")
         verbose = (ctx.obj or {}).get("verbose", False)
+        line_filter = LineFilter(pattern, level, ignore_case)
 
         if verbose:
             logger.info(
-                "CLI logs command invoked with lines: %d, follow: %s, export: %s",
+                "CLI logs command invoked with lines: %s, follow: %s, export: %s",
                 lines,
                 follow,
                 export_path,
             )
 
-        with Installer(runtime=runtime, verbose=verbose) as installer:
+        with _make_installer(ctx) as installer:
             if export_path:
-                shutil.copy(installer.log_file, export_path)
-                console.print(f"[green]✓[/green] Log file exported to {export_path}")
-                return
-
-            if follow:
-                installer.show_logs(lines=lines, follow=True)
+                _export_diagnostics(installer, export_path, DEFAULT_CONTAINER_LINES if lines is None else lines, since)
                 return
 
-            if os.path.exists(installer.log_file):
-                with open(installer.log_file, "r") as f:
-                    log_lines = f.readlines()
-                for line in log_lines[-lines:]:
-                    console.print(line.rstrip())
+            if container or since or until or not os.path.exists(installer.log_file):
+                # Searching a window means all of it unless a tail was asked for
+                tail = lines if lines is not None else ("all" if line_filter.active or since or count else 50)
+                matched = installer.show_logs(
+                    tail=tail, follow=follow, since=since, until=until,
+                    pattern=pattern, level=level, count=count, ignore_case=ignore_case,
+                )
             else:
-                installer.show_logs(lines=lines, follow=False)
+                matched = _show_installer_log(installer.log_file, 50 if lines is None else lines,
+                                              follow, line_filter, count)
+
+        if count:
+            click.echo(matched)
 
     except Exception as e:
         if (ctx.obj or {}).get("verbose", False):
@@ -333,19 +695,67 @@ def logs(ctx, lines: int, follow: bool, export_path: Optional[str]):
         sys.exit(1)
 
 
+def _export_diagnostics(installer: "Installer", path: str, lines: int, since: Optional[str]) -> None:
+    """Write the diagnostics bundle and summarize what went into it."""
+    from .diagnostics import export_diagnostics
+
+    with _spinner() as progress:
+        progress.add_task(description="Collecting diagnostics...", total=None)
+        manifest = export_diagnostics(installer, path, container_lines=lines, since=since)
+    console.print(f"[green]✓[/green] Diagnostics written to {path} ({len(manifest['files'])} files)")
+    for name, error in manifest["errors"].items():
+        console.print(f"[yellow]![/yellow] {name} not included: {error}")
+
+
+@cli.command("export-diagnostics")
+@click.argument("output", required=False, type=click.Path(dir_okay=False, writable=True))
+@click.option(
+    "--lines",
+    "-n",
+    default=DEFAULT_CONTAINER_LINES,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Container log lines to include",
+)
+@click.option("--since", help="Only container logs since a time (10m, 2h, 1d, Unix time or ISO 8601)")
+@click.pass_context
+def export_diagnostics(ctx, output: Optional[str], lines: int, since: Optional[str]):
+    """Bundle logs, redacted config, runtime details and preflight results for support.
+
+    Writes a zip archive to OUTPUT (default: openwebui-diagnostics-<time>.zip).
+    Secrets in the config and the container environment are masked.
+    """
+    from .diagnostics import default_path
+
+    try:
+        verbose = (ctx.obj or {}).get("verbose", False)
+        output = output or default_path()
+
+        if verbose:
+            logger.info("CLI export-diagnostics command invoked with output: %s, lines: %s", output, lines)
+
+        with _make_installer(ctx) as installer:
+            _export_diagnostics(installer, output, lines, since)
+
+    except Exception as e:
+        if (ctx.obj or {}).get("verbose", False):
+            logger.error("Export diagnostics command failed: %s", str(e))
+        console.print(f"[red]Error:[/red] {str(e)}")
+        sys.exit(1)
+
+
 @cli.command()
 @click.option("--enable/--disable", default=True, help="Enable or disable autostart")
 @click.pass_context
 def autostart(ctx, enable: bool):
     """Configure Open WebUI to start automatically on boot (macOS only)."""
     try:
-        runtime = (ctx.obj or {}).get("runtime", "docker")
         verbose = (ctx.obj or {}).get("verbose", False)
 
         if verbose:
             logger.info("CLI autostart command invoked with enable: %s", enable)
 
-        with Installer(runtime=runtime, verbose=verbose) as installer:
+        with _make_installer(ctx) as installer:
             if enable:
                 installer.enable_autostart()
                 console.print("[green]✓[/green] Autostart enabled!")
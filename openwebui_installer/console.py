@@ -0,0 +1,129 @@
+"""
+Deferred rich console shared by the CLI and installer
+"""
+
+import sys
+import threading
+import time
+from typing import Any, List, Optional, TextIO
+
+# Largest batch of log lines held back before writing
+BATCH_BYTES = 64 * 1024
+# Seconds a buffered line may wait for others to share its write
+FLUSH_INTERVAL = 0.1
+
+
+class LazyConsole:
+    """Stand-in for :class:`rich.console.Console` that imports rich on first use.
+
+    Importing rich costs tens of milliseconds, which dominates commands such
+    as ``--version`` that never print styled output.
+    """
+
+    def __init__(self, **kwargs: Any):
+        self._kwargs = kwargs
+        self._console: Optional[Any] = None
+
+    def unwrap(self):
+        """Return the real console, creating it if needed."""
+        if self._console is None:
+            from rich.console import Console
+
+            self._console = Console(**self._kwargs)
+        return self._console
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.unwrap(), name)
+
+
+class LineWriter:
+    """Write lines in batches rather than one call per line.
+
+    Lines are buffered and written together once ``max_bytes`` have
+    accumulated or ``interval`` seconds after the first buffered line,
+    whichever comes first, so a quiet stream still shows each line
+    promptly. When ``stream`` is a terminal and a ``console`` is given,
+    batches go through it unstyled; otherwise they are written to
+    ``stream`` as plain text, which is much cheaper for pipes. Use as a
+    context manager so the last batch is written.
+    """
+
+    def __init__(
+        self,
+        console: Optional[LazyConsole] = None,
+        stream: Optional[TextIO] = None,
+        max_bytes: int = BATCH_BYTES,
+        interval: float = FLUSH_INTERVAL,
+    ):
+        self.stream = stream or sys.stdout
+        isatty = getattr(self.stream, "isatty", None)
+        self.console = console if console is not None and isatty is not None and isatty() else None
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self._lines: List[str] = []
+        self._size = 0
+        self._first = 0.0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def write(self, line: str) -> None:
+        """Queue one line (without its newline)."""
+        with self._cond:
+            if not self._lines:
+                self._first = time.monotonic()
+                self._cond.notify()
+            self._lines.append(line)
+            self._size += len(line) + 1
+            if self._size >= self.max_bytes:
+                self._flush()
+            elif self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="line-writer", daemon=True)
+                self._thread.start()
+
+    def _flush(self) -> None:
+        if not self._lines:
+            return
+        text = "\n".join(self._lines)
+        self._lines, self._size = [], 0
+        if self.console is not None:
+            self.console.print(text, markup=False, highlight=False)
+        else:
+            self.stream.write(text + "\n")
+            self.stream.flush()
+
+    def flush(self) -> None:
+        """Write the buffered lines now."""
+        with self._cond:
+            self._flush()
+
+    def _run(self) -> None:
+        with self._cond:
+            while not self._closed:
+                if not self._lines:
+                    self._cond.wait()
+                    continue
+                remaining = self._first + self.interval - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                try:
+                    self._flush()
+                except (OSError, ValueError):
+                    # Reader went away (closed pipe); the caller sees it on its next write
+                    self._lines, self._size = [], 0
+
+    def close(self) -> None:
+        """Write what is left and stop the background flush."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            self._flush()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "LineWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
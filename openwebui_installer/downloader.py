@@ -3,30 +3,405 @@
 from __future__ import annotations
 
 import hashlib
+import json
+import logging
 import os
-from typing import Optional
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Union
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from .artifacts import ArtifactStore
+from .readiness import Backoff
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+# Unit of parallel fetching and of resume after an interruption
+SEGMENT_SIZE = 8 * 1024 * 1024
+DEFAULT_CONNECTIONS = 4
+SEGMENT_ATTEMPTS = 3
+TIMEOUT = 30
+CHECKSUM_CACHE_FILE = "checksums.json"
+INDEX_FILE = "downloads.json"
+# Content-addressed artifacts, under cache_dir
+STORE_DIR = "cache"
+# Seconds a downloaded file is used before the server is asked whether it changed
+DEFAULT_MAX_AGE = 24 * 3600
+# Files fetched at once by download_many
+DEFAULT_BATCH_CONCURRENCY = 4
+
+# Transfer failures worth retrying a segment for
+_RETRYABLE = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.Timeout,
+)
 
 
 class DownloadError(Exception):
     """Raised when a download fails or checksum mismatch occurs."""
 
 
+@dataclass
+class DownloadItem:
+    """One file for :meth:`Downloader.download_many`; higher ``priority`` starts first."""
+
+    url: str
+    dest: str
+    checksum: Optional[str] = None
+    priority: int = 0
+
+
+@dataclass
+class DownloadResult:
+    """Outcome of one item of :meth:`Downloader.download_many`.
+
+    ``status`` is ``hit`` (the existing file was kept), ``downloaded`` or
+    ``failed``; ``bytes`` counts what was received over the network.
+    """
+
+    url: str
+    dest: str
+    status: str = "failed"
+    bytes: int = 0
+    seconds: float = 0.0
+    error: Optional[BaseException] = field(default=None, repr=False)
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("hit", "downloaded")
+
+
 def _sha256(path: str) -> str:
     """Calculate SHA256 hash of a file."""
     hash_obj = hashlib.sha256()
     with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
             hash_obj.update(chunk)
     return hash_obj.hexdigest()
 
 
+def _file_signature(path: str) -> Optional[List[int]]:
+    """Identify the contents of ``path`` by size, mtime and inode, or ``None`` if missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+class _JSONStore:
+    """Entries kept in a small JSON file that is replaced atomically on write."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict:
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, data: Dict) -> None:
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.debug("Could not write %s: %s", self.path, e)
+
+
+class ChecksumCache(_JSONStore):
+    """SHA-256 digests of verified files, persisted between runs.
+
+    An entry is only used while the file keeps the size, mtime and inode
+    it had when it was verified, so an unchanged file is never hashed
+    again and a replaced or modified one always is.
+    """
+
+    def lookup(self, path: str) -> Optional[str]:
+        """The recorded digest of ``path`` if the file is unchanged since."""
+        entry = self._read().get(os.path.abspath(path))
+        if not isinstance(entry, dict) or entry.get("signature") != _file_signature(path):
+            return None
+        return entry.get("sha256")
+
+    def record(self, path: str, digest: str) -> None:
+        """Remember that ``path``, as it is now, has ``digest``."""
+        with self._lock:
+            data = self._read()
+            # Forget files that have gone away
+            data = {k: v for k, v in data.items() if os.path.exists(k)}
+            data[os.path.abspath(path)] = {"signature": _file_signature(path), "sha256": digest}
+            self._write(data)
+
+
+class DownloadIndex(_JSONStore):
+    """``ETag``/``Last-Modified`` of each downloaded URL and when it was last checked.
+
+    An entry belongs to the file it was downloaded to and is ignored once
+    that file is modified locally, since the validators no longer describe it.
+    """
+
+    def lookup(self, url: str, dest: str) -> Optional[Dict[str, Any]]:
+        entry = self._read().get(url)
+        if (
+            not isinstance(entry, dict)
+            or entry.get("dest") != os.path.abspath(dest)
+            or entry.get("signature") != _file_signature(dest)
+        ):
+            return None
+        return entry
+
+    def record(self, url: str, dest: str, validators: Dict[str, Optional[str]]) -> None:
+        """Remember the validators ``dest`` was downloaded with, checked just now."""
+        with self._lock:
+            data = self._read()
+            data = {k: v for k, v in data.items() if isinstance(v, dict) and os.path.exists(v.get("dest", ""))}
+            data[url] = dict(
+                validators, dest=os.path.abspath(dest), signature=_file_signature(dest), checked_at=time.time()
+            )
+            self._write(data)
+
+    def touch(self, url: str) -> None:
+        """Note that the server just confirmed ``url`` is unchanged."""
+        with self._lock:
+            data = self._read()
+            if isinstance(data.get(url), dict):
+                data[url]["checked_at"] = time.time()
+                self._write(data)
+
+
+def _close(response) -> None:
+    close = getattr(response, "close", None)
+    if close is not None:
+        close()
+
+
+def _headers(response) -> Dict[str, str]:
+    return getattr(response, "headers", None) or {}
+
+
+def _total_size(response) -> Optional[int]:
+    """Size of the whole remote file, from a response to ``Range: bytes=0-``."""
+    headers = _headers(response)
+    if response.status_code == 206:
+        # Content-Range: bytes 0-1023/4096
+        total = headers.get("Content-Range", "").rpartition("/")[2]
+    else:
+        total = headers.get("Content-Length", "")
+    return int(total) if total.isdigit() else None
+
+
+def _make_parent(path: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+
+def _validators(response) -> Dict[str, Optional[str]]:
+    headers = _headers(response)
+    return {"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+
+
+class _Journal:
+    """Sidecar record of the segments of a ``.part`` file already written.
+
+    It is only trusted for the same URL, size, segment size and
+    ``ETag``/``Last-Modified`` it was written for, so a file that changed
+    on the server starts over instead of being stitched together.
+    """
+
+    def __init__(self, path: str, url: str, size: int, validators: Dict[str, Optional[str]], segment_size: int):
+        self.path = path
+        self.url = url
+        self.size = size
+        self.validators = validators
+        self.segment_size = segment_size
+        self.done: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def _key(self) -> Dict:
+        return {"url": self.url, "size": self.size, "validators": self.validators, "segment_size": self.segment_size}
+
+    def load(self) -> None:
+        """Take over the finished segments of a matching earlier attempt."""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if {k: data.get(k) for k in self._key()} == self._key():
+            self.done = set(data.get("done", []))
+
+    def completed(self) -> FrozenSet[int]:
+        with self._lock:
+            return frozenset(self.done)
+
+    def missing(self) -> List[Tuple[int, int, int]]:
+        """``(index, first byte, last byte)`` of every segment still to fetch."""
+        count = -(-self.size // self.segment_size)
+        return [
+            (i, i * self.segment_size, min(self.size, (i + 1) * self.segment_size) - 1)
+            for i in range(count)
+            if i not in self.done
+        ]
+
+    def mark_done(self, index: int) -> None:
+        with self._lock:
+            self.done.add(index)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(dict(self._key(), done=sorted(self.done)), f)
+            os.replace(tmp, self.path)
+
+    def remove(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class _Meter:
+    """Bytes received for one download, over any number of connections."""
+
+    def __init__(self):
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def add(self, count: int) -> None:
+        with self._lock:
+            self.total += count
+
+
+class _Throttle:
+    """Hold every transfer of a downloader to ``rate`` bytes per second in total."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._clock = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, count: int) -> None:
+        """Wait until ``count`` more bytes fit under the cap."""
+        with self._lock:
+            now = time.monotonic()
+            # Each chunk books the next slot of link time
+            self._clock = max(self._clock, now) + count / self.rate
+            delay = self._clock - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class _PrefixHasher:
+    """SHA-256 of a file whose segments are finished out of order.
+
+    A segment is hashed as soon as every segment before it is done, read
+    back while it is still in the page cache, so the digest is ready when
+    the last segment lands rather than after a second pass over the file.
+    """
+
+    def __init__(self, path: str, segment_size: int):
+        self.path = path
+        self.segment_size = segment_size
+        self._hash = hashlib.sha256()
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def advance(self, done: FrozenSet[int]) -> None:
+        """Hash the segments in ``done`` that now continue the hashed prefix."""
+        with self._lock:
+            if self._next not in done:
+                return
+            with open(self.path, "rb") as f:
+                f.seek(self._next * self.segment_size)
+                while self._next in done:
+                    remaining = self.segment_size
+                    while remaining:
+                        chunk = f.read(min(CHUNK_SIZE, remaining))
+                        if not chunk:
+                            break
+                        self._hash.update(chunk)
+                        remaining -= len(chunk)
+                    self._next += 1
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
 class Downloader:
-    """Simple download manager that fetches files only when needed."""
+    """Download manager that fetches files only when needed.
+
+    Files of at least two segments on servers that support ``Range``
+    requests are split into ``segment_size`` segments fetched over
+    ``connections`` parallel connections, each written into its place in
+    a preallocated ``<dest>.part`` file. A sidecar ``<dest>.part.journal``
+    records finished segments, so an interrupted download resumes with
+    only the missing ones. Other downloads are streamed over a single
+    connection. The file is renamed over ``dest`` only once complete.
+
+    Downloads are hashed as they arrive, and digests that matched a
+    ``checksum`` are kept in a :class:`ChecksumCache` under ``cache_dir``
+    (``~/.openwebui`` by default), so checking an unchanged file again
+    reads nothing from it.
+
+    Without a checksum, a file this downloader fetched is revalidated
+    once it is ``max_age`` seconds old: a conditional request with the
+    stored ``ETag``/``Last-Modified`` (see :class:`DownloadIndex`) costs
+    only headers when the file is unchanged. ``max_age=None`` never
+    revalidates. Files of unknown origin, and servers that send neither
+    validator, are trusted as they are.
+
+    ``max_bytes_per_second`` caps the combined rate of every transfer.
 
-    def __init__(self, session: Optional[requests.Session] = None) -> None:
-        self.session = session or requests.Session()
+    Finished files are shared with an :class:`ArtifactStore` (under
+    ``cache_dir`` by default) through hard links or reflinks, so the same
+    artifact downloaded to several places takes its space once, and a
+    file with a known ``checksum`` that is already stored is placed from
+    the store rather than fetched. Files this downloader places are
+    read-only.
+    """
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        connections: int = DEFAULT_CONNECTIONS,
+        segment_size: int = SEGMENT_SIZE,
+        cache_dir: Optional[str] = None,
+        max_age: Optional[float] = DEFAULT_MAX_AGE,
+        max_bytes_per_second: Optional[float] = None,
+        store: Optional[ArtifactStore] = None,
+    ) -> None:
+        self.connections = max(1, connections)
+        self.segment_size = segment_size
+        self.max_age = max_age
+        self._throttle = _Throttle(max_bytes_per_second) if max_bytes_per_second else None
+        # Connection pools are only resized on a session made here
+        self._owns_session = session is None
+        self._pool_sizes: Dict[str, int] = {}
+        self.session = session or self._make_session()
+        cache_dir = cache_dir or os.path.expanduser("~/.openwebui")
+        self.checksums = ChecksumCache(os.path.join(cache_dir, CHECKSUM_CACHE_FILE))
+        self.index = DownloadIndex(os.path.join(cache_dir, INDEX_FILE))
+        self.store = store or ArtifactStore(os.path.join(cache_dir, STORE_DIR))
+
+    def _make_session(self) -> requests.Session:
+        session = requests.Session()
+        # One pooled connection per parallel segment
+        adapter = HTTPAdapter(pool_maxsize=self.connections)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
 
     def download_if_needed(self, url: str, dest: str, checksum: Optional[str] = None) -> str:
         """Download ``url`` to ``dest`` if ``dest`` is missing or checksum mismatch.
@@ -41,26 +416,296 @@ class Downloader:
 
         Raises:
             DownloadError: If the download fails or checksum verification fails.
+                An interrupted download keeps its ``.part`` file and journal
+                so the next call resumes it.
         """
-        if os.path.exists(dest):
-            if checksum:
-                if _sha256(dest) == checksum:
-                    return dest
-            else:
-                return dest
+        self._download(url, dest, checksum, _Meter())
+        return dest
+
+    def download_many(
+        self,
+        items: Iterable[Union[DownloadItem, Tuple]],
+        concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    ) -> List[DownloadResult]:
+        """Download several files, at most ``concurrency`` at a time.
+
+        Args:
+            items: :class:`DownloadItem` objects or ``(url, dest[, checksum[, priority]])``
+                tuples. Higher priorities start first; equal ones keep their order.
+            concurrency: Files fetched at once. Each may use up to
+                ``connections`` connections of its own.
+
+        Returns:
+            One :class:`DownloadResult` per item, in input order. A failed
+            item does not stop the others.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        items = [item if isinstance(item, DownloadItem) else DownloadItem(*item) for item in items]
+        results = [DownloadResult(item.url, item.dest) for item in items]
+        self._size_pools(items, concurrency)
+
+        def run(index: int) -> None:
+            item, result = items[index], results[index]
+            meter = _Meter()
+            start = time.monotonic()
+            try:
+                result.status = self._download(item.url, item.dest, item.checksum, meter)
+            except Exception as e:
+                result.error = e
+            finally:
+                result.bytes = meter.total
+                result.seconds = time.monotonic() - start
+
+        # Sorting is stable, and the pool starts tasks in submission order
+        order = sorted(range(len(items)), key=lambda i: -items[i].priority)
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="download-many") as pool:
+            list(pool.map(run, order))
+        return results
+
+    def _size_pools(self, items: List[DownloadItem], concurrency: int) -> None:
+        """Give each host a connection pool big enough for its share of a batch."""
+        if not self._owns_session:
+            return
+        per_host = Counter(urlsplit(item.url)[:2] for item in items)
+        for (scheme, host), count in per_host.items():
+            prefix = f"{scheme}://{host}/"
+            size = self.connections * min(concurrency, count)
+            if size > self._pool_sizes.get(prefix, self.connections):
+                self.session.mount(prefix, HTTPAdapter(pool_maxsize=size))
+                self._pool_sizes[prefix] = size
+
+    def _download(self, url: str, dest: str, checksum: Optional[str], meter: _Meter) -> str:
+        """Make ``dest`` current; return ``hit`` or ``downloaded``."""
+        probe = None
+        if self._usable(dest, checksum):
+            # A matching checksum pins the content; nothing to ask the server
+            probe = None if checksum else self._revalidate(url, dest)
+            if probe is None:
+                return "hit"
+        elif self._from_store(checksum, dest):
+            return "hit"
 
+        part = f"{dest}.part"
         try:
-            response = self.session.get(url, stream=True, timeout=30)
-            response.raise_for_status()
-            os.makedirs(os.path.dirname(dest), exist_ok=True)
-            with open(dest, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+            _make_parent(dest)
+            digest, validators = self._fetch(url, part, probe, meter)
+        except DownloadError:
+            raise
         except Exception as exc:  # pragma: no cover - real network errors
             raise DownloadError(f"Failed to download {url}: {exc}")
 
-        if checksum and _sha256(dest) != checksum:
-            os.remove(dest)
+        if checksum and digest != checksum:
+            os.remove(part)
+            # An existing copy failed the same check above
+            if os.path.exists(dest):
+                os.remove(dest)
             raise DownloadError("Checksum mismatch after download")
-        return dest
+        self._place(part, digest, dest)
+        if checksum:
+            self.checksums.record(dest, digest)
+        self.index.record(url, dest, validators)
+        return "downloaded"
+
+    def _from_store(self, digest: Optional[str], dest: str) -> bool:
+        """Link a sound stored copy of ``digest`` into ``dest``, if there is one."""
+        if not digest or digest not in self.store or not self._verify(self.store.path(digest), digest):
+            return False
+        _make_parent(dest)
+        if not self.store.link(digest, dest):
+            return False
+        self.checksums.record(dest, digest)
+        return True
+
+    def _place(self, part: str, digest: str, dest: str) -> None:
+        """Rename a finished ``part`` to ``dest`` and share it with the artifact store.
+
+        ``dest`` is in place before the store is touched, so a store that
+        cannot take the file (or evicts it meanwhile) never loses it. When
+        the store already holds the artifact, ``dest`` is replaced by a link
+        to it and the new copy's space is freed.
+        """
+        os.replace(part, dest)
+        try:
+            # A stored copy may have been written through a hard link since
+            if digest in self.store and self._verify(self.store.path(digest), digest):
+                self.store.link(digest, dest, copy=False)
+            else:
+                self.store.add(dest, digest)
+            self.store.prune()
+        except OSError as e:
+            logger.debug("Not keeping %s in the artifact store: %s", dest, e)
+
+    def _get(self, url: str, headers: Optional[Dict[str, str]] = None):
+        return self.session.get(url, stream=True, timeout=TIMEOUT, headers=headers)
+
+    def _revalidate(self, url: str, dest: str):
+        """Ask the server whether ``dest`` is still current, if it is due.
+
+        Returns ``None`` to keep ``dest`` (fresh, unchanged, or the server
+        cannot be asked cheaply or at all), otherwise the response that
+        starts downloading the new version.
+        """
+        entry = self.index.lookup(url, dest)
+        if entry is None or self.max_age is None or time.time() - entry.get("checked_at", 0) < self.max_age:
+            return None
+        conditions = {}
+        if entry.get("etag"):
+            conditions["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            conditions["If-Modified-Since"] = entry["last_modified"]
+        if not conditions:
+            return None
+        try:
+            response = self._get(url, dict(conditions, Range="bytes=0-"))
+        except requests.exceptions.RequestException as e:
+            logger.debug("Could not revalidate %s, keeping %s: %s", url, dest, e)
+            return None
+        if response.status_code == 304:
+            _close(response)
+            self.index.touch(url)
+            return None
+        if response.status_code not in (200, 206):
+            # A server error is no reason to give up a good copy
+            _close(response)
+            logger.debug("Could not revalidate %s (HTTP %s), keeping %s", url, response.status_code, dest)
+            return None
+        return response
+
+    def _usable(self, dest: str, checksum: Optional[str]) -> bool:
+        """Whether an existing ``dest`` can be kept (any file when there is no checksum)."""
+        if not os.path.exists(dest):
+            return False
+        return not checksum or self._verify(dest, checksum)
+
+    def _verify(self, path: str, checksum: str) -> bool:
+        """Whether ``path`` has ``checksum``, hashing it only if it changed since last verified."""
+        if self.checksums.lookup(path) == checksum:
+            return True
+        if _sha256(path) != checksum:
+            return False
+        self.checksums.record(path, checksum)
+        return True
+
+    def _chunks(self, response, meter: _Meter) -> Iterable[bytes]:
+        """The body of ``response``, counted and held to the bandwidth cap."""
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            if chunk:
+                if self._throttle is not None:
+                    self._throttle.consume(len(chunk))
+                meter.add(len(chunk))
+                yield chunk
+
+    def _fetch(self, url: str, part: str, probe, meter: _Meter) -> Tuple[str, Dict[str, Optional[str]]]:
+        """Download ``url`` into ``part``, in parallel segments when the server allows.
+
+        ``probe`` is a response to ``Range: bytes=0-`` already in hand.
+        Returns the SHA-256 of the downloaded file and its validators.
+        """
+        response = probe if probe is not None else self._get(url, {"Range": "bytes=0-"})
+        if response.status_code == 416:
+            # Nothing to range over (an empty file)
+            _close(response)
+            response = self._get(url)
+        response.raise_for_status()
+
+        size = _total_size(response)
+        validators = _validators(response)
+        if response.status_code == 206 and size is not None and size >= 2 * self.segment_size:
+            _close(response)
+            journal = _Journal(f"{part}.journal", url, size, validators, self.segment_size)
+            journal.load()
+            return self._fetch_segments(url, part, journal, meter), validators
+        return self._fetch_stream(response, part, meter), validators
+
+    def _fetch_stream(self, response, part: str, meter: _Meter) -> str:
+        """Write a whole response body to ``part`` over its single connection, hashing it on the way."""
+        digest = hashlib.sha256()
+        try:
+            with open(part, "wb") as f:
+                for chunk in self._chunks(response, meter):
+                    f.write(chunk)
+                    digest.update(chunk)
+        finally:
+            _close(response)
+        if os.path.exists(f"{part}.journal"):
+            os.remove(f"{part}.journal")
+        return digest.hexdigest()
+
+    def _fetch_segments(self, url: str, part: str, journal: _Journal, meter: _Meter) -> str:
+        """Fetch the segments ``journal`` lacks in parallel, then drop the journal."""
+        if not os.path.exists(part) or os.path.getsize(part) != journal.size:
+            journal.done.clear()
+        if not journal.done:
+            with open(part, "wb") as f:
+                f.truncate(journal.size)
+
+        hasher = _PrefixHasher(part, journal.segment_size)
+        # Segments kept from an interrupted attempt
+        hasher.advance(journal.completed())
+        missing = journal.missing()
+        failed = threading.Event()
+        workers = min(self.connections, len(missing)) or 1
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="download") as pool:
+            futures = [
+                pool.submit(self._fetch_segment, url, part, journal, segment, failed, hasher, meter)
+                for segment in missing
+            ]
+        for future in futures:
+            future.result()
+        hasher.advance(journal.completed())
+        journal.remove()
+        return hasher.hexdigest()
+
+    def _fetch_segment(
+        self,
+        url: str,
+        part: str,
+        journal: _Journal,
+        segment: Tuple[int, int, int],
+        failed: threading.Event,
+        hasher: _PrefixHasher,
+        meter: _Meter,
+    ) -> None:
+        """Fetch one segment, retrying dropped connections; stop early once another failed."""
+        index, start, end = segment
+        delays = Backoff(initial=1, maximum=10)
+        for attempt in range(1, SEGMENT_ATTEMPTS + 1):
+            if failed.is_set():
+                return
+            try:
+                if self._write_range(url, part, start, end, failed, meter):
+                    journal.mark_done(index)
+                    hasher.advance(journal.completed())
+                return
+            except _RETRYABLE:
+                if attempt == SEGMENT_ATTEMPTS:
+                    failed.set()
+                    raise
+                failed.wait(delays.next())
+            except Exception:
+                failed.set()
+                raise
+
+    def _write_range(self, url: str, part: str, start: int, end: int, failed: threading.Event, meter: _Meter) -> bool:
+        """Write bytes ``start``-``end`` of ``url`` into ``part``; ``False`` if stopped early."""
+        response = self._get(url, {"Range": f"bytes={start}-{end}"})
+        try:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise DownloadError(f"Server ignored the range request for {url}")
+            written = 0
+            with open(part, "r+b") as f:
+                f.seek(start)
+                for chunk in self._chunks(response, meter):
+                    if failed.is_set():
+                        return False
+                    f.write(chunk)
+                    written += len(chunk)
+        finally:
+            _close(response)
+        if written != end - start + 1:
+            raise requests.exceptions.ChunkedEncodingError(
+                f"Segment {start}-{end} ended after {written} bytes"
+            )
+        return True
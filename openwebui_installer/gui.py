@@ -2,8 +2,12 @@
 GUI interface for Open WebUI Installer
 """
 import sys
+import threading
+import time
+from typing import Any, Callable, Sequence, Tuple
 
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtCore import QObject, QPointF, QRunnable, Qt, QThreadPool, QTimer, pyqtSignal
+from PyQt6.QtGui import QColor, QPainter, QPen
 from PyQt6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -20,37 +24,200 @@ from PyQt6.QtWidgets import (
 
 from . import __version__
 from .installer import Installer
+from .progress import format_bytes
+from .stats import RingBuffer, StatsSampler, decimate
 
-class InstallerThread(QThread):
-    """Thread for running installation process."""
-    progress = pyqtSignal(str)
+# Status refreshes requested within this many milliseconds are coalesced
+STATUS_DEBOUNCE_MS = 250
+# Dashboard time windows (label, seconds) and redraw interval
+DASHBOARD_WINDOWS = (("1 min", 60), ("5 min", 300), ("15 min", 900), ("1 hour", 3600))
+DASHBOARD_REFRESH_MS = 1000
+
+
+class WorkerSignals(QObject):
+    """Signals a :class:`Worker` uses to report back to the UI thread."""
+    result = pyqtSignal(object)
     error = pyqtSignal(str)
+    progress = pyqtSignal(str)
+    percent = pyqtSignal(int)
     finished = pyqtSignal()
 
-    def __init__(self, model: str, port: int, force: bool = False):
+
+class Worker(QRunnable):
+    """Run ``fn(worker)`` on a pool thread and report through :attr:`signals`.
+
+    A cancelled worker still runs to completion (runtime calls cannot be
+    interrupted) but its result and error are dropped.
+    """
+
+    def __init__(self, fn: Callable[["Worker"], Any]):
         super().__init__()
-        self.model = model
-        self.port = port
-        self.force = force
-        self.installer = Installer()
+        self.fn = fn
+        self.signals = WorkerSignals()
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
 
     def run(self):
-        """Run installation process."""
         try:
-            self.progress.emit("Checking system requirements...")
-            self.installer._check_system_requirements()
-
-            self.progress.emit("Installing Open WebUI...")
-            self.installer.install(
-                model=self.model,
-                port=self.port,
-                force=self.force
-            )
+            result = self.fn(self)
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.error.emit(str(e))
+        else:
+            if not self.cancelled:
+                self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
 
-            self.finished.emit()
 
-        except Exception as e:
-            self.error.emit(str(e))
+class TransferRelay:
+    """Turn pull progress events into a worker's progress signals."""
+
+    def __init__(self, signals: WorkerSignals):
+        self.signals = signals
+        self._transfers = {}
+
+    def __call__(self, event):
+        self._transfers[(event.source, event.name)] = event
+        self.signals.progress.emit(event.describe())
+        sized = [e for e in self._transfers.values() if e.total]
+        if sized:
+            completed = sum(e.completed for e in sized)
+            total = sum(e.total for e in sized)
+            self.signals.percent.emit(min(100, int(completed * 100 / total)))
+
+def _format_percent(value: float) -> str:
+    return f"{value:.0f}%"
+
+
+def _format_rate(value: float) -> str:
+    return f"{format_bytes(value)}/s"
+
+
+class TimeSeriesPlot(QWidget):
+    """Line plot of a few :class:`RingBuffer` fields over a time window.
+
+    Each redraw reads only the window's samples and decimates them to the
+    widget's width, so drawing cost does not depend on uptime.
+    """
+
+    def __init__(self, title: str, lines: Sequence[Tuple[str, str, str]], formatter, parent=None):
+        super().__init__(parent)
+        self.title = title
+        self.lines = lines  # (field, label, color)
+        self.formatter = formatter
+        self.buffer = None
+        self.window = DASHBOARD_WINDOWS[0][1]
+        self.setMinimumHeight(70)
+
+    def points(self, field: str, width: int):
+        """Decimated ``(times, values)`` of ``field`` in the current window."""
+        times, values = self.buffer.series(field, since=time.time() - self.window)
+        return decimate(times, values, max(2, width))
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        rect = self.rect().adjusted(2, 16, -2, -2)
+        painter.drawRect(rect)
+        if self.buffer is None or rect.width() < 2:
+            painter.drawText(4, 12, self.title)
+            return
+
+        now = time.time()
+        series = [(color, label, *self.points(field, rect.width())) for field, label, color in self.lines]
+        top = max((max(values) for _, _, _, values in series if values), default=0) or 1
+        legend = []
+        for color, label, times, values in series:
+            if values:
+                legend.append(f"{label} {self.formatter(values[-1])}")
+            painter.setPen(QPen(QColor(color), 1.5))
+            points = [
+                QPointF(
+                    rect.left() + rect.width() * (1 - (now - t) / self.window),
+                    rect.bottom() - rect.height() * v / top,
+                )
+                for t, v in zip(times, values)
+            ]
+            if len(points) > 1:
+                painter.drawPolyline(points)
+        painter.setPen(self.palette().windowText().color())
+        painter.drawText(4, 12, f"{self.title}: {'  '.join(legend) or 'no data'}  (max {self.formatter(top)})")
+
+
+class DashboardPanel(QWidget):
+    """Live CPU, memory, network and block I/O of Open WebUI and Ollama."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.buffer = RingBuffer()
+        self.sampler = None
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        header = QHBoxLayout()
+        header.addWidget(QLabel("Resource usage"))
+        self.window_combo = QComboBox()
+        self.window_combo.addItems([label for label, _ in DASHBOARD_WINDOWS])
+        self.window_combo.currentIndexChanged.connect(self.set_window)
+        header.addWidget(self.window_combo)
+        layout.addLayout(header)
+
+        self.plots = [
+            TimeSeriesPlot("CPU", [("cpu", "Open WebUI", "#1f77b4"), ("ollama_cpu", "Ollama", "#ff7f0e")],
+                           _format_percent),
+            TimeSeriesPlot("Memory", [("memory", "Open WebUI", "#1f77b4"), ("ollama_memory", "Ollama", "#ff7f0e")],
+                           format_bytes),
+            TimeSeriesPlot("Network", [("net_rx", "in", "#2ca02c"), ("net_tx", "out", "#d62728")], _format_rate),
+            TimeSeriesPlot("Block I/O", [("block_read", "read", "#9467bd"), ("block_write", "write", "#8c564b")],
+                           _format_rate),
+        ]
+        for plot in self.plots:
+            plot.buffer = self.buffer
+            layout.addWidget(plot)
+
+        # Samples arrive about once a second; redraw on a timer rather than per sample
+        self.redraw_timer = QTimer(self)
+        self.redraw_timer.setInterval(DASHBOARD_REFRESH_MS)
+        self.redraw_timer.timeout.connect(self.redraw)
+
+    def set_window(self, index: int):
+        for plot in self.plots:
+            plot.window = DASHBOARD_WINDOWS[index][1]
+        self.redraw()
+
+    def redraw(self):
+        for plot in self.plots:
+            plot.update()
+
+    def start(self, window: "MainWindow"):
+        """Start sampling on a thread of its own (once until :meth:`stop`).
+
+        The sampler runs as long as the panel is shown, so it must not hold
+        one of the window's pool threads.
+        """
+        if self.sampler is not None:
+            return
+        sampler = self.sampler = StatsSampler(None, self.buffer.append)
+
+        def sample():
+            try:
+                # Opening the runtime client may block, so it happens here too
+                sampler.client = window.installer().docker_client
+            except Exception:
+                return  # No runtime; the next status refresh reports it
+            sampler.run()
+
+        threading.Thread(target=sample, name="dashboard-sampler", daemon=True).start()
+        self.redraw_timer.start()
+
+    def stop(self):
+        self.redraw_timer.stop()
+        if self.sampler is not None:
+            self.sampler.stop()
+            self.sampler = None
 
 class MainWindow(QMainWindow):
     """Main window for the installer GUI."""
@@ -58,6 +225,19 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle(f"Open WebUI Installer v{__version__}")
+
+        # Runtime calls can take seconds, so they all run on this pool and
+        # share one installer (and with it one runtime connection)
+        self.pool = QThreadPool(self)
+        self._installer = None
+        self._installer_lock = threading.Lock()
+        self._workers = set()
+        self._busy = False
+        self._status_worker = None
+        self._status_timer = QTimer(self)
+        self._status_timer.setSingleShot(True)
+        self._status_timer.setInterval(STATUS_DEBOUNCE_MS)
+        self._status_timer.timeout.connect(self._refresh_status)
         self.setMinimumWidth(500)
         self.setMinimumHeight(300)
 
@@ -104,6 +284,10 @@ class MainWindow(QMainWindow):
         self.status_label.hide()
         layout.addWidget(self.status_label)
 
+        self.dashboard = DashboardPanel()
+        self.dashboard.hide()
+        layout.addWidget(self.dashboard)
+
         # Buttons
         button_layout = QHBoxLayout()
         self.install_button = QPushButton("Install")
@@ -117,52 +301,116 @@ class MainWindow(QMainWindow):
         # Update UI based on current status
         self.update_status()
 
+    def installer(self) -> Installer:
+        """The window's installer, created on first use (from any thread)."""
+        with self._installer_lock:
+            if self._installer is None:
+                self._installer = Installer()
+            return self._installer
+
+    def submit(self, fn, on_result=None, on_error=None) -> Worker:
+        """Run ``fn(worker)`` on the pool, delivering its outcome on the UI thread."""
+        worker = Worker(fn)
+        if on_result is not None:
+            worker.signals.result.connect(on_result)
+        if on_error is not None:
+            worker.signals.error.connect(on_error)
+        self._workers.add(worker)
+        worker.signals.finished.connect(lambda: self._workers.discard(worker))
+        self.pool.start(worker)
+        return worker
+
     def update_status(self):
-        """Update UI based on current installation status."""
+        """Schedule a status refresh; requests in quick succession are coalesced."""
+        self._status_timer.start()
+
+    def _refresh_status(self):
+        if self._status_worker is not None:
+            # Only the newest refresh may update the window
+            self._status_worker.cancel()
+        self._status_worker = self.submit(
+            lambda worker: self.installer().get_status(), self.show_status, self._status_failed
+        )
+        self.submit(self._local_models, self.add_models)
+
+    def _local_models(self, worker):
         try:
-            installer = Installer()
-            status = installer.get_status()
-
-            if status["installed"]:
-                self.status_label.setText(
-                    "\n".join(
-                        [
-                            "Open WebUI is installed",
-                            f"Version: {status['version']}",
-                            f"Port: {status['port']}",
-                            f"Model: {status['model']}",
-                            f"Status: {'Running' if status['running'] else 'Stopped'}",
-                        ]
-                    )
+            return [m["name"] for m in self.installer().ollama.list_models()]
+        except Exception:
+            return []  # Ollama is not reachable; keep the suggestions
+
+    def _status_failed(self, message: str):
+        QMessageBox.warning(self, "Error", f"Failed to get status: {message}")
+
+    def show_status(self, status):
+        """Update the UI for an installation status."""
+        if status["installed"]:
+            self.status_label.setText(
+                "\n".join(
+                    [
+                        "Open WebUI is installed",
+                        f"Version: {status['version']}",
+                        f"Port: {status['port']}",
+                        f"Model: {status['model']}",
+                        f"Status: {'Running' if status['running'] else 'Stopped'}",
+                    ]
                 )
-                self.status_label.show()
-                self.install_button.setText("Reinstall")
-                self.uninstall_button.setEnabled(True)
-            else:
-                self.status_label.hide()
-                self.install_button.setText("Install")
-                self.uninstall_button.setEnabled(False)
+            )
+            self.status_label.show()
+            self.install_button.setText("Reinstall")
+        else:
+            self.status_label.hide()
+            self.install_button.setText("Install")
+        if not self._busy:
+            self.uninstall_button.setEnabled(status["installed"])
+        if status["installed"] and status["running"]:
+            self.dashboard.show()
+            self.dashboard.start(self)
+        else:
+            self.dashboard.stop()
+            self.dashboard.hide()
 
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Failed to get status: {str(e)}")
+    def add_models(self, names):
+        """Offer the models Ollama already has next to the suggested ones."""
+        known = {self.model_combo.itemText(i) for i in range(self.model_combo.count())}
+        for name in sorted(names):
+            name = name[:-len(":latest")] if name.endswith(":latest") else name
+            if name not in known:
+                self.model_combo.addItem(name)
+                known.add(name)
+
+    def _set_busy(self, busy: bool):
+        self._busy = busy
+        self.install_button.setEnabled(not busy)
+        self.uninstall_button.setEnabled(not busy)
 
     def start_installation(self):
         """Start the installation process."""
         self.progress_bar.setRange(0, 0)
         self.progress_bar.show()
-        self.install_button.setEnabled(False)
-        self.uninstall_button.setEnabled(False)
-
-        # Create and start installer thread
-        self.installer_thread = InstallerThread(
-            model=self.model_combo.currentText(),
-            port=self.port_spin.value(),
-            force=True if self.install_button.text() == "Reinstall" else False
-        )
-        self.installer_thread.progress.connect(self.update_progress)
-        self.installer_thread.error.connect(self.handle_error)
-        self.installer_thread.finished.connect(self.handle_success)
-        self.installer_thread.start()
+        self._set_busy(True)
+
+        model = self.model_combo.currentText()
+        port = self.port_spin.value()
+        force = self.install_button.text() == "Reinstall"
+
+        def install(worker):
+            installer = self.installer()
+            installer.progress_callback = TransferRelay(worker.signals)
+            try:
+                worker.signals.progress.emit("Checking system requirements...")
+                installer._check_system_requirements()
+                worker.signals.progress.emit("Installing Open WebUI...")
+                installer.install(model=model, port=port, force=force)
+            finally:
+                installer.progress_callback = None
+
+        self.install_worker = Worker(install)
+        self.install_worker.signals.progress.connect(self.update_progress)
+        self.install_worker.signals.percent.connect(self.update_percent)
+        self.install_worker.signals.error.connect(self.handle_error)
+        self.install_worker.signals.result.connect(self.handle_success)
+        self.pool.start(self.install_worker)
 
     def uninstall(self):
         """Uninstall Open WebUI."""
@@ -174,32 +422,44 @@ class MainWindow(QMainWindow):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            try:
-                installer = Installer()
-                installer.uninstall()
-                QMessageBox.information(self, "Success", "Open WebUI has been uninstalled.")
-                self.update_status()
-            except Exception as e:
-                QMessageBox.warning(self, "Error", f"Failed to uninstall: {str(e)}")
-                self.update_status()
+            self._set_busy(True)
+            self.submit(
+                lambda worker: self.installer().uninstall(),
+                self._uninstall_done,
+                self._uninstall_failed,
+            )
+
+    def _uninstall_done(self, result=None):
+        self._set_busy(False)
+        QMessageBox.information(self, "Success", "Open WebUI has been uninstalled.")
+        self.update_status()
+
+    def _uninstall_failed(self, message: str):
+        self._set_busy(False)
+        QMessageBox.warning(self, "Error", f"Failed to uninstall: {message}")
+        self.update_status()
 
     def update_progress(self, message: str):
         """Update progress bar message."""
         self.progress_bar.setFormat(message)
 
+    def update_percent(self, value: int):
+        """Switch the bar to determinate mode once transfer sizes are known."""
+        if self.progress_bar.maximum() == 0:
+            self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(value)
+
     def handle_error(self, message: str):
         """Handle installation error."""
         self.progress_bar.hide()
-        self.install_button.setEnabled(True)
-        self.uninstall_button.setEnabled(True)
+        self._set_busy(False)
         QMessageBox.warning(self, "Installation Error", message)
         self.update_status()
 
-    def handle_success(self):
+    def handle_success(self, result=None):
         """Handle successful installation."""
         self.progress_bar.hide()
-        self.install_button.setEnabled(True)
-        self.uninstall_button.setEnabled(True)
+        self._set_busy(False)
         QMessageBox.information(
             self,
             "Installation Complete",
@@ -210,6 +470,17 @@ class MainWindow(QMainWindow):
         )
         self.update_status()
 
+    def closeEvent(self, event):
+        """Stop background work before the window goes away."""
+        self._status_timer.stop()
+        self.dashboard.stop()
+        if self._installer is not None:
+            self._installer.cancel()
+        self.pool.waitForDone()
+        if self._installer is not None:
+            self._installer.close()
+        super().closeEvent(event)
+
 def main():
     """Main entry point for the GUI."""
     app = QApplication(sys.argv)
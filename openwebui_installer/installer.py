@@ -9,18 +9,27 @@ import platform
 import shutil
 import subprocess
 import sys
+import threading
 import time
-from logging.handlers import RotatingFileHandler
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Set, Union
+from urllib.parse import urlsplit
 
-from dotenv import load_dotenv
-import docker
-import requests
-from rich.console import Console
 from . import __version__
+from .bluegreen import CONTAINER_NAME, BlueGreenSwap, SwapError, remove_leftovers, remove_resources
+from .console import LazyConsole, LineWriter
+from .models import DEFAULT_CONCURRENCY, ModelPullResult, pull_models
+from .pipeline import Phase, Pipeline, PipelineReport
+from .preflight import Check, CheckFailed, PreflightReport, run_checks
+from .progress import ProgressEvent, TransferTracker
+from .readiness import DEFAULT_TIMEOUT, READY, Backoff, ReadinessResult, container_probe, http_probe, wait_until_ready
+from .registry import RegistryClient, RegistryError
+from .runtime import RuntimeConnection
+
+if TYPE_CHECKING:
+    from .ollama import OllamaClient
 
 logger = logging.getLogger(__name__)
-console = Console()
+console = LazyConsole()
 
 # Secrets that can be provided via environment variables or Docker secrets
 SECRET_ENV_VARS = [
@@ -31,6 +40,28 @@ SECRET_ENV_VARS = [
 ]
 
 
+# Seconds a model pull may go without receiving data before it is retried
+MODEL_PULL_IDLE_TIMEOUT = 120
+# Interrupted attempts in a row without new bytes before a model pull fails
+MODEL_PULL_ATTEMPTS = 5
+
+# Runtime API hosts whose published ports can be reached on localhost
+# (docker-py names local Unix sockets and named pipes "localhost"/"localnpipe")
+LOCAL_RUNTIME_HOSTS = ("localhost", "localnpipe", "127.0.0.1", "::1")
+
+_env_loaded = False
+
+
+def _load_env() -> None:
+    """Load ``.env`` settings once per process."""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        _env_loaded = True
+
+
 class InstallerError(Exception):
     """Base exception for installer errors."""
     pass
@@ -44,7 +75,12 @@ class SystemRequirementsError(InstallerError):
 class Installer:
     """Main installer class for Open WebUI."""
 
-    def __init__(self, runtime: str = "docker", verbose: bool = False):
+    def __init__(
+        self,
+        runtime: str = "docker",
+        verbose: bool = False,
+        connection: Optional[RuntimeConnection] = None,
+    ):
         """Initialize the installer.
 
         Parameters
@@ -55,36 +91,69 @@ class Installer:
             to fall back to Podman if it is detected.
         verbose: bool
             Enable verbose logging and output.
+        connection: RuntimeConnection, optional
+            Shared runtime connection. When omitted the installer opens its
+            own on first use and closes it in :meth:`close`.
         """
-        load_dotenv()
-
-        self.runtime = runtime
         self.verbose = verbose
         self.webui_image = "ghcr.io/open-webui/open-webui:main"
         self.config_dir = os.path.expanduser("~/.openwebui")
 
+        # The runtime client is only opened when a method actually needs it
+        self._owns_connection = connection is None
+        self.connection = connection or RuntimeConnection(runtime)
+        self._requirements_checked = False
+        # Set when a running operation should stop early (see Pipeline)
+        self._cancel_event = threading.Event()
+        self.install_report: Optional[PipelineReport] = None
+        # Ollama models pulled at once by install and pull_models
+        self.model_concurrency = DEFAULT_CONCURRENCY
+        self.model_results: List[ModelPullResult] = []
+        # Receives ProgressEvent updates from image and model pulls
+        self.progress_callback: Optional[Callable[[ProgressEvent], None]] = None
+        self.registry = RegistryClient()
+        self._ollama: Optional["OllamaClient"] = None
+        # Seconds start/restart/install wait for Open WebUI to answer
+        self.ready_timeout = DEFAULT_TIMEOUT
+        # Start-to-ready measurement of the last container this installer started
+        self.readiness: Optional[ReadinessResult] = None
+
         # Ensure configuration directory exists before setting up logging
         self._ensure_config_dir()
 
-        # Initialize Docker client with runtime fallback
-        try:
-            self.docker_client = docker.from_env()
-            # Test Docker connection
-            self.docker_client.ping()
-        except Exception:
-            if runtime == "docker" and self._podman_available():
-                self.runtime = "podman"
-                self.docker_client = self._get_podman_client()
-            else:
-                raise
-
-        if runtime == "podman" and self.runtime != "podman":
-            # Caller explicitly requested podman but we didn't switch
-            self.runtime = "podman"
-            self.docker_client = self._get_podman_client()
-
         self._setup_logger()
 
+    @property
+    def runtime(self) -> str:
+        """Container runtime in use, after any Podman fallback."""
+        return self.connection.runtime
+
+    @property
+    def docker_client(self):
+        """Docker-compatible client, opened lazily on first access."""
+        # DOCKER_HOST and friends may come from .env
+        _load_env()
+        return self.connection.client
+
+    @docker_client.setter
+    def docker_client(self, client) -> None:
+        self.connection.client = client
+
+    @property
+    def ollama(self) -> "OllamaClient":
+        """Pooled Ollama API client, created on first use."""
+        if self._ollama is None:
+            # OLLAMA_HOST and OLLAMA_BASE_URL may come from .env
+            _load_env()
+            from .ollama import OllamaClient
+
+            self._ollama = OllamaClient()
+        return self._ollama
+
+    @ollama.setter
+    def ollama(self, client: "OllamaClient") -> None:
+        self._ollama = client
+
     def __enter__(self):
         """Context manager entry."""
         return self
@@ -93,16 +162,24 @@ class Installer:
         """Context manager exit."""
         self.close()
 
+    def cancel(self) -> None:
+        """Ask a running install or model pull to stop early."""
+        self._cancel_event.set()
+
     def close(self):
         """Close any resources held by the installer."""
-        if hasattr(self, 'docker_client') and self.docker_client:
-            try:
-                self.docker_client.close()
-            except Exception:
-                pass
+        if self._owns_connection:
+            self.connection.close()
+        if self._ollama is not None:
+            self._ollama.close()
 
     def _setup_logger(self) -> None:
-        """Configure logging with rotation under the config directory."""
+        """Configure logging under the config directory.
+
+        With ``verbose`` the package's records go to :attr:`log_file` through
+        :func:`~openwebui_installer.logconfig.configure`, which sets up its
+        handlers once per process however many installers are created.
+        """
         self.log_dir = os.path.join(self.config_dir, "logs")
         os.makedirs(self.log_dir, exist_ok=True)
         self.log_file = os.path.join(self.log_dir, "openwebui_installer.log")
@@ -113,16 +190,9 @@ class Installer:
         open(self.log_file, "a").close()
 
         if self.verbose:
-            handler = RotatingFileHandler(
-                self.log_file, maxBytes=5 * 1024 * 1024, backupCount=3
-            )
-            handler.setFormatter(
-                logging.Formatter(
-                    "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-                )
-            )
-            logger.addHandler(handler)
-            logger.setLevel(logging.INFO)
+            from .logconfig import configure
+
+            configure(self.log_file)
 
     def _ensure_config_dir(self) -> None:
         """Create the configuration directory if it does not already exist."""
@@ -130,130 +200,332 @@ class Installer:
 
     def _podman_available(self) -> bool:
         """Check if Podman is installed."""
-        try:
-            result = subprocess.run(
-                ["podman", "--version"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return False
+        return self.connection.podman_available()
 
-    def _get_podman_client(self):
-        """Get a Podman-compatible Docker client."""
-        try:
-            # Try to connect to Podman socket
-            import docker
-            client = docker.DockerClient(base_url='unix:///tmp/podman.sock')
-            # Test the connection
-            client.ping()
-            return client
-        except Exception:
-            # Fallback to default Docker client
-            try:
-                import docker
-                client = docker.from_env()
-                client.ping()
-                return client
-            except Exception:
-                return None
-
-    def _check_system_requirements(self):
-        """Validate system requirements."""
-        if self.verbose:
-            logger.info("Validating system requirements")
-
-        # Check supported operating systems (macOS and Linux)
+    def _check_os(self) -> Dict:
+        """Check for a supported operating system (macOS and Linux)."""
         system = platform.system()
         if system not in ("Darwin", "Linux"):
-            raise SystemRequirementsError(
-                "This installer currently supports macOS and Linux"
-            )
+            raise CheckFailed("This installer currently supports macOS and Linux", system=system)
+        return {"system": system}
 
-        # Check Python version (aligned with setup.py)
+    def _check_python(self) -> Dict:
+        """Check the Python version (aligned with setup.py)."""
         if sys.version_info < (3, 9):
-            raise SystemRequirementsError("Python 3.9 or higher is required")
+            raise CheckFailed("Python 3.9 or higher is required")
+        return {"version": ".".join(str(v) for v in sys.version_info[:3])}
 
-        # Check container runtime
+    def _check_runtime(self) -> Dict:
+        """Check that the container runtime is installed and answering."""
         if not self.docker_client:
             if self.runtime == "podman":
-                raise SystemRequirementsError("Podman is not available or not installed")
-            else:
-                raise SystemRequirementsError("Docker is not available or not installed")
+                raise CheckFailed("Podman is not available or not installed", stage="connect")
+            raise CheckFailed("Docker is not available or not installed", stage="connect")
 
         try:
             self.docker_client.ping()
         except Exception as e:
+            # Whatever was detected earlier no longer answers
+            self.connection.invalidate()
             if self.runtime == "podman":
-                raise SystemRequirementsError("Podman is not running or not installed")
-            if self._podman_available():
-                raise SystemRequirementsError(
-                    "Docker is not running or not installed. Podman detected; use --runtime podman"
-                )
-            raise SystemRequirementsError(
-                "Docker service is not running. Start Docker Desktop and ensure the daemon is running."
-            ) from e
+                raise CheckFailed("Podman is not running or not installed", stage="ping")
+            raise CheckFailed(
+                "Docker service is not running. Start Docker Desktop and ensure the daemon is running.",
+                stage="ping",
+                error=str(e),
+            )
+        return {"runtime": self.runtime}
+
+    def _check_podman(self) -> Dict:
+        """Detect Podman so a Docker failure can suggest it."""
+        if not self._podman_available():
+            raise CheckFailed("Podman is not installed")
+        return {}
+
+    def _check_ollama(self) -> Dict:
+        """Check that Ollama is running."""
+        import requests
+
+        from .ollama import OllamaError
 
-        # Check Ollama with timeout
         try:
-            response = requests.get("http://localhost:11434/api/tags", timeout=10)
-            if response.status_code != 200:
-                raise SystemRequirementsError("Ollama is not responding correctly")
-        except requests.exceptions.RequestException:
-            raise SystemRequirementsError(
+            # A fresh listing, which later model checks reuse from the cache
+            models = self.ollama.list_models(max_age=0)
+        except requests.exceptions.RequestException as e:
+            raise CheckFailed(
                 "Ollama is not running. Please install and start Ollama first:\n"
-                "Visit: https://ollama.ai/"
+                "Visit: https://ollama.ai/",
+                error=str(e),
+            )
+        except OllamaError as e:
+            raise CheckFailed("Ollama is not responding correctly", status=e.status)
+        return {"url": self.ollama.url, "models": len(models)}
+
+    def preflight(self) -> PreflightReport:
+        """Run every system requirement probe concurrently and report all results."""
+        if self.verbose:
+            logger.info("Validating system requirements")
+
+        checks = [
+            Check("os", self._check_os, timeout=5, description="Operating system check"),
+            Check("python", self._check_python, timeout=5, description="Python check"),
+            Check("runtime", self._check_runtime, timeout=10, description=self.runtime.capitalize()),
+            Check("ollama", self._check_ollama, timeout=10, description="Ollama"),
+        ]
+        if self.connection.requested_runtime == "docker":
+            checks.append(
+                Check("podman", self._check_podman, timeout=10, required=False, description="Podman")
+            )
+        report = run_checks(checks)
+
+        runtime = report.get("runtime")
+        podman = report.get("podman")
+        if (
+            runtime and not runtime.ok and runtime.detail.get("stage") == "ping"
+            and self.runtime == "docker" and podman and podman.ok
+        ):
+            runtime.message = (
+                "Docker is not running or not installed. Podman detected; use --runtime podman"
             )
 
+        if self.verbose:
+            for result in report.results:
+                logger.info(
+                    "Preflight %s: %s (%.2fs) %s",
+                    result.name, "ok" if result.ok else "failed", result.duration, result.message,
+                )
+        return report
+
+    def _check_system_requirements(self):
+        """Validate system requirements.
+
+        The probes run concurrently through :meth:`preflight`; the first
+        failing requirement is raised. A successful check is remembered
+        until the next :meth:`install` starts, so callers that validate up
+        front (such as the CLI) do not repeat the probes for it, while a
+        long-lived installer (such as the GUI's) checks again before every
+        later install.
+        """
+        if self._requirements_checked:
+            return
+
+        report = self.preflight()
+        if not report.ok:
+            raise SystemRequirementsError(report.failures[0].message)
+
         # Create config directory
         os.makedirs(self.config_dir, exist_ok=True)
+        self._requirements_checked = True
+
+    def _emit_progress(self, event: ProgressEvent) -> None:
+        """Forward a transfer progress event to the registered listener."""
+        if self.progress_callback:
+            try:
+                self.progress_callback(event)
+            except Exception as e:
+                logger.debug("Progress callback failed: %s", e)
+        if self.verbose and event.stalled:
+            logger.warning(event.describe())
 
     def _pull_webui_image(self, image: str) -> None:
-        """Pull the Open WebUI Docker image."""
+        """Pull the Open WebUI Docker image, streaming per-layer progress."""
+        import docker
+        from docker.utils import parse_repository_tag
+
         if not self.docker_client:
             raise InstallerError("Docker client not available")
 
         try:
             if self.verbose:
                 logger.info(f"Pulling Docker image: {image}")
-            console.print(f"Pulling Open WebUI image: {image}...")
-            self.docker_client.images.pull(image)
+            if not self.progress_callback:
+                console.print(f"Pulling Open WebUI image: {image}...")
+
+            repository, tag = parse_repository_tag(image)
+            tracker = TransferTracker("image", image, self._emit_progress)
+            with tracker.watch():
+                stream = self.docker_client.api.pull(
+                    repository, tag=tag or "latest", stream=True, decode=True
+                )
+                for event in stream:
+                    if self._cancel_event.is_set():
+                        raise InstallerError(f"Pull of {image} cancelled")
+                    if "error" in event:
+                        raise InstallerError(f"Failed to pull Docker image {image}: {event['error']}")
+                    tracker.update_from_docker(event)
+            tracker.finish()
         except docker.errors.APIError as e:
             raise InstallerError(f"Failed to pull Docker image {image}: {str(e)}")
 
-    def _pull_ollama_model(self, model: str) -> None:
-        """Pull Ollama model if not already available."""
+    def _stream_model_pull(self, model: str, tracker: TransferTracker) -> None:
+        """Run one streaming pull request, feeding ``tracker``.
+
+        Connection drops and idle timeouts propagate as ``requests``
+        exceptions so the caller can retry; Ollama keeps partially
+        downloaded blobs, so a retry continues where this attempt stopped.
+        """
+        import requests
+
+        from .ollama import OllamaError
+
         try:
-            if self.verbose:
-                logger.info(f"Checking Ollama model: {model}")
-
-            # Check if model is already available
-            response = requests.get("http://localhost:11434/api/tags", timeout=10)
-            if response.status_code == 200:
-                models = response.json().get("models", [])
-                model_names = [m["name"] for m in models]
-                if model in model_names:
-                    console.print(f"Model {model} is already available")
+            stream = self.ollama.pull(model, idle_timeout=MODEL_PULL_IDLE_TIMEOUT)
+        except OllamaError as e:
+            raise InstallerError(f"Failed to pull Ollama model {model}: {e}")
+        done = self._close_on_cancel(stream)
+        try:
+            if self._read_pull_stream(stream, tracker):
+                return
+        except OllamaError as e:
+            raise InstallerError(f"Failed to pull Ollama model {model}: {e}")
+        except requests.exceptions.RequestException:
+            if not self._cancel_event.is_set():
+                raise
+        finally:
+            done.set()
+            stream.close()
+
+        if self._cancel_event.is_set():
+            raise InstallerError(f"Pull of Ollama model {model} cancelled")
+        raise requests.exceptions.ChunkedEncodingError(f"Pull of {model} ended before completing")
+
+    def _close_on_cancel(self, stream) -> threading.Event:
+        """Close ``stream`` if the operation is cancelled before the returned event is set."""
+        done = threading.Event()
+
+        def watch():
+            while not done.wait(0.2):
+                if self._cancel_event.is_set():
+                    stream.close()
                     return
 
-            console.print(f"Pulling Ollama model: {model}...")
-            subprocess.run(
-                ["ollama", "pull", model],
-                check=True,
-                capture_output=True,
-                text=True,
-                timeout=300,
+        threading.Thread(target=watch, name="model-pull-cancel", daemon=True).start()
+        return done
+
+    def _read_pull_stream(self, stream, tracker: TransferTracker) -> bool:
+        """Consume pull stream messages; return ``True`` if the pull succeeded."""
+        for message in stream:
+            if self._cancel_event.is_set():
+                return False
+            if self._handle_pull_message(message, tracker):
+                return True
+        return False
+
+    def _handle_pull_message(self, message: Dict, tracker: TransferTracker) -> bool:
+        """Apply one pull stream message; return ``True`` once the pull succeeded."""
+        status = message.get("status", "")
+        digest = message.get("digest")
+        if digest:
+            completed, total = message.get("completed"), message.get("total")
+            tracker.update(
+                digest,
+                downloaded=completed,
+                total=total,
+                done=bool(total) and completed == total,
+                status="downloading",
             )
+        elif status == "success":
+            return True
+        elif status:
+            # "pulling manifest", "verifying sha256 digest", "writing manifest"...
+            tracker.set_status(status.split()[0])
+        return False
 
-        except subprocess.CalledProcessError:
-            raise InstallerError(f"Failed to pull Ollama model {model}")
+    def _available_models(self) -> Set[str]:
+        """Normalized names of the models Ollama already has, in one request."""
+        import requests
 
+        from .ollama import OllamaError
+
+        try:
+            return self.ollama.model_names()
         except requests.exceptions.RequestException:
             raise InstallerError("Failed to communicate with Ollama")
-        except subprocess.TimeoutExpired:
-            raise InstallerError(f"Timeout pulling Ollama model {model}")
+        except OllamaError:
+            return set()
+
+    def _download_model(self, model: str) -> None:
+        """Pull ``model`` through Ollama's streaming pull API.
+
+        Reports per-blob progress through :attr:`progress_callback`. A pull
+        that goes silent for ``MODEL_PULL_IDLE_TIMEOUT`` seconds or loses
+        its connection is retried and resumes from the blobs already
+        downloaded.
+        """
+        import requests
+
+        if not self.progress_callback:
+            console.print(f"Pulling Ollama model: {model}...")
+        try:
+            tracker = TransferTracker("model", model, self._emit_progress)
+            with tracker.watch():
+                self._pull_with_resume(model, tracker)
+            tracker.finish()
+        except requests.exceptions.RequestException:
+            raise InstallerError(f"Failed to pull Ollama model {model}: could not communicate with Ollama")
+
+    def pull_models(self, models: Sequence[str], concurrency: Optional[int] = None) -> List[ModelPullResult]:
+        """Pull several Ollama models, at most ``concurrency`` at a time.
+
+        ``concurrency`` defaults to :attr:`model_concurrency`.
+        Models Ollama already has are skipped after a single ``/api/tags``
+        request. Returns one result per model with its outcome and timing;
+        they are also kept in :attr:`model_results`.
+        """
+        results = pull_models(
+            models,
+            self._download_model,
+            self._available_models(),
+            concurrency=concurrency or self.model_concurrency,
+            cancel_event=self._cancel_event,
+        )
+        self.model_results = results
+        if self.verbose:
+            for result in results:
+                logger.info(
+                    "Model %s %s in %.2fs", result.name, result.status, result.duration,
+                    extra={"model": result.name, "status": result.status, "duration": round(result.duration, 3)},
+                )
+        return results
+
+    def _pull_ollama_models(self, models: Sequence[str]) -> None:
+        """Install phase: pull ``models`` and fail if any of them failed."""
+        failed = [r for r in self.pull_models(models) if r.status == "failed"]
+        if failed:
+            raise InstallerError("; ".join(str(r.error) for r in failed))
+
+    def _pull_with_resume(self, model: str, tracker: TransferTracker) -> None:
+        """Retry interrupted pulls; Ollama keeps the blobs already fetched.
+
+        Only attempts that end without new bytes count towards
+        :data:`MODEL_PULL_ATTEMPTS`, so a large model on a flaky link keeps
+        resuming as long as each attempt moves it forward.
+        """
+        import requests
+
+        delays = Backoff(initial=1, maximum=15)
+        completed = tracker.snapshot().completed
+        attempt = 0
+        while True:
+            try:
+                self._stream_model_pull(model, tracker)
+                return
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.Timeout,
+            ) as e:
+                progressed = tracker.snapshot().completed
+                if progressed > completed:
+                    attempt = 0
+                    delays.reset()
+                completed = progressed
+                attempt += 1
+                if attempt == MODEL_PULL_ATTEMPTS:
+                    raise InstallerError(f"Failed to pull Ollama model {model}: {e}")
+                logger.warning("Pull of %s interrupted (%s), resuming", model, e)
+                if self._cancel_event.wait(delays.next()):
+                    raise InstallerError(f"Pull of Ollama model {model} cancelled")
 
     def _extract_version(self, image: str) -> str:
         """Return the tag portion of a Docker image string or fallback to package version."""
@@ -263,6 +535,7 @@ class Installer:
 
     def _create_launch_script(self, port: int, image: str) -> None:
         """Create launch script for Open WebUI."""
+        _load_env()
         launch_script = os.path.join(self.config_dir, "launch-openwebui.sh")
 
         # Environment variables
@@ -286,11 +559,13 @@ class Installer:
 
     def _stop_existing_container(self) -> None:
         """Stop and remove existing Open WebUI container."""
+        import docker
+
         if not self.docker_client:
             raise InstallerError("Docker client not available")
 
         try:
-            container = self.docker_client.containers.get("open-webui")
+            container = self.docker_client.containers.get(CONTAINER_NAME)
             try:
                 # Attempt to stop the container regardless of current status
                 container.stop()
@@ -302,9 +577,18 @@ class Installer:
                 logger.info("Stopped and removed existing container")
         except docker.errors.NotFound:
             pass  # Container doesn't exist, which is fine
+        # A proxy left by a blue/green swap would hold the published port
+        remove_leftovers(self.docker_client)
+
+    def _start_container(self, port: Optional[int], image: str, name: str = CONTAINER_NAME):
+        """Start an Open WebUI container and return it once it is ready.
+
+        With ``port=None`` the web port is not published and readiness is
+        left to the caller (used for the green container of a blue/green
+        swap, which is reached through the proxy).
+        """
+        import docker
 
-    def _start_container(self, port: int, image: str) -> None:
-        """Start Open WebUI container."""
         if not self.docker_client:
             raise InstallerError("Docker client not available")
 
@@ -320,10 +604,11 @@ class Installer:
                 if secret_var in os.environ:
                     env_vars[secret_var] = os.environ[secret_var]
 
+            started_at = time.monotonic()
             container = self.docker_client.containers.run(
                 image,
-                name="open-webui",
-                ports={"8080/tcp": port},
+                name=name,
+                ports={"8080/tcp": port} if port else {},
                 volumes={"open-webui": {"bind": "/app/backend/data", "mode": "rw"}},
                 environment=env_vars,
                 extra_hosts={"host.docker.internal": "host-gateway"},
@@ -337,20 +622,135 @@ class Installer:
         except docker.errors.APIError as e:
             raise InstallerError(f"Failed to start Open WebUI container: {str(e)}")
 
+        if port:
+            self._wait_for_container(container, port, started_at)
+        return container
+
+    def _configured_port(self) -> int:
+        """Published port recorded in the config, defaulting to 3000."""
+        try:
+            with open(os.path.join(self.config_dir, "config.json")) as f:
+                return int(json.load(f).get("port", 3000))
+        except (OSError, ValueError):
+            return 3000
+
+    def _wait_for_container(self, container, port: int, started_at: float) -> ReadinessResult:
+        """Wait until ``container`` serves Open WebUI on ``port``.
+
+        Raises :class:`InstallerError` if it stops or misses
+        :attr:`ready_timeout`; otherwise records and returns the
+        start-to-ready measurement.
+        """
+        probe = container_probe(container, self._health_url(port))
+        result = self._wait_until_ready(probe, self.ready_timeout, started_at)
+        if not result.ready:
+            raise InstallerError(f"Open WebUI did not become ready: {result.reason}")
+        if self.verbose:
+            logger.info("Open WebUI ready in %.2fs after %d probes", result.elapsed, result.attempts)
+        self.readiness = result
+        return result
+
+    def _health_url(self, port: int) -> Optional[str]:
+        """Health endpoint behind the published ``port``, or ``None`` for a remote runtime.
+
+        A runtime reached over TCP or SSH publishes ports on its own host,
+        which may not be reachable from here; its containers are judged by
+        their state and health check alone.
+        """
+        base_url = getattr(getattr(self.docker_client, "api", None), "base_url", None)
+        host = urlsplit(base_url).hostname if isinstance(base_url, str) else None
+        if host is not None and host not in LOCAL_RUNTIME_HOSTS:
+            return None
+        return f"http://localhost:{port}/health"
+
+    def _http_ready(self, port: int) -> bool:
+        """Whether Open WebUI answers its health endpoint on ``port`` (assumed for a remote runtime)."""
+        url = self._health_url(port)
+        return url is None or http_probe(url)() == READY
+
+    def _wait_until_ready(
+        self, probe: Callable, timeout: float, started_at: Optional[float] = None
+    ) -> ReadinessResult:
+        """Poll ``probe`` with backoff until it succeeds, times out or the operation is cancelled."""
+        return wait_until_ready(probe, timeout, cancel_event=self._cancel_event, started_at=started_at)
+
+    def _swap_container(self, port: int, image: str) -> None:
+        """Replace the running container with one for ``image`` without downtime.
+
+        See :class:`~openwebui_installer.bluegreen.BlueGreenSwap`.
+        """
+        if not self.docker_client:
+            raise InstallerError("Docker client not available")
+
+        swap = BlueGreenSwap(
+            self.docker_client,
+            image,
+            port,
+            start_container=self._start_container,
+            wait=self._wait_until_ready,
+            http_ready=self._http_ready,
+            ready_timeout=self.ready_timeout,
+        )
+        try:
+            swap.run()
+        except SwapError as e:
+            raise InstallerError(str(e))
+        if self.verbose:
+            logger.info("Swapped Open WebUI container to %s", image)
+
+    def _announce_start(self) -> None:
+        console.print("Starting Open WebUI container...")
+        if self.verbose:
+            logger.info("Starting Open WebUI container")
+
+    def _start_phases(self, force: bool, port: int, image: str) -> List[Phase]:
+        """Phases that put the new container in service once config is written."""
+        if force:
+            # Reinstall: keep the current container serving until the
+            # replacement is healthy
+            def swap():
+                self._announce_start()
+                self._swap_container(port, image)
+
+            return [Phase("swap_container", swap, requires=("write_config",))]
+
+        def stop_existing():
+            self._announce_start()
+            self._stop_existing_container()
+
+        return [
+            Phase("stop_existing", stop_existing, requires=("write_config",)),
+            Phase(
+                "start_container",
+                lambda: self._start_container(port, image),
+                requires=("stop_existing",),
+            ),
+        ]
+
     def install(
         self,
-        model: str = "llama2",
+        model: Union[str, Sequence[str]] = "llama2",
         port: int = 3000,
         force: bool = False,
         image: Optional[str] = None,
-    ):
-        """Install Open WebUI."""
+    ) -> PipelineReport:
+        """Install Open WebUI.
+
+        ``model`` is one Ollama model name or a list of them; missing models
+        are pulled :attr:`model_concurrency` at a time and their outcomes are
+        kept in :attr:`model_results`. Returns the pipeline report with the
+        outcome and duration of each install phase; it is also kept in
+        :attr:`install_report`, including when installation fails.
+        """
+        models = [model] if isinstance(model, str) else list(model)
         try:
             if self.verbose:
                 logger.info("Starting installation")
 
             # Validate prerequisites before proceeding
             self._check_system_requirements()
+            # The check covered this install only; Docker or the disk may change before the next
+            self._requirements_checked = False
 
             # Check if already installed
             if not force and self.get_status()["installed"]:
@@ -359,32 +759,46 @@ class Installer:
             # Use provided image or default
             current_webui_image = image if image else self.webui_image
 
-            # Pull resources and configure installation
-            self._pull_webui_image(current_webui_image)
-            self._pull_ollama_model(model)
-            self._create_launch_script(port, current_webui_image)
-
-            # Create configuration file
-            config = {
-                "model": model,
-                "port": port,
-                "image": current_webui_image,
-                "version": self._extract_version(current_webui_image),
-                "installed_at": time.time(),
-                "runtime": self.runtime,
-            }
-
-            config_file = os.path.join(self.config_dir, "config.json")
-            with open(config_file, "w") as f:
-                json.dump(config, f, indent=2)
+            def write_config():
+                config = {
+                    "model": models[0] if models else None,
+                    "models": models,
+                    "port": port,
+                    "image": current_webui_image,
+                    "version": self._extract_version(current_webui_image),
+                    "installed_at": time.time(),
+                    "runtime": self.runtime,
+                }
 
-            # Start the container after installation
-            console.print("Starting Open WebUI container...")
-            if self.verbose:
-                logger.info("Starting Open WebUI container")
+                config_file = os.path.join(self.config_dir, "config.json")
+                with open(config_file, "w") as f:
+                    json.dump(config, f, indent=2)
+
+            # The image and model pulls are independent and network bound, so
+            # they run side by side; the running container is only replaced
+            # once everything it needs is in place.
+            pipeline = Pipeline([
+                Phase("pull_image", lambda: self._pull_webui_image(current_webui_image)),
+                Phase("pull_model", lambda: self._pull_ollama_models(models)),
+                Phase("launch_script", lambda: self._create_launch_script(port, current_webui_image)),
+                Phase("write_config", write_config, requires=("pull_image", "pull_model", "launch_script")),
+                *self._start_phases(force, port, current_webui_image),
+            ])
+            self._cancel_event = pipeline.cancel_event
+            try:
+                report = pipeline.run()
+            finally:
+                self.install_report = pipeline.report
+                # A failed run leaves its event set; later calls need a fresh one
+                self._cancel_event = threading.Event()
+                if self.verbose:
+                    for phase in pipeline.report.phases:
+                        logger.info(
+                            "Phase %s %s in %.2fs", phase.name, phase.status, phase.duration,
+                            extra={"phase": phase.name, "status": phase.status, "duration": round(phase.duration, 3)},
+                        )
 
-            self._stop_existing_container()
-            self._start_container(port, current_webui_image)
+            return report
 
         except Exception as e:
             if self.verbose:
@@ -393,6 +807,8 @@ class Installer:
 
     def uninstall(self):
         """Uninstall Open WebUI."""
+        import docker
+
         if not self.docker_client:
             raise InstallerError("Docker client not available")
 
@@ -402,6 +818,7 @@ class Installer:
 
             # Stop and remove container
             self._stop_existing_container()
+            remove_resources(self.docker_client)
 
             # Remove Docker volume
             try:
@@ -422,6 +839,28 @@ class Installer:
                 logger.error(f"Uninstallation failed: {str(e)}")
             raise InstallerError(f"Uninstallation failed: {str(e)}")
 
+    def _container_running(self) -> bool:
+        """Whether the Open WebUI container is running."""
+        if not self.connection.opened:
+            # Ask the API socket directly rather than loading the Docker SDK
+            _load_env()
+            try:
+                return self.connection.peek_container_status(CONTAINER_NAME) == "running"
+            except LookupError:
+                pass
+
+        import docker
+
+        if not self.docker_client:
+            return False
+        try:
+            return self.docker_client.containers.get(CONTAINER_NAME).status == "running"
+        except docker.errors.NotFound:
+            return False
+        except Exception:
+            # If Docker client fails, assume not running
+            return False
+
     def get_status(self) -> Dict:
         """Get installation and running status."""
         try:
@@ -439,21 +878,9 @@ class Installer:
             with open(config_file) as f:
                 config = json.load(f)
 
-            # Check if container is running
-            running = False
-            if self.docker_client:
-                try:
-                    container = self.docker_client.containers.get("open-webui")
-                    running = container.status == "running"
-                except docker.errors.NotFound:
-                    pass
-                except Exception:
-                    # If Docker client fails, assume not running
-                    pass
-
             return {
                 "installed": True,
-                "running": running,
+                "running": self._container_running(),
                 "version": config.get("version", config.get("image", "unknown")),
                 "port": config.get("port", 3000),
                 "model": config.get("model", "unknown"),
@@ -472,19 +899,26 @@ class Installer:
                 "error": str(e)
             }
 
-    def start(self):
-        """Start Open WebUI container."""
+    def start(self) -> ReadinessResult:
+        """Start Open WebUI container and wait until it is ready.
+
+        Returns the start-to-ready measurement.
+        """
+        import docker
+
         if not self.docker_client:
             raise InstallerError("Docker client not available")
 
         try:
-            container = self.docker_client.containers.get("open-webui")
+            container = self.docker_client.containers.get(CONTAINER_NAME)
+            started_at = time.monotonic()
             if container.status != "running":
                 container.start()
                 if self.verbose:
                     logger.info("Started Open WebUI container")
             else:
                 console.print("Open WebUI is already running")
+            return self._wait_for_container(container, self._configured_port(), started_at)
         except docker.errors.NotFound:
             raise InstallerError("Open WebUI container not found. Please install first.")
         except Exception as e:
@@ -492,11 +926,13 @@ class Installer:
 
     def stop(self):
         """Stop Open WebUI container."""
+        import docker
+
         if not self.docker_client:
             raise InstallerError("Docker client not available")
 
         try:
-            container = self.docker_client.containers.get("open-webui")
+            container = self.docker_client.containers.get(CONTAINER_NAME)
             if container.status == "running":
                 container.stop()
                 if self.verbose:
@@ -508,23 +944,62 @@ class Installer:
         except Exception as e:
             raise InstallerError(f"Failed to stop container: {e}")
 
-    def restart(self):
-        """Restart Open WebUI container."""
+    def restart(self) -> ReadinessResult:
+        """Restart Open WebUI container and wait until it is ready.
+
+        Returns the start-to-ready measurement.
+        """
+        import docker
+
         if not self.docker_client:
             raise InstallerError("Docker client not available")
 
         try:
-            container = self.docker_client.containers.get("open-webui")
+            container = self.docker_client.containers.get(CONTAINER_NAME)
+            started_at = time.monotonic()
             container.restart()
             if self.verbose:
                 logger.info("Restarted Open WebUI container")
+            return self._wait_for_container(container, self._configured_port(), started_at)
         except docker.errors.NotFound:
             raise InstallerError("Open WebUI container not found")
         except Exception as e:
             raise InstallerError(f"Failed to restart container: {e}")
 
-    def update(self, image: Optional[str] = None):
-        """Update Open WebUI to latest version."""
+    def _remote_digest(self, image: str) -> Optional[str]:
+        """Manifest digest the registry currently serves for ``image``, if reachable."""
+        try:
+            return self.registry.resolve_digest(image)
+        except RegistryError as e:
+            logger.warning("Could not resolve remote digest for %s: %s", image, e)
+            return None
+
+    def _container_current(self, image: str, digest: Optional[str] = None) -> bool:
+        """Whether the running container uses the local ``image``.
+
+        With ``digest`` the local image must also have been pulled at that
+        manifest digest.
+        """
+        import docker
+
+        try:
+            local = self.docker_client.images.get(image)
+            container = self.docker_client.containers.get(CONTAINER_NAME)
+        except docker.errors.NotFound:
+            return False
+        if container.status != "running" or container.attrs.get("Image") != local.id:
+            return False
+        if digest is None:
+            return True
+        repo_digests = local.attrs.get("RepoDigests") or []
+        return any(entry.partition("@")[2] == digest for entry in repo_digests)
+
+    def update(self, image: Optional[str] = None) -> bool:
+        """Update Open WebUI to latest version.
+
+        Returns ``False`` without pulling or restarting anything when the
+        running container already uses the image the registry serves.
+        """
         try:
             if self.verbose:
                 logger.info("Starting update")
@@ -540,14 +1015,19 @@ class Installer:
             # Use provided image or current image from config
             current_image = image if image else config.get("image", self.webui_image)
 
+            digest = self._remote_digest(current_image)
+            if digest and self._container_current(current_image, digest):
+                if self.verbose:
+                    logger.info(f"{current_image} is already up to date at {digest}")
+                return False
+
             # Pull latest image
             self._pull_webui_image(current_image)
 
-            # Stop current container
-            self._stop_existing_container()
-
-            # Start with updated image
-            self._start_container(config["port"], current_image)
+            # The pull may have been a no-op (e.g. registry unreachable for the
+            # digest check); only recreate the container if its image changed
+            if not self._container_current(current_image):
+                self._swap_container(config["port"], current_image)
 
             # Update config
             config["image"] = current_image
@@ -557,30 +1037,66 @@ class Installer:
 
             if self.verbose:
                 logger.info("Update completed")
+            return True
 
         except Exception as e:
             if self.verbose:
                 logger.error(f"Update failed: {str(e)}")
             raise InstallerError(f"Update failed: {str(e)}")
 
-    def show_logs(self, tail: int = 50, follow: bool = False):
-        """Show Open WebUI container logs."""
+    def show_logs(
+        self,
+        tail: Union[int, str] = 50,
+        follow: bool = False,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        pattern: Optional[str] = None,
+        level: Optional[str] = None,
+        count: bool = False,
+        ignore_case: bool = False,
+    ) -> int:
+        """Show Open WebUI container logs.
+
+        ``since`` and ``until`` (see :func:`~openwebui_installer.logfilter.parse_time`)
+        and ``tail`` are passed to the runtime, so only that window is
+        transferred. ``pattern`` and ``level`` filter the stream line by line
+        as it arrives, and matches are written in batches (plain text when
+        stdout is not a terminal). With ``count`` matching lines are counted
+        instead of printed. Returns the number of matching lines.
+        """
+        import docker
+
+        from .logfilter import LineFilter, parse_time, split_lines
+
         if not self.docker_client:
             raise InstallerError("Docker client not available")
 
-        try:
-            container = self.docker_client.containers.get("open-webui")
-
-            if follow:
-                for log in container.logs(stream=True, follow=True, tail=tail):
-                    console.print(log.decode("utf-8").strip())
-            else:
-                logs = container.logs(tail=tail).decode("utf-8")
-                console.print(logs)
+        line_filter = LineFilter(pattern, level, ignore_case)
+        options = {"tail": tail}
+        if since:
+            options["since"] = parse_time(since)
+        if until:
+            options["until"] = parse_time(until)
 
+        try:
+            container = self.docker_client.containers.get(CONTAINER_NAME)
+            chunks = container.logs(stream=True, follow=follow, **options)
         except docker.errors.NotFound:
             raise InstallerError("Open WebUI container not found")
 
+        matched = 0
+        try:
+            # Batched so chatty containers are not limited by per-line writes
+            with LineWriter(console) as out:
+                for line in line_filter.apply(split_lines(chunks)):
+                    matched += 1
+                    if not count:
+                        out.write(line)
+        finally:
+            if hasattr(chunks, "close"):
+                chunks.close()
+        return matched
+
     def enable_autostart(self):
         """Enable autostart on macOS using launchd."""
         if platform.system() != "Darwin":
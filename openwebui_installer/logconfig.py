@@ -0,0 +1,126 @@
+"""
+Process-wide installer log file, written off the caller's thread
+"""
+
+import atexit
+import gzip
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+# Records of every module in the package end up in the log file
+LOGGER_NAME = "openwebui_installer"
+MAX_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 3
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+# Set to "json" to write one JSON object per record
+FORMAT_ENV = "OPENWEBUI_LOG_FORMAT"
+# ``extra`` fields copied into JSON records when present
+EXTRA_FIELDS = ("phase", "duration", "model", "status")
+
+_lock = threading.Lock()
+_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+_target: Optional[tuple] = None
+_atexit_registered = False
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as single-line JSON objects.
+
+    Records logged with ``extra={"phase": ..., "duration": ...}`` keep
+    those as fields, so phase timings can be read without parsing messages.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name in EXTRA_FIELDS:
+            value = getattr(record, name, None)
+            if value is not None:
+                entry[name] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def _gzip_name(name: str) -> str:
+    return f"{name}.gz"
+
+
+def _gzip_rotate(source: str, dest: str) -> None:
+    """Compress the file being rotated out into ``dest`` and remove it."""
+    with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+def _file_handler(log_file: str, json_format: bool) -> RotatingFileHandler:
+    handler = RotatingFileHandler(log_file, maxBytes=MAX_BYTES, backupCount=BACKUP_COUNT)
+    # Backups become openwebui_installer.log.1.gz, .2.gz ...
+    handler.namer = _gzip_name
+    handler.rotator = _gzip_rotate
+    handler.setFormatter(JSONFormatter() if json_format else logging.Formatter(TEXT_FORMAT))
+    return handler
+
+
+def configure(log_file: str, level: int = logging.INFO, json_format: Optional[bool] = None) -> None:
+    """Write the package's log records to ``log_file``.
+
+    Callers only put records on a queue; a listener thread formats them,
+    writes the file and compresses rotated backups, so logging never waits
+    on disk. The handlers are installed once per process: calling this
+    again with the same file does nothing, and a different file replaces
+    the previous one. ``json_format`` defaults to ``OPENWEBUI_LOG_FORMAT=json``.
+    """
+    global _handler, _listener, _target, _atexit_registered
+
+    if json_format is None:
+        json_format = os.environ.get(FORMAT_ENV, "").lower() == "json"
+    target = (os.path.abspath(log_file), json_format)
+    package = logging.getLogger(LOGGER_NAME)
+    with _lock:
+        if package.level == logging.NOTSET or package.level > level:
+            package.setLevel(level)
+        if target == _target:
+            return
+        _stop()
+
+        records = queue.SimpleQueue()
+        _listener = QueueListener(records, _file_handler(log_file, json_format), respect_handler_level=True)
+        _listener.start()
+        _handler = QueueHandler(records)
+        package.addHandler(_handler)
+        _target = target
+        if not _atexit_registered:
+            atexit.register(shutdown)
+            _atexit_registered = True
+
+
+def _stop() -> None:
+    global _handler, _listener, _target
+
+    if _handler is not None:
+        logging.getLogger(LOGGER_NAME).removeHandler(_handler)
+    if _listener is not None:
+        # Writes out whatever is still queued
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+    _handler = _listener = _target = None
+
+
+def shutdown() -> None:
+    """Flush queued records and close the log file."""
+    with _lock:
+        _stop()
@@ -0,0 +1,117 @@
+"""
+Time windows and line filters for container log queries
+"""
+
+import codecs
+import re
+import time
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, List, Optional, Pattern, Union
+
+LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+# Spellings seen in Open WebUI (uvicorn, loguru) and Ollama logs
+_LEVEL_ALIASES = {"WARN": "WARNING", "FATAL": "CRITICAL", "ERR": "ERROR"}
+_LEVEL_RE = re.compile(r"\b(DEBUG|INFO|WARNING|WARN|ERROR|ERR|CRITICAL|FATAL)\b")
+_DURATION_RE = re.compile(r"^(\d+(?:\.\d+)?)([smhdw])$")
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def parse_time(value: str, now: Optional[float] = None) -> Union[int, datetime]:
+    """Parse a ``--since``/``--until`` value for the runtime's log API.
+
+    Accepts a duration before now (``90s``, ``10m``, ``2h``, ``1d``), a Unix
+    timestamp, or an ISO 8601 date/time (taken as UTC without an offset).
+    Raises ``ValueError`` for anything else.
+    """
+    value = value.strip()
+    match = _DURATION_RE.match(value)
+    if match:
+        now = time.time() if now is None else now
+        return int(now - float(match.group(1)) * _UNITS[match.group(2)])
+    if value.isdigit():
+        return int(value)
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"Invalid time {value!r}; use e.g. 10m, 2h, 1d or 2024-05-01T12:00:00")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def line_level(line: str) -> Optional[str]:
+    """The first log level named in ``line``, normalized, or ``None``."""
+    match = _LEVEL_RE.search(line)
+    if match is None:
+        return None
+    level = match.group(1)
+    return _LEVEL_ALIASES.get(level, level)
+
+
+class LineFilter:
+    """Keep lines matching a regular expression and/or at or above a level.
+
+    ``pattern`` is compiled once. With ``level`` set, lines naming no level
+    at all (such as traceback lines) are kept when they follow a kept line,
+    so multi-line records stay whole.
+    """
+
+    def __init__(self, pattern: Optional[str] = None, level: Optional[str] = None, ignore_case: bool = False):
+        self.regex: Optional[Pattern[str]] = (
+            re.compile(pattern, re.IGNORECASE if ignore_case else 0) if pattern else None
+        )
+        if level is not None:
+            level = _LEVEL_ALIASES.get(level.upper(), level.upper())
+            if level not in LEVELS:
+                raise ValueError(f"Unknown log level {level}; use one of {', '.join(LEVELS)}")
+        self.min_level = LEVELS.index(level) if level else None
+        self._keeping = False
+
+    @property
+    def active(self) -> bool:
+        return self.regex is not None or self.min_level is not None
+
+    def _level_ok(self, line: str) -> bool:
+        if self.min_level is None:
+            return True
+        level = line_level(line)
+        if level is None:
+            return self._keeping
+        self._keeping = LEVELS.index(level) >= self.min_level
+        return self._keeping
+
+    def __call__(self, line: str) -> bool:
+        if not self._level_ok(line):
+            return False
+        return self.regex is None or self.regex.search(line) is not None
+
+    def apply(self, lines: Iterable[str]) -> Iterator[str]:
+        """Lazily yield the matching ``lines``."""
+        return (line for line in lines if self(line))
+
+
+def split_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Turn a stream of byte chunks into decoded lines without a trailing newline.
+
+    Chunks may end anywhere, even inside a multi-byte character. Each one
+    is decoded once as it arrives; invalid UTF-8 becomes U+FFFD instead of
+    raising.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    # Pieces of a line that has not ended yet
+    partial: List[str] = []
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if "\n" not in text:
+            partial.append(text)
+            continue
+        lines = text.split("\n")
+        if partial:
+            partial.append(lines[0])
+            lines[0] = "".join(partial)
+        partial = [lines.pop()]
+        for line in lines:
+            yield line.rstrip("\r")
+    rest = "".join(partial) + decoder.decode(b"", final=True)
+    if rest:
+        yield rest.rstrip("\r")
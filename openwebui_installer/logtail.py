@@ -0,0 +1,132 @@
+"""
+Constant-memory tail and follow of rotated log files
+"""
+
+import gzip
+import os
+import threading
+from collections import deque
+from typing import Iterator, List, Optional
+
+BLOCK_SIZE = 64 * 1024
+# Rotated backups are only looked for up to this suffix
+MAX_BACKUPS = 20
+
+
+def backups(path: str) -> List[str]:
+    """Existing rotated backups of ``path``, newest first.
+
+    Both plain (``.1``, ``.2`` ...) and compressed (``.1.gz`` ...) backups
+    are found, as written before and after :mod:`~openwebui_installer.logconfig`.
+    """
+    found = []
+    for i in range(1, MAX_BACKUPS + 1):
+        for candidate in (f"{path}.{i}", f"{path}.{i}.gz"):
+            if os.path.exists(candidate):
+                found.append(candidate)
+                break
+        else:
+            break
+    return found
+
+
+def _decode(line: bytes) -> str:
+    return line.decode("utf-8", errors="replace").rstrip("\r")
+
+
+def tail_file(path: str, lines: int, block_size: int = BLOCK_SIZE) -> List[str]:
+    """Last ``lines`` lines of ``path``, read backwards in blocks from the end.
+
+    Only the blocks holding those lines are read, so time and memory do not
+    depend on the file size.
+    """
+    if lines <= 0:
+        return []
+    with open(path, "rb") as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        chunks: List[bytes] = []
+        newlines = 0
+        # A trailing newline ends the last line rather than starting a new one
+        while position > 0 and newlines < lines:
+            size = min(block_size, position)
+            position -= size
+            f.seek(position)
+            chunk = f.read(size)
+            if position + size == end and chunk.endswith(b"\n"):
+                newlines -= 1
+            newlines += chunk.count(b"\n")
+            chunks.append(chunk)
+    data = b"".join(reversed(chunks))
+    if data.endswith(b"\n"):
+        data = data[:-1]
+    if not data:
+        return []
+    return [_decode(line) for line in data.split(b"\n")[-lines:]]
+
+
+def tail_gzip(path: str, lines: int) -> List[str]:
+    """Last ``lines`` lines of a compressed backup.
+
+    Compressed data cannot be read backwards, so the file is decompressed
+    as a stream keeping only the last ``lines`` lines in memory.
+    """
+    if lines <= 0:
+        return []
+    with gzip.open(path, "rb") as f:
+        last = deque(f, maxlen=lines)
+    return [_decode(line.rstrip(b"\n")) for line in last]
+
+
+def tail(path: str, lines: int) -> List[str]:
+    """Last ``lines`` lines of ``path`` and, when it is shorter, its rotated backups."""
+    result: List[str] = []
+    for name in [path] + backups(path):
+        if not os.path.exists(name):
+            continue
+        read = tail_gzip if name.endswith(".gz") else tail_file
+        result = read(name, lines - len(result)) + result
+        if len(result) >= lines:
+            break
+    return result
+
+
+def follow(
+    path: str,
+    stop_event: Optional[threading.Event] = None,
+    interval: float = 0.25,
+) -> Iterator[str]:
+    """Yield lines appended to ``path`` until ``stop_event`` is set.
+
+    Starts at the current end of the file. When the file is rotated (a new
+    file appears under ``path``) or truncated, the rest of the old file is
+    read and following continues from the start of the new one.
+    """
+    stop_event = stop_event or threading.Event()
+    f = open(path, "rb")
+    try:
+        f.seek(0, os.SEEK_END)
+        pending = b""
+        while not stop_event.is_set():
+            chunk = f.read(BLOCK_SIZE)
+            if chunk:
+                *complete, pending = (pending + chunk).split(b"\n")
+                for line in complete:
+                    yield _decode(line)
+                continue
+
+            try:
+                current = os.stat(path)
+            except FileNotFoundError:
+                current = None  # Between rename and reopen; wait for the new file
+            opened = os.fstat(f.fileno())
+            if current is not None and (current.st_ino != opened.st_ino or current.st_size < f.tell()):
+                if pending:
+                    yield _decode(pending)
+                    pending = b""
+                f.close()
+                f = open(path, "rb")
+                continue
+            stop_event.wait(interval)
+    finally:
+        f.close()
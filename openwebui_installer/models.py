@@ -0,0 +1,111 @@
+"""
+Model lists and bounded-concurrency pulls of Ollama models
+"""
+
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional, Set
+
+# Concurrent pulls; Ollama downloads several blobs per model in parallel
+# already, so a handful of models at once saturates most links.
+DEFAULT_CONCURRENCY = 3
+
+
+@dataclass
+class ModelPullResult:
+    """Outcome of pulling one model.
+
+    ``status`` is one of ``pulled``, ``present`` (already available, so
+    skipped), ``failed`` or ``cancelled`` (never started).
+    """
+
+    name: str
+    status: str = "cancelled"
+    duration: float = 0.0
+    error: Optional[BaseException] = field(default=None, repr=False)
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("pulled", "present")
+
+
+def normalize_model(name: str) -> str:
+    """Return ``name`` with Ollama's implicit ``:latest`` tag made explicit."""
+    name = name.strip()
+    last = name.rsplit("/", 1)[-1]
+    return name if ":" in last else f"{name}:latest"
+
+
+def load_manifest(path: str) -> List[str]:
+    """Read model names from a manifest file.
+
+    Accepts a JSON list, a JSON object with a ``models`` list, or plain
+    text with one model per line (blank lines and ``#`` comments ignored).
+    """
+    with open(path) as f:
+        text = f.read()
+    try:
+        data = json.loads(text)
+    except ValueError:
+        lines = (line.split("#", 1)[0].strip() for line in text.splitlines())
+        return [line for line in lines if line]
+    if isinstance(data, dict):
+        data = data.get("models", [])
+    if not isinstance(data, list) or not all(isinstance(m, str) for m in data):
+        raise ValueError(f"{path} must list model names")
+    return [m.strip() for m in data if m.strip()]
+
+
+def unique_models(models: Iterable[str]) -> List[str]:
+    """Drop blank and duplicate names, keeping first-seen order."""
+    seen: Set[str] = set()
+    result = []
+    for model in models:
+        key = normalize_model(model) if model.strip() else ""
+        if key and key not in seen:
+            seen.add(key)
+            result.append(model.strip())
+    return result
+
+
+def pull_models(
+    models: Iterable[str],
+    pull: Callable[[str], None],
+    available: Set[str],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    cancel_event: Optional[threading.Event] = None,
+) -> List[ModelPullResult]:
+    """Pull each model not in ``available``, at most ``concurrency`` at a time.
+
+    ``available`` holds normalized names (see :func:`normalize_model`).
+    A failed pull does not stop the others; once ``cancel_event`` is set no
+    further pulls start. Results are returned in input order.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    cancel_event = cancel_event or threading.Event()
+    results = [ModelPullResult(model) for model in unique_models(models)]
+
+    def run(result: ModelPullResult) -> None:
+        if normalize_model(result.name) in available:
+            result.status = "present"
+            return
+        if cancel_event.is_set():
+            return
+        start = time.monotonic()
+        try:
+            pull(result.name)
+            result.status = "pulled"
+        except Exception as e:
+            result.status = "failed"
+            result.error = e
+        finally:
+            result.duration = time.monotonic() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="model-pull") as pool:
+        list(pool.map(run, results))
+    return results
@@ -0,0 +1,219 @@
+"""
+Pooled client for the Ollama HTTP API
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Union
+from urllib.parse import urlsplit, urlunsplit
+
+from .models import normalize_model
+
+DEFAULT_URL = "http://localhost:11434"
+# Seconds a model listing is reused before Ollama is asked again
+TAGS_TTL = 5.0
+# Seconds a streaming request may go without data (read timeout between chunks)
+STREAM_IDLE_TIMEOUT = 120
+
+# Names the container uses to reach the host; from the host itself they
+# mean localhost
+_HOST_ALIASES = ("host.docker.internal", "host.containers.internal")
+
+
+class OllamaError(Exception):
+    """Raised when Ollama rejects a request or reports an error."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+def resolve_url(url: Optional[str] = None) -> str:
+    """Return the base URL of the Ollama API as seen from this host.
+
+    Uses ``url`` if given, else ``OLLAMA_HOST`` (Ollama's own setting,
+    e.g. ``0.0.0.0:11434``), else ``OLLAMA_BASE_URL`` (the URL handed to
+    the Open WebUI container), else :data:`DEFAULT_URL`. Wildcard and
+    container-to-host addresses are mapped to localhost.
+    """
+    url = url or os.environ.get("OLLAMA_HOST") or os.environ.get("OLLAMA_BASE_URL") or DEFAULT_URL
+    if "://" not in url:
+        url = f"http://{url}"
+    parts = urlsplit(url)
+    host = parts.hostname or "localhost"
+    if host in _HOST_ALIASES or host in ("0.0.0.0", "::"):
+        host = "localhost"
+    elif ":" in host:
+        host = f"[{host}]"
+    netloc = f"{host}:{parts.port or 11434}"
+    return urlunsplit((parts.scheme, netloc, parts.path.rstrip("/"), "", ""))
+
+
+class JSONStream:
+    """Iterate the newline-delimited JSON messages of a streaming response.
+
+    Raises :class:`OllamaError` when a message carries an ``error``.
+    Transport failures (dropped connection, idle timeout) surface as
+    ``requests`` exceptions so callers can retry. :meth:`close` may be
+    called from another thread to abort a blocked read.
+    """
+
+    def __init__(self, response):
+        self.response = response
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for line in self.response.iter_lines():
+            if not line:
+                continue
+            try:
+                message = json.loads(line)
+            except ValueError:
+                raise OllamaError("Unexpected response from Ollama")
+            if "error" in message:
+                raise OllamaError(message["error"])
+            yield message
+
+    def close(self) -> None:
+        self.response.close()
+
+    def __enter__(self) -> "JSONStream":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+class OllamaClient:
+    """Talk to Ollama over one keep-alive connection pool.
+
+    Model listings are cached for ``tags_ttl`` seconds, so repeated status
+    and model checks share a single round trip; pulls invalidate the cache.
+    The session is created on first use and is safe to share between the
+    installer's worker threads.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        timeout: float = 10,
+        tags_ttl: float = TAGS_TTL,
+        pool_size: int = 10,
+        session=None,
+    ):
+        self.url = resolve_url(url)
+        self.timeout = timeout
+        self.tags_ttl = tags_ttl
+        self.pool_size = pool_size
+        self._session = session
+        self._lock = threading.Lock()
+        self._tags: Optional[List[Dict[str, Any]]] = None
+        self._tags_at = 0.0
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def _check(self, response, what: str) -> None:
+        if response.status_code == 200:
+            return
+        try:
+            detail = response.json().get("error", "")
+        except (ValueError, AttributeError):
+            detail = ""
+        message = f"{what} failed: HTTP {response.status_code}"
+        raise OllamaError(f"{message}: {detail}" if detail else message, status=response.status_code)
+
+    def list_models(self, max_age: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Return Ollama's local models (``/api/tags``).
+
+        A listing younger than ``max_age`` seconds (default ``tags_ttl``) is
+        reused. Raises ``requests`` exceptions when Ollama is unreachable.
+        """
+        max_age = self.tags_ttl if max_age is None else max_age
+        with self._lock:
+            if self._tags is not None and time.monotonic() - self._tags_at < max_age:
+                return self._tags
+        response = self.session.get(f"{self.url}/api/tags", timeout=self.timeout)
+        self._check(response, "Listing models")
+        models = response.json().get("models", [])
+        with self._lock:
+            self._tags, self._tags_at = models, time.monotonic()
+        return models
+
+    def model_names(self, max_age: Optional[float] = None) -> Set[str]:
+        """Normalized names of the local models (see :func:`normalize_model`)."""
+        return {normalize_model(m["name"]) for m in self.list_models(max_age)}
+
+    def invalidate(self) -> None:
+        """Forget the cached model listing."""
+        with self._lock:
+            self._tags = None
+
+    def _stream(self, path: str, body: Dict[str, Any], what: str, idle_timeout: float) -> JSONStream:
+        response = self.session.post(
+            f"{self.url}{path}",
+            json=body,
+            stream=True,
+            # The read timeout applies between chunks, so it bounds idle time
+            # rather than the whole (possibly many hour) transfer
+            timeout=(self.timeout, idle_timeout),
+        )
+        try:
+            self._check(response, what)
+        except OllamaError:
+            response.close()
+            raise
+        return JSONStream(response)
+
+    def pull(self, model: str, idle_timeout: float = STREAM_IDLE_TIMEOUT) -> JSONStream:
+        """Start pulling ``model``; iterate the result for progress messages.
+
+        Ollama keeps partially downloaded blobs, so pulling again after an
+        interruption resumes rather than restarts.
+        """
+        self.invalidate()
+        return self._stream(
+            "/api/pull", {"model": model, "name": model, "stream": True}, f"Pulling {model}", idle_timeout
+        )
+
+    def generate(
+        self,
+        model: str,
+        prompt: str,
+        idle_timeout: float = STREAM_IDLE_TIMEOUT,
+        **options: Any,
+    ) -> JSONStream:
+        """Stream a completion; each message carries a ``response`` fragment."""
+        body = {"model": model, "prompt": prompt, "stream": True}
+        if options:
+            body["options"] = options
+        return self._stream("/api/generate", body, f"Generating with {model}", idle_timeout)
+
+    def embed(self, model: str, inputs: Union[str, Sequence[str]]) -> List[List[float]]:
+        """Return one embedding per input (``/api/embed`` does not stream)."""
+        response = self.session.post(
+            f"{self.url}/api/embed",
+            json={"model": model, "input": inputs if isinstance(inputs, str) else list(inputs)},
+            timeout=(self.timeout, STREAM_IDLE_TIMEOUT),
+        )
+        self._check(response, f"Embedding with {model}")
+        return response.json().get("embeddings", [])
+
+    def close(self) -> None:
+        """Release pooled connections."""
+        with self._lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
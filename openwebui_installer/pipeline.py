@@ -0,0 +1,133 @@
+"""
+Dependency-ordered concurrent execution of install phases
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+@dataclass
+class Phase:
+    """A unit of work that may start once every phase in ``requires`` succeeded."""
+
+    name: str
+    func: Callable[[], Any]
+    requires: Sequence[str] = ()
+
+
+@dataclass
+class PhaseResult:
+    """Outcome and timing of one phase.
+
+    ``status`` is one of ``done``, ``failed`` or ``cancelled`` (never
+    started because another phase failed).
+    """
+
+    name: str
+    status: str = "cancelled"
+    duration: float = 0.0
+    error: Optional[BaseException] = field(default=None, repr=False)
+
+
+@dataclass
+class PipelineReport:
+    """Per-phase results in declaration order plus total wall time."""
+
+    phases: List[PhaseResult]
+    duration: float = 0.0
+
+    @property
+    def timings(self) -> Dict[str, float]:
+        """Seconds spent in each phase that ran."""
+        return {p.name: p.duration for p in self.phases if p.status != "cancelled"}
+
+
+def _check_acyclic(phases: Sequence[Phase]) -> None:
+    """Raise ``ValueError`` if the ``requires`` graph has a cycle."""
+    requires = {p.name: set(p.requires) for p in phases}
+    resolved: set = set()
+    while requires:
+        ready = [name for name, deps in requires.items() if deps <= resolved]
+        if not ready:
+            raise ValueError(f"Phases have circular requirements: {sorted(requires)}")
+        for name in ready:
+            resolved.add(name)
+            del requires[name]
+
+
+class Pipeline:
+    """Run phases as a dependency graph, overlapping independent ones.
+
+    When a phase fails no further phases are started and :attr:`cancel_event`
+    is set so long-running phases can stop early; phases already running are
+    waited for so nothing is left half-done in the background. The error of
+    the first failed phase (in declaration order) is then re-raised.
+    """
+
+    def __init__(self, phases: Sequence[Phase], max_workers: int = 4):
+        names = [p.name for p in phases]
+        if len(set(names)) != len(names):
+            raise ValueError("Phase names must be unique")
+        for phase in phases:
+            missing = set(phase.requires) - set(names)
+            if missing:
+                raise ValueError(f"Phase {phase.name} requires unknown phases: {sorted(missing)}")
+        _check_acyclic(phases)
+        self.phases = list(phases)
+        self.max_workers = max_workers
+        self.cancel_event = threading.Event()
+        self.report: Optional[PipelineReport] = None
+
+    def _run_phase(self, phase: Phase, result: PhaseResult) -> None:
+        start = time.monotonic()
+        try:
+            phase.func()
+            result.status = "done"
+        except BaseException as e:
+            result.status = "failed"
+            result.error = e
+            raise
+        finally:
+            result.duration = time.monotonic() - start
+
+    def run(self) -> PipelineReport:
+        """Execute every phase and return the report.
+
+        Raises the first failing phase's exception after in-flight phases
+        have finished. :attr:`report` is populated in either case.
+        """
+        start = time.monotonic()
+        results = {p.name: PhaseResult(p.name) for p in self.phases}
+        self.report = PipelineReport([results[p.name] for p in self.phases])
+        pending = list(self.phases)
+        done = set()
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="install") as pool:
+            while pending or running:
+                if not self.cancel_event.is_set():
+                    for phase in [p for p in pending if set(p.requires) <= done]:
+                        pending.remove(phase)
+                        future = pool.submit(self._run_phase, phase, results[phase.name])
+                        running[future] = phase
+
+                if not running:
+                    # Nothing can make progress: either cancelled or a dependency failed
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    phase = running.pop(future)
+                    if future.exception() is None:
+                        done.add(phase.name)
+                    else:
+                        self.cancel_event.set()
+
+        self.report.duration = time.monotonic() - start
+        for result in self.report.phases:
+            if result.status == "failed":
+                raise result.error
+        return self.report
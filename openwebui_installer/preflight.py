@@ -0,0 +1,132 @@
+"""
+Concurrent preflight checks for Open WebUI Installer
+"""
+
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+class CheckFailed(Exception):
+    """Raised by a check function to report a failed probe."""
+
+    def __init__(self, message: str, **detail: Any):
+        super().__init__(message)
+        self.detail = detail
+
+
+@dataclass
+class Check:
+    """A single independent probe.
+
+    ``func`` returns an optional detail dict on success and raises
+    :class:`CheckFailed` (or any other exception) on failure.
+    """
+
+    name: str
+    func: Callable[[], Optional[Dict[str, Any]]]
+    timeout: float = 10.0
+    required: bool = True
+    description: str = ""
+
+
+@dataclass
+class CheckResult:
+    """Outcome of one check."""
+
+    name: str
+    ok: bool
+    message: str = ""
+    duration: float = 0.0
+    required: bool = True
+    timed_out: bool = False
+    detail: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class PreflightReport:
+    """Results of every check, in the order they were declared."""
+
+    results: List[CheckResult]
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether every required check passed."""
+        return not self.failures
+
+    @property
+    def failures(self) -> List[CheckResult]:
+        """Failed required checks, in declaration order."""
+        return [r for r in self.results if r.required and not r.ok]
+
+    def get(self, name: str) -> Optional[CheckResult]:
+        """Return the result for the check called ``name``."""
+        for result in self.results:
+            if result.name == name:
+                return result
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serialisable representation."""
+        return {
+            "ok": self.ok,
+            "duration": round(self.duration, 3),
+            "checks": [
+                dict(asdict(r), duration=round(r.duration, 3)) for r in self.results
+            ],
+        }
+
+
+def _run(check: Check, slot: List[CheckResult]) -> None:
+    """Execute ``check`` and store its result in ``slot``."""
+    start = time.monotonic()
+    try:
+        detail = check.func() or {}
+        result = CheckResult(check.name, True, detail=detail)
+    except CheckFailed as e:
+        result = CheckResult(check.name, False, str(e), detail=e.detail)
+    except Exception as e:
+        result = CheckResult(check.name, False, str(e) or e.__class__.__name__)
+    result.duration = time.monotonic() - start
+    result.required = check.required
+    slot.append(result)
+
+
+def run_checks(checks: Sequence[Check]) -> PreflightReport:
+    """Run ``checks`` concurrently, each bounded by its own deadline.
+
+    Every check starts at once, so the worst case is the largest single
+    timeout rather than their sum. Probes that miss their deadline are
+    reported as failed and left to finish on a daemon thread, so a hung
+    daemon can never keep the process alive.
+    """
+    start = time.monotonic()
+    running = []
+    for check in checks:
+        slot: List[CheckResult] = []
+        thread = threading.Thread(
+            target=_run, args=(check, slot), name=f"preflight-{check.name}", daemon=True
+        )
+        thread.start()
+        running.append((check, thread, slot))
+
+    results = []
+    for check, thread, slot in running:
+        thread.join(max(0.0, start + check.timeout - time.monotonic()))
+        if slot:
+            results.append(slot[0])
+        else:
+            results.append(
+                CheckResult(
+                    check.name,
+                    False,
+                    f"{check.description or check.name} did not respond within {check.timeout:g}s",
+                    duration=time.monotonic() - start,
+                    required=check.required,
+                    timed_out=True,
+                )
+            )
+
+    return PreflightReport(results, duration=time.monotonic() - start)
@@ -0,0 +1,271 @@
+"""
+Byte-level progress tracking for image and model pulls
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+# How long without any byte progress before a transfer counts as stalled
+DEFAULT_STALL_AFTER = 30.0
+# Window used to compute throughput
+RATE_WINDOW = 10.0
+
+
+def format_bytes(num: float) -> str:
+    """Return ``num`` bytes as a short human readable string."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(num) < 1024 or unit == "GB":
+            return f"{num:.0f} {unit}" if unit == "B" else f"{num:.1f} {unit}"
+        num /= 1024
+    return f"{num:.1f} GB"
+
+
+def format_duration(seconds: float) -> str:
+    """Return ``seconds`` as ``1h02m``, ``3m05s`` or ``12s``."""
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+@dataclass
+class ProgressEvent:
+    """Snapshot of a transfer published to progress listeners.
+
+    ``completed`` and ``total`` count downloaded bytes across all layers
+    (or blobs) seen so far; ``total`` is ``None`` until at least one size is
+    known. ``stalled`` is set once no bytes have moved for the tracker's
+    stall threshold, which distinguishes a hung transfer from a slow one.
+    """
+
+    source: str
+    name: str
+    status: str
+    completed: int = 0
+    total: Optional[int] = None
+    layers_done: int = 0
+    layers_total: int = 0
+    rate: float = 0.0
+    eta: Optional[float] = None
+    stalled: bool = False
+    stalled_for: float = 0.0
+
+    @property
+    def percent(self) -> Optional[int]:
+        """Completion percentage, if the total size is known."""
+        if not self.total:
+            return None
+        return min(100, int(self.completed * 100 / self.total))
+
+    def detail(self) -> str:
+        """Byte counts, layer counts and rate (or stall time), comma separated."""
+        parts = []
+        if self.total:
+            parts.append(
+                f"{format_bytes(self.completed)} / {format_bytes(self.total)} ({self.percent}%)"
+            )
+        elif self.completed:
+            parts.append(format_bytes(self.completed))
+        if self.layers_total:
+            parts.append(f"{self.layers_done}/{self.layers_total} layers")
+        if self.stalled:
+            parts.append(f"stalled for {format_duration(self.stalled_for)}")
+        elif self.rate:
+            parts.append(f"{format_bytes(self.rate)}/s")
+            if self.eta is not None:
+                parts.append(f"ETA {format_duration(self.eta)}")
+        return ", ".join(parts)
+
+    def describe(self) -> str:
+        """One-line human readable summary."""
+        header = f"{self.status.capitalize()} {self.source} {self.name}"
+        detail = self.detail()
+        return f"{header}, {detail}" if detail else header
+
+
+class _Layer:
+    __slots__ = ("downloaded", "total", "extracted", "done")
+
+    def __init__(self) -> None:
+        self.downloaded = 0
+        self.total: Optional[int] = None
+        self.extracted = 0
+        self.done = False
+
+
+class TransferTracker:
+    """Aggregate per-layer progress into throughput, ETA and stall state.
+
+    Updates may arrive from any thread. Events are published to ``callback``
+    at most every ``min_interval`` seconds, plus on status changes, and a
+    background ticker (see :meth:`watch`) republishes while the stream is
+    silent so listeners notice stalls.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        name: str,
+        callback: Optional[Callable[[ProgressEvent], None]] = None,
+        stall_after: float = DEFAULT_STALL_AFTER,
+        min_interval: float = 0.1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.source = source
+        self.name = name
+        self.callback = callback
+        self.stall_after = stall_after
+        self.min_interval = min_interval
+        self.clock = clock
+        self.status = "pulling"
+        self._layers: Dict[str, _Layer] = {}
+        self._samples: Deque[Tuple[float, int]] = deque(maxlen=256)
+        self._last_progress = clock()
+        self._last_bytes = 0
+        self._last_publish = 0.0
+        self._lock = threading.Lock()
+
+    def update(
+        self,
+        layer_id: str,
+        downloaded: Optional[int] = None,
+        total: Optional[int] = None,
+        extracted: Optional[int] = None,
+        done: bool = False,
+        status: Optional[str] = None,
+    ) -> None:
+        """Record progress for one layer and publish if due."""
+        with self._lock:
+            layer = self._layers.setdefault(layer_id, _Layer())
+            if total:
+                layer.total = total
+            if downloaded is not None:
+                layer.downloaded = max(layer.downloaded, downloaded)
+            if extracted is not None:
+                layer.extracted = max(layer.extracted, extracted)
+            if done:
+                layer.done = True
+                if layer.total:
+                    layer.downloaded = layer.total
+            changed = status is not None and status != self.status
+            if status:
+                self.status = status
+        self.publish(force=changed or done)
+
+    def set_status(self, status: str) -> None:
+        """Change the overall status (e.g. ``verifying``) and publish it."""
+        with self._lock:
+            changed = status != self.status
+            self.status = status
+        self.publish(force=changed)
+
+    def update_from_docker(self, event: Dict) -> None:
+        """Feed one decoded message from the Docker/Podman pull stream."""
+        layer_id = event.get("id")
+        status = event.get("status", "")
+        if not layer_id or status.startswith(("Pulling from", "Digest", "Status")):
+            return
+        detail = event.get("progressDetail") or {}
+        if status == "Downloading":
+            self.update(layer_id, downloaded=detail.get("current"), total=detail.get("total"),
+                        status="downloading")
+        elif status == "Extracting":
+            self.update(layer_id, extracted=detail.get("current"), status="extracting")
+        elif status in ("Download complete", "Pull complete", "Already exists"):
+            self.update(layer_id, done=True)
+        else:
+            self.update(layer_id)
+
+    def finish(self) -> None:
+        """Mark the transfer complete and publish a final event."""
+        with self._lock:
+            for layer in self._layers.values():
+                layer.done = True
+                if layer.total:
+                    layer.downloaded = layer.total
+            self.status = "complete"
+        self.publish(force=True)
+
+    def snapshot(self) -> ProgressEvent:
+        """Compute the current aggregate state."""
+        with self._lock:
+            now = self.clock()
+            completed = sum(
+                layer.total if layer.done and layer.total else layer.downloaded
+                for layer in self._layers.values()
+            )
+            moved = completed + sum(layer.extracted for layer in self._layers.values())
+            if moved != self._last_bytes:
+                self._last_bytes = moved
+                self._last_progress = now
+
+            self._samples.append((now, completed))
+            while self._samples and now - self._samples[0][0] > RATE_WINDOW:
+                self._samples.popleft()
+            first_time, first_bytes = self._samples[0]
+            elapsed = now - first_time
+            rate = (completed - first_bytes) / elapsed if elapsed > 0 else 0.0
+
+            sizes = [layer.total for layer in self._layers.values() if layer.total]
+            total = sum(sizes) if sizes else None
+            eta = (total - completed) / rate if total and rate > 0 else None
+
+            idle = now - self._last_progress
+            stalled = self.status != "complete" and idle >= self.stall_after
+            return ProgressEvent(
+                source=self.source,
+                name=self.name,
+                status=self.status,
+                completed=completed,
+                total=total,
+                layers_done=sum(1 for layer in self._layers.values() if layer.done),
+                layers_total=len(self._layers),
+                rate=rate,
+                eta=eta,
+                stalled=stalled,
+                stalled_for=idle if stalled else 0.0,
+            )
+
+    def publish(self, force: bool = False) -> Optional[ProgressEvent]:
+        """Send a snapshot to the callback, rate limited unless ``force``."""
+        now = self.clock()
+        if not force and now - self._last_publish < self.min_interval:
+            return None
+        event = self.snapshot()
+        self._last_publish = now
+        if self.callback:
+            self.callback(event)
+        return event
+
+    def watch(self, interval: float = 1.0) -> "_Ticker":
+        """Return a context manager that republishes every ``interval`` seconds."""
+        return _Ticker(self, interval)
+
+
+class _Ticker:
+    """Background thread that keeps publishing while a stream is silent."""
+
+    def __init__(self, tracker: TransferTracker, interval: float):
+        self.tracker = tracker
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"progress-{tracker.source}", daemon=True
+        )
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.tracker.publish(force=True)
+
+    def __enter__(self) -> TransferTracker:
+        self._thread.start()
+        return self.tracker
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._stop.set()
+        self._thread.join()
@@ -0,0 +1,166 @@
+"""
+Readiness probing for freshly started containers
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional, Union
+
+# Probe outcomes. PROGRESS means the service is not ready yet but is visibly
+# getting there (port open but not answering 200), so polling speeds up.
+READY = "ready"
+PROGRESS = "progress"
+WAITING = "waiting"
+
+ProbeOutcome = Union[bool, str]
+
+DEFAULT_TIMEOUT = 180.0
+
+
+class ProbeFailed(Exception):
+    """Raised by a probe when waiting longer cannot help (e.g. the container exited)."""
+
+
+@dataclass
+class ReadinessResult:
+    """Outcome of waiting for a service.
+
+    ``elapsed`` is measured from when waiting started (normally right after
+    the start request was accepted) to the first successful probe.
+    """
+
+    ready: bool
+    elapsed: float
+    attempts: int
+    reason: str = ""
+
+    def __bool__(self) -> bool:
+        return self.ready
+
+
+class Backoff:
+    """Exponential delays between ``initial`` and ``maximum`` with jitter.
+
+    :meth:`reset` drops back to ``initial``; :func:`wait_until_ready` does
+    this when a probe first reports :data:`PROGRESS`.
+    """
+
+    def __init__(
+        self,
+        initial: float = 0.05,
+        factor: float = 2.0,
+        maximum: float = 2.0,
+        jitter: float = 0.1,
+    ):
+        self.initial = initial
+        self.factor = factor
+        self.maximum = maximum
+        self.jitter = jitter
+        self._delay = initial
+
+    def reset(self) -> None:
+        self._delay = self.initial
+
+    def next(self) -> float:
+        """Return the next delay and grow the following one."""
+        delay = self._delay
+        self._delay = min(self.maximum, self._delay * self.factor)
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def __iter__(self) -> Iterator[float]:
+        while True:
+            yield self.next()
+
+
+def wait_until_ready(
+    probe: Callable[[], ProbeOutcome],
+    timeout: float = DEFAULT_TIMEOUT,
+    backoff: Optional[Backoff] = None,
+    cancel_event: Optional[threading.Event] = None,
+    started_at: Optional[float] = None,
+    clock: Callable[[], float] = time.monotonic,
+) -> ReadinessResult:
+    """Poll ``probe`` until it reports ready, fails, or ``timeout`` passes.
+
+    ``probe`` returns ``True``/:data:`READY`, ``False``/:data:`WAITING` or
+    :data:`PROGRESS`, or raises :class:`ProbeFailed` to stop early. Never
+    sleeps past the deadline, and wakes immediately when ``cancel_event``
+    is set. Pass ``started_at`` (a ``clock()`` value taken before the start
+    request) to measure and bound the whole start-to-ready time.
+    """
+    backoff = backoff or Backoff()
+    cancel_event = cancel_event or threading.Event()
+    start = clock() if started_at is None else started_at
+    deadline = start + timeout
+    attempts = 0
+    previous = None
+
+    while True:
+        attempts += 1
+        try:
+            outcome = probe()
+        except ProbeFailed as e:
+            return ReadinessResult(False, clock() - start, attempts, str(e))
+        if outcome is True or outcome == READY:
+            return ReadinessResult(True, clock() - start, attempts)
+        if outcome == PROGRESS and previous != PROGRESS:
+            # First sign of life: readiness is likely close, poll quickly again
+            backoff.reset()
+        previous = outcome
+
+        remaining = deadline - clock()
+        if remaining <= 0:
+            return ReadinessResult(False, clock() - start, attempts, f"not ready after {timeout:g}s")
+        if cancel_event.wait(min(backoff.next(), remaining)):
+            return ReadinessResult(False, clock() - start, attempts, "cancelled")
+
+
+def http_probe(url: str, timeout: float = 2.0) -> Callable[[], str]:
+    """Probe that is ready once ``url`` answers 200."""
+
+    def probe() -> str:
+        import requests
+
+        try:
+            response = requests.get(url, timeout=timeout)
+        except requests.exceptions.ConnectionError:
+            return WAITING
+        except requests.exceptions.RequestException:
+            # Accepted the connection but did not answer in time
+            return PROGRESS
+        return READY if response.status_code == 200 else PROGRESS
+
+    return probe
+
+
+def container_probe(container, url: Optional[str] = None, timeout: float = 2.0) -> Callable[[], str]:
+    """Probe a container's state, its Docker health check if any, and ``url``.
+
+    Fails fast when the container stops. With ``url`` the container is ready
+    once it answers 200 and its health check (if defined) is not
+    ``unhealthy``; a check still ``starting`` does not hold readiness back,
+    since Docker only runs the first one after a full interval. Without
+    ``url`` a defined health check must report ``healthy``.
+    """
+    check_http = http_probe(url, timeout) if url else None
+
+    def probe() -> str:
+        container.reload()
+        state = container.attrs.get("State") or {}
+        status = state.get("Status", container.status)
+        if status in ("exited", "dead"):
+            raise ProbeFailed(f"container {status} with code {state.get('ExitCode')}")
+        if status != "running":
+            return WAITING
+
+        health = (state.get("Health") or {}).get("Status")
+        if check_http is None:
+            return WAITING if health in ("starting", "unhealthy") else READY
+        outcome = check_http()
+        if outcome == READY and health == "unhealthy":
+            return PROGRESS
+        return outcome
+
+    return probe
@@ -0,0 +1,129 @@
+"""
+Remote manifest digest lookup for container images
+"""
+
+import re
+from typing import Dict, Optional, Tuple
+
+DOCKER_HUB = "registry-1.docker.io"
+
+# Accept both single-platform manifests and multi-arch indexes so the digest
+# matches what ``docker pull`` records in the image's RepoDigests.
+MANIFEST_TYPES = ", ".join([
+    "application/vnd.oci.image.index.v1+json",
+    "application/vnd.docker.distribution.manifest.list.v2+json",
+    "application/vnd.oci.image.manifest.v1+json",
+    "application/vnd.docker.distribution.manifest.v2+json",
+])
+
+
+class RegistryError(Exception):
+    """Raised when a registry cannot be queried for a manifest digest."""
+
+
+def parse_reference(image: str) -> Tuple[str, str, str]:
+    """Split ``image`` into ``(registry, repository, tag)``.
+
+    Follows Docker's rules: the first path component is a registry host only
+    if it contains a ``.`` or ``:`` or is ``localhost``; Docker Hub
+    repositories without a namespace live under ``library/``.
+    """
+    name, _, digest = image.partition("@")
+    if digest:
+        raise RegistryError(f"{image} is pinned to a digest")
+
+    tag = "latest"
+    last = name.rsplit("/", 1)[-1]
+    if ":" in last:
+        name, tag = name.rsplit(":", 1)
+
+    first, _, rest = name.partition("/")
+    if rest and ("." in first or ":" in first or first == "localhost"):
+        registry, repository = first, rest
+    else:
+        registry, repository = DOCKER_HUB, name
+    if registry in ("docker.io", "index.docker.io"):
+        registry = DOCKER_HUB
+    if registry == DOCKER_HUB and "/" not in repository:
+        repository = f"library/{repository}"
+    return registry, repository, tag
+
+
+def _is_local(registry: str) -> bool:
+    if registry.startswith("["):
+        host = registry.split("]")[0] + "]"
+    else:
+        host = registry.split(":")[0]
+    return host in ("localhost", "127.0.0.1", "[::1]")
+
+
+def _parse_challenge(header: str) -> Dict[str, str]:
+    """Parse a ``WWW-Authenticate: Bearer realm=...,service=...`` header."""
+    return dict(re.findall(r'(\w+)="([^"]*)"', header))
+
+
+class RegistryClient:
+    """Resolve tags to manifest digests with ``HEAD`` requests.
+
+    Registries on localhost are spoken to over plain HTTP, matching Docker's
+    default insecure-registry behaviour; everything else uses HTTPS.
+    Anonymous bearer tokens are fetched on demand and reused per scope.
+    """
+
+    def __init__(self, timeout: float = 5, session=None):
+        self.timeout = timeout
+        self._session = session
+        self._tokens: Dict[str, str] = {}
+
+    @property
+    def session(self):
+        if self._session is None:
+            import requests
+
+            self._session = requests.Session()
+        return self._session
+
+    def _url(self, registry: str, repository: str, tag: str) -> str:
+        scheme = "http" if _is_local(registry) else "https"
+        return f"{scheme}://{registry}/v2/{repository}/manifests/{tag}"
+
+    def _token(self, challenge: str, repository: str) -> str:
+        params = _parse_challenge(challenge)
+        realm = params.pop("realm", None)
+        if not realm:
+            raise RegistryError(f"Unsupported registry auth challenge: {challenge}")
+        params.setdefault("scope", f"repository:{repository}:pull")
+        key = f"{realm}|{params['scope']}"
+        if key not in self._tokens:
+            response = self.session.get(realm, params=params, timeout=self.timeout)
+            if response.status_code != 200:
+                raise RegistryError(f"Registry token request failed: HTTP {response.status_code}")
+            try:
+                body = response.json()
+                self._tokens[key] = body.get("token") or body.get("access_token", "")
+            except (ValueError, AttributeError):
+                raise RegistryError("Registry token response is not a JSON token")
+        return self._tokens[key]
+
+    def resolve_digest(self, image: str) -> str:
+        """Return the manifest digest ``image``'s tag currently points to."""
+        import requests
+
+        registry, repository, tag = parse_reference(image)
+        url = self._url(registry, repository, tag)
+        headers = {"Accept": MANIFEST_TYPES}
+        try:
+            response = self.session.head(url, headers=headers, timeout=self.timeout)
+            challenge = response.headers.get("WWW-Authenticate", "")
+            if response.status_code == 401 and challenge.lower().startswith("bearer"):
+                headers["Authorization"] = f"Bearer {self._token(challenge, repository)}"
+                response = self.session.head(url, headers=headers, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            raise RegistryError(f"Could not reach registry {registry}: {e}")
+
+        if response.status_code != 200:
+            raise RegistryError(f"Registry returned HTTP {response.status_code} for {image}")
+        digest: Optional[str] = response.headers.get("Docker-Content-Digest")
+        if not digest:
+            raise RegistryError(f"Registry did not report a digest for {image}")
+        return digest
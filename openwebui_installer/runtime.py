@@ -0,0 +1,385 @@
+"""
+Container runtime connection management for Open WebUI Installer
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DOCKER_SOCKET = "/var/run/docker.sock"
+CACHE_FILE = "runtime-cache.json"
+DEFAULT_CACHE_TTL = 3600
+
+
+def podman_available() -> bool:
+    """Check if Podman is installed."""
+    import subprocess
+
+    try:
+        result = subprocess.run(
+            ["podman", "--version"],
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+        return result.returncode == 0
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return False
+
+
+def docker_socket_path() -> Optional[str]:
+    """Return the Unix socket ``docker.from_env`` will use, if it is one."""
+    host = os.environ.get("DOCKER_HOST", f"unix://{DEFAULT_DOCKER_SOCKET}")
+    if host.startswith("unix://"):
+        return host[len("unix://"):]
+    return None
+
+
+def podman_socket_paths() -> List[str]:
+    """Return candidate Podman API sockets in order of preference."""
+    paths = ["/tmp/podman.sock"]
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        paths.append(os.path.join(runtime_dir, "podman", "podman.sock"))
+    paths.append("/run/podman/podman.sock")
+    return paths
+
+
+def container_state(socket_path: str, name: str, timeout: float = 2) -> Optional[str]:
+    """Return container ``name``'s status straight from a runtime API socket.
+
+    Speaks just enough HTTP/1.0 to inspect one container, so a status query
+    does not have to load the Docker SDK. Returns ``None`` if the container
+    does not exist; raises ``OSError`` or ``ValueError`` if the socket does
+    not answer like a Docker-compatible API.
+    """
+    import socket
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(f"GET /containers/{name}/json HTTP/1.0\r\nHost: localhost\r\n\r\n".encode())
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+    head, _, body = b"".join(chunks).partition(b"\r\n\r\n")
+    status_code = int(head.split(b" ", 2)[1])
+    if status_code == 404:
+        return None
+    if status_code != 200:
+        raise ValueError(f"Unexpected HTTP {status_code} inspecting {name}")
+    return json.loads(body)["State"]["Status"]
+
+
+def _socket_signature(path: str) -> Optional[List[int]]:
+    """Identify a socket by inode and mtime, or ``None`` if it is missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_ino, st.st_mtime_ns]
+
+
+class RuntimeCache:
+    """Runtime detection results persisted between invocations.
+
+    Entries record which runtime answered, on which socket, with which API
+    version. An entry is ignored once its TTL expires or any socket it was
+    derived from is recreated (new inode) or touched (new mtime), which is
+    what happens when a daemon restarts or goes away.
+    """
+
+    def __init__(self, path: str, ttl: float = DEFAULT_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+
+    def _read(self) -> Dict:
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, data: Dict) -> None:
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.debug("Could not write runtime cache %s: %s", self.path, e)
+
+    def load(self, key: str) -> Optional[Dict]:
+        """Return the entry for ``key`` if it is still valid."""
+        entry = self._read().get(key)
+        if not isinstance(entry, dict):
+            return None
+        if time.time() - entry.get("detected_at", 0) > self.ttl:
+            return None
+        for path, signature in entry.get("sockets", {}).items():
+            if _socket_signature(path) != signature:
+                return None
+        return entry
+
+    def store(self, key: str, entry: Dict, sockets: List[str]) -> None:
+        """Save ``entry`` for ``key``, watching ``sockets`` for changes."""
+        entry = dict(entry)
+        entry["detected_at"] = time.time()
+        entry["sockets"] = {path: _socket_signature(path) for path in sockets}
+        data = self._read()
+        data[key] = entry
+        self._write(data)
+
+    def invalidate(self, key: str) -> None:
+        """Drop the entry for ``key``."""
+        data = self._read()
+        if data.pop(key, None) is not None:
+            self._write(data)
+
+
+class RuntimeConnection:
+    """Lazily opened connection to the Docker or Podman engine.
+
+    Nothing is contacted until :attr:`client` is first accessed, and the
+    runtime is only detected once per connection, so a single instance can be
+    shared by everything a CLI command does. Detection results are cached
+    under the config directory so later invocations skip the Podman probe and
+    any failed connection attempts.
+    """
+
+    def __init__(
+        self,
+        runtime: str = "docker",
+        cache_dir: Optional[str] = None,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+    ):
+        self.requested_runtime = runtime
+        self.runtime = runtime
+        self.error: Optional[Exception] = None
+        self.capabilities: Dict = {}
+        self.cache = RuntimeCache(
+            os.path.join(cache_dir or os.path.expanduser("~/.openwebui"), CACHE_FILE),
+            ttl=cache_ttl,
+        )
+        self._client = None
+        self._opened = False
+        self._podman: Optional[bool] = None
+        self._lock = threading.RLock()
+        # Set by close() while an open is still in flight
+        self._close_pending = False
+        # Separate lock so a Podman probe never waits on a slow Docker connect
+        self._podman_lock = threading.Lock()
+
+    @property
+    def client(self):
+        """Return the runtime client, opening it on first use.
+
+        ``None`` is returned when no runtime could be reached; the reason is
+        kept in :attr:`error`.
+        """
+        with self._lock:
+            if not self._opened:
+                self._client = self._open()
+                self._opened = True
+                if self._close_pending:
+                    # close() was called while this open was in flight
+                    self._close_pending = False
+                    self._close_client()
+            return self._client
+
+    @client.setter
+    def client(self, value) -> None:
+        with self._lock:
+            self._client = value
+            self._opened = True
+
+    @property
+    def opened(self) -> bool:
+        """Whether a connection attempt has already been made."""
+        return self._opened
+
+    @property
+    def cache_key(self) -> str:
+        """Cache key covering everything that influences detection."""
+        return f"{self.requested_runtime}|{os.environ.get('DOCKER_HOST', '')}"
+
+    def podman_available(self) -> bool:
+        """Check if Podman is installed, running the probe at most once."""
+        with self._podman_lock:
+            if self._podman is None:
+                self._podman = podman_available()
+            return self._podman
+
+    def peek_container_status(self, name: str) -> Optional[str]:
+        """Status of container ``name`` without opening the SDK client.
+
+        Asks the cached runtime socket, or the local Docker and Podman
+        sockets, directly. Returns ``None`` when the container does not exist
+        or no runtime answers. Raises ``LookupError`` when the runtime is not
+        on a local socket (e.g. ``DOCKER_HOST=tcp://...``) and the full
+        client has to be used.
+        """
+        entry = self.cache.load(self.cache_key)
+        if entry is not None and entry.get("socket"):
+            candidates = [entry["socket"]]
+        else:
+            docker_socket = docker_socket_path()
+            if docker_socket is None:
+                raise LookupError("Runtime is not on a local socket")
+            candidates = [docker_socket] + podman_socket_paths()
+            if self.requested_runtime == "podman":
+                candidates = candidates[1:] + candidates[:1]
+
+        for path in candidates:
+            if not os.path.exists(path):
+                continue
+            try:
+                return container_state(path, name)
+            except (OSError, ValueError, KeyError) as e:
+                logger.debug("Could not inspect %s via %s: %s", name, path, e)
+        return None
+
+    def invalidate(self) -> None:
+        """Forget cached detection results, e.g. after the runtime stopped answering."""
+        self.cache.invalidate(self.cache_key)
+
+    def _open(self):
+        """Connect using cached detection results, detecting afresh if needed."""
+        entry = self.cache.load(self.cache_key)
+        if entry is not None:
+            client = self._open_cached(entry)
+            if client is not None:
+                return client
+
+        client, socket_path = self._detect()
+        if client is not None:
+            self._remember(client, socket_path)
+        return client
+
+    def _open_cached(self, entry: Dict):
+        """Open the runtime recorded in ``entry`` without probing."""
+        import docker
+
+        try:
+            if entry["runtime"] == "docker":
+                client = docker.from_env(version=entry["api_version"])
+            else:
+                client = docker.DockerClient(
+                    base_url=f"unix://{entry['socket']}", version=entry["api_version"]
+                )
+        except Exception as e:
+            logger.debug("Cached runtime entry unusable: %s", e)
+            self.invalidate()
+            return None
+
+        self.runtime = entry["runtime"]
+        self.capabilities = entry.get("capabilities", {})
+        self._podman = entry.get("podman", self._podman)
+        return client
+
+    def _detect(self) -> Tuple[object, Optional[str]]:
+        """Connect to the requested runtime, falling back to Podman."""
+        import docker
+
+        if self.requested_runtime == "podman":
+            return self._open_podman()
+
+        try:
+            # from_env negotiates the API version, which doubles as a liveness probe
+            return docker.from_env(), docker_socket_path()
+        except Exception as e:
+            self.error = e
+            logger.debug("Docker connection failed: %s", e)
+
+        if self.podman_available():
+            client, socket_path = self._open_podman()
+            if client is not None:
+                self.runtime = "podman"
+            return client, socket_path
+        return None, None
+
+    def _open_podman(self) -> Tuple[object, Optional[str]]:
+        """Get a Podman-compatible Docker client and the socket it uses."""
+        import docker
+
+        for path in podman_socket_paths():
+            if not os.path.exists(path):
+                continue
+            try:
+                return docker.DockerClient(base_url=f"unix://{path}"), path
+            except Exception as e:
+                logger.debug("Podman socket %s unusable: %s", path, e)
+
+        # Fallback to default Docker client
+        try:
+            return docker.from_env(), docker_socket_path()
+        except Exception as e:
+            self.error = e
+            return None, None
+
+    def _remember(self, client, socket_path: Optional[str]) -> None:
+        """Persist how ``client`` was reached so the next run can skip detection."""
+        api_version = getattr(getattr(client, "api", None), "api_version", None)
+        if not socket_path or not isinstance(api_version, str):
+            # Only local sockets can be revalidated cheaply
+            return
+
+        try:
+            info = client.version()
+            self.capabilities = {
+                "version": info.get("Version"),
+                "api_version": info.get("ApiVersion"),
+                "os": info.get("Os"),
+                "arch": info.get("Arch"),
+                "components": [c.get("Name") for c in info.get("Components") or []],
+            }
+        except Exception as e:
+            logger.debug("Could not read runtime capabilities: %s", e)
+
+        watched = [path for path in (docker_socket_path(), socket_path) if path]
+        self.cache.store(
+            self.cache_key,
+            {
+                "runtime": self.runtime,
+                "socket": socket_path,
+                "api_version": api_version,
+                "capabilities": self.capabilities,
+                "podman": self._podman,
+            },
+            sockets=sorted(set(watched)),
+        )
+
+    def _close_client(self) -> None:
+        if self._opened and self._client is not None:
+            try:
+                self._client.close()
+            except Exception:
+                pass
+        self._client = None
+        self._opened = False
+
+    def close(self) -> None:
+        """Close the client if it was ever opened.
+
+        Never waits for a connection attempt still in progress (such as a
+        preflight probe that outlived its deadline); that attempt closes its
+        client itself once it returns.
+        """
+        if not self._lock.acquire(blocking=False):
+            self._close_pending = True
+            return
+        try:
+            self._close_client()
+        finally:
+            self._lock.release()
@@ -0,0 +1,232 @@
+"""
+Resource samples for the Open WebUI container and the Ollama process
+"""
+
+import bisect
+import logging
+import math
+import threading
+import time
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .bluegreen import CONTAINER_NAME
+from .readiness import Backoff
+
+logger = logging.getLogger(__name__)
+
+FIELDS = (
+    "cpu",             # percent of one CPU
+    "memory",          # bytes
+    "net_rx",          # bytes per second
+    "net_tx",
+    "block_read",      # bytes per second
+    "block_write",
+    "ollama_cpu",
+    "ollama_memory",
+)
+# One hour of the runtime's one-per-second stats
+DEFAULT_CAPACITY = 3600
+
+# Cumulative counters that are turned into per-second rates
+_COUNTERS = ("net_rx", "net_tx", "block_read", "block_write")
+
+
+class RingBuffer:
+    """Fixed-capacity time series kept in preallocated arrays.
+
+    Memory use is set by ``capacity`` alone; once full, each append
+    overwrites the oldest sample. Appends and reads may come from
+    different threads. Missing values are stored as NaN.
+    """
+
+    def __init__(self, fields: Sequence[str] = FIELDS, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.fields = tuple(fields)
+        self.capacity = capacity
+        self._times = array("d", [0.0]) * capacity
+        self._values = {name: array("d", [math.nan]) * capacity for name in self.fields}
+        self._next = 0
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, timestamp: float, values: Dict[str, float]) -> None:
+        with self._lock:
+            i = self._next
+            self._times[i] = timestamp
+            for name, column in self._values.items():
+                column[i] = values.get(name, math.nan)
+            self._next = (i + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+
+    def _ordered(self, column: array) -> array:
+        if self._size < self.capacity:
+            return column[:self._size]
+        return column[self._next:] + column[:self._next]
+
+    def series(self, name: str, since: float = -math.inf) -> Tuple[array, array]:
+        """Return ``(times, values)`` of ``name`` from ``since`` on, oldest first."""
+        with self._lock:
+            times = self._ordered(self._times)
+            values = self._ordered(self._values[name])
+        start = bisect.bisect_left(times, since)
+        return times[start:], values[start:]
+
+    def latest(self, name: str) -> float:
+        """The most recent value of ``name`` (NaN when empty)."""
+        with self._lock:
+            if not self._size:
+                return math.nan
+            return self._values[name][(self._next - 1) % self.capacity]
+
+
+def decimate(times: Sequence[float], values: Sequence[float], max_points: int) -> Tuple[List[float], List[float]]:
+    """Downsample to at most ``max_points`` points, keeping each bucket's min and max.
+
+    Short spikes survive, which plain averaging or striding would hide.
+    NaN values are skipped.
+    """
+    pairs = [(t, v) for t, v in zip(times, values) if not math.isnan(v)]
+    if len(pairs) <= max_points or max_points < 2:
+        return [t for t, _ in pairs], [v for _, v in pairs]
+
+    buckets = max_points // 2
+    size = len(pairs) / buckets
+    out_t: List[float] = []
+    out_v: List[float] = []
+    for b in range(buckets):
+        bucket = pairs[int(b * size):int((b + 1) * size)]
+        if not bucket:
+            continue
+        low = min(bucket, key=lambda p: p[1])
+        high = max(bucket, key=lambda p: p[1])
+        for t, v in sorted({low, high}):
+            out_t.append(t)
+            out_v.append(v)
+    return out_t, out_v
+
+
+def container_sample(stats: Dict) -> Dict[str, float]:
+    """CPU, memory and cumulative I/O counters from one runtime stats message."""
+    sample: Dict[str, float] = {}
+    cpu, precpu = stats.get("cpu_stats") or {}, stats.get("precpu_stats") or {}
+    cpu_delta = (cpu.get("cpu_usage") or {}).get("total_usage", 0) - (precpu.get("cpu_usage") or {}).get(
+        "total_usage", 0
+    )
+    system_delta = cpu.get("system_cpu_usage", 0) - precpu.get("system_cpu_usage", 0)
+    cpus = cpu.get("online_cpus") or len((cpu.get("cpu_usage") or {}).get("percpu_usage") or []) or 1
+    sample["cpu"] = cpu_delta / system_delta * cpus * 100 if system_delta > 0 and cpu_delta >= 0 else 0.0
+
+    memory = stats.get("memory_stats") or {}
+    if "usage" in memory:
+        # Page cache is reclaimable, so leave it out like ``docker stats`` does
+        detail = memory.get("stats") or {}
+        cache = detail.get("inactive_file", detail.get("cache", 0))
+        sample["memory"] = float(memory["usage"] - cache)
+
+    networks = (stats.get("networks") or {}).values()
+    sample["net_rx"] = float(sum(n.get("rx_bytes", 0) for n in networks))
+    sample["net_tx"] = float(sum(n.get("tx_bytes", 0) for n in networks))
+
+    io = (stats.get("blkio_stats") or {}).get("io_service_bytes_recursive") or []
+    sample["block_read"] = float(sum(e.get("value", 0) for e in io if e.get("op", "").lower() == "read"))
+    sample["block_write"] = float(sum(e.get("value", 0) for e in io if e.get("op", "").lower() == "write"))
+    return sample
+
+
+def find_ollama_process():
+    """The local Ollama server process, or ``None`` if psutil is missing or it is not visible."""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    for process in psutil.process_iter(["name"]):
+        name = (process.info.get("name") or "").lower()
+        if name in ("ollama", "ollama.exe"):
+            return process
+    return None
+
+
+class StatsSampler:
+    """Feed :class:`RingBuffer` samples from the runtime's stats stream.
+
+    Each stats message (about one per second) becomes one sample: CPU and
+    memory of the container, its network and block I/O as per-second
+    rates, and the Ollama process's CPU and resident memory when
+    :func:`find_ollama_process` can see it. The stream is reopened with
+    backoff while the container is missing or stopped. :meth:`stop` takes
+    effect at the next message.
+    """
+
+    def __init__(
+        self,
+        client,
+        on_sample: Callable[[float, Dict[str, float]], None],
+        name: str = CONTAINER_NAME,
+        ollama_finder: Callable[[], Optional[object]] = find_ollama_process,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.client = client
+        self.on_sample = on_sample
+        self.name = name
+        self.ollama_finder = ollama_finder
+        self.clock = clock
+        self._stop = threading.Event()
+        self._previous: Optional[Tuple[float, Dict[str, float]]] = None
+        self._ollama = None
+
+    def _ollama_sample(self) -> Dict[str, float]:
+        if self._ollama is None:
+            self._ollama = self.ollama_finder()
+            if self._ollama is None:
+                return {}
+        try:
+            return {
+                "ollama_cpu": float(self._ollama.cpu_percent(None)),
+                "ollama_memory": float(self._ollama.memory_info().rss),
+            }
+        except Exception:
+            # Ollama restarted; look for the new process next time
+            self._ollama = None
+            return {}
+
+    def sample(self, stats: Dict) -> Tuple[float, Dict[str, float]]:
+        """Turn one stats message into ``(timestamp, values)`` with rates."""
+        now = self.clock()
+        counters = container_sample(stats)
+        values = {k: v for k, v in counters.items() if k not in _COUNTERS}
+        if self._previous is not None:
+            then, previous = self._previous
+            elapsed = now - then
+            for key in _COUNTERS:
+                if elapsed > 0 and key in counters and counters[key] >= previous.get(key, math.inf):
+                    values[key] = (counters[key] - previous[key]) / elapsed
+        self._previous = (now, counters)
+        values.update(self._ollama_sample())
+        return now, values
+
+    def _follow(self) -> None:
+        container = self.client.containers.get(self.name)
+        self._previous = None
+        for stats in container.stats(stream=True, decode=True):
+            if self._stop.is_set():
+                return
+            self.on_sample(*self.sample(stats))
+
+    def run(self) -> None:
+        """Sample until :meth:`stop` is called."""
+        delays = Backoff(initial=1, maximum=10)
+        while not self._stop.is_set():
+            try:
+                self._follow()
+                delays.reset()
+            except Exception as e:
+                logger.debug("Stats stream unavailable: %s", e)
+            self._stop.wait(delays.next())
+
+    def stop(self) -> None:
+        self._stop.set()
@@ -0,0 +1,158 @@
+"""
+Event-driven status of the Open WebUI container
+"""
+
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from .bluegreen import CONTAINER_NAME
+from .readiness import Backoff
+
+logger = logging.getLogger(__name__)
+
+# Container events that change what ``status`` reports
+WATCHED_ACTIONS = (
+    "create", "start", "restart", "die", "oom", "health_status",
+    "pause", "unpause", "rename", "destroy",
+)
+
+
+@dataclass
+class StatusChange:
+    """One change of the container's state.
+
+    ``action`` is the runtime event (``start``, ``die``, ``oom``,
+    ``health_status`` ...) or ``snapshot`` for a full re-read, and
+    ``status`` is the complete status after applying it.
+    """
+
+    action: str
+    status: Dict[str, Any]
+    time: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class StatusWatcher:
+    """Keep the installer's status current from the runtime's event stream.
+
+    :meth:`run` takes one snapshot through ``installer.get_status()`` and
+    then applies container events as they arrive, calling ``on_change``
+    for each of them, so repeated start/die cycles are all reported. The
+    event stream is opened before the snapshot so nothing in between is
+    missed. If the stream breaks, it is reopened with backoff and a fresh
+    snapshot is taken. :meth:`stop` may be called from any thread.
+    """
+
+    def __init__(
+        self,
+        installer,
+        on_change: Callable[[StatusChange], None],
+        name: str = CONTAINER_NAME,
+    ):
+        self.installer = installer
+        self.on_change = on_change
+        self.name = name
+        self.status: Dict[str, Any] = {}
+        self._stop = threading.Event()
+        self._stream = None
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Re-read the full status, including health and last exit code."""
+        import docker
+
+        status = dict(self.installer.get_status())
+        status.update(health=None, exit_code=None, oom=False)
+        try:
+            container = self.installer.docker_client.containers.get(self.name)
+        except docker.errors.NotFound:
+            status["running"] = False
+            return status
+        state = container.attrs.get("State") or {}
+        status["running"] = state.get("Running", container.status == "running")
+        status["health"] = (state.get("Health") or {}).get("Status")
+        status["oom"] = bool(state.get("OOMKilled"))
+        if not status["running"]:
+            status["exit_code"] = state.get("ExitCode")
+        return status
+
+    def apply(self, event: Dict[str, Any]) -> Optional[StatusChange]:
+        """Update :attr:`status` from one runtime event; ``None`` if it is not watched."""
+        action, _, detail = (event.get("Action") or event.get("status") or "").partition(":")
+        if action not in WATCHED_ACTIONS:
+            return None
+        attributes = (event.get("Actor") or {}).get("Attributes") or {}
+        status = self.status
+        if action in ("rename", "create"):
+            # A replacement container took over the name (see bluegreen)
+            self.status = self.snapshot()
+            return StatusChange(action, dict(self.status), event.get("time", time.time()))
+        if action in ("start", "restart", "unpause"):
+            status.update(running=True, exit_code=None, oom=False)
+        elif action == "pause":
+            status["running"] = False
+        elif action == "die":
+            exit_code = attributes.get("exitCode")
+            status.update(running=False, exit_code=int(exit_code) if exit_code is not None else None)
+        elif action == "oom":
+            status["oom"] = True
+        elif action == "health_status":
+            status["health"] = detail.strip()
+        elif action == "destroy":
+            status.update(running=False, health=None)
+        return StatusChange(action, dict(status), event.get("time", time.time()))
+
+    def _open_stream(self):
+        stream = self.installer.docker_client.events(
+            decode=True, filters={"type": "container", "container": self.name}
+        )
+        with self._lock:
+            self._stream = stream
+        if self._stop.is_set():
+            self._close_stream()
+        return stream
+
+    def _close_stream(self) -> None:
+        with self._lock:
+            stream, self._stream = self._stream, None
+        if stream is not None and hasattr(stream, "close"):
+            try:
+                stream.close()
+            except Exception as e:
+                logger.debug("Closing event stream failed: %s", e)
+
+    def _follow(self) -> None:
+        stream = self._open_stream()
+        self.status = self.snapshot()
+        self.on_change(StatusChange("snapshot", dict(self.status)))
+        for event in stream:
+            if self._stop.is_set():
+                return
+            change = self.apply(event)
+            if change is not None:
+                self.on_change(change)
+
+    def run(self) -> None:
+        """Emit status changes until :meth:`stop` is called."""
+        delays = Backoff(initial=0.5, maximum=10)
+        while not self._stop.is_set():
+            try:
+                self._follow()
+                delays.reset()
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                logger.warning("Event stream interrupted (%s), reconnecting", e)
+            finally:
+                self._close_stream()
+            self._stop.wait(delays.next())
+
+    def stop(self) -> None:
+        """Stop :meth:`run`, interrupting a blocked read of the event stream."""
+        self._stop.set()
+        self._close_stream()
@@ -37,7 +37,7 @@ setup(
     ],
     entry_points={
         "console_scripts": [
-            "openwebui-installer=openwebui_installer.cli:cli",
+            "openwebui-installer=openwebui_installer.cli:main",
             "openwebui-installer-gui=openwebui_installer.gui:main",
         ],
     },
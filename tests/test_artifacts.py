@@ -0,0 +1,111 @@
+import hashlib
+import os
+import stat
+
+import pytest
+
+from openwebui_installer import artifacts
+from openwebui_installer.artifacts import ArtifactStore, parse_size
+
+
+def _stored(store, data: bytes, tmp_path) -> str:
+    digest = hashlib.sha256(data).hexdigest()
+    source = tmp_path / f"{digest}.part"
+    source.write_bytes(data)
+    store.add(str(source), digest)
+    return digest
+
+
+def _use(store, digest, when):
+    """Pretend ``digest`` was last used at ``when``."""
+    os.utime(store.path(digest) + ".used", (when, when))
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("512", 512), (2048, 2048), ("1K", 1024), ("1.5m", 1536 * 1024), ("10G", 10 * 1024 ** 3), ("2GiB", 2 * 1024 ** 3)],
+)
+def test_parse_size(value, expected):
+    assert parse_size(value) == expected
+
+
+def test_parse_size_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_size("lots")
+
+
+def test_cap_from_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv(artifacts.MAX_SIZE_ENV, "5M")
+    assert ArtifactStore(str(tmp_path)).max_bytes == 5 * 1024 ** 2
+    monkeypatch.delenv(artifacts.MAX_SIZE_ENV)
+    assert ArtifactStore(str(tmp_path)).max_bytes == artifacts.DEFAULT_MAX_BYTES
+
+
+def test_add_and_link_share_one_file(tmp_path):
+    store = ArtifactStore(str(tmp_path / "cache"))
+    digest = _stored(store, b"bundle", tmp_path)
+
+    assert digest in store
+    assert store.link(digest, str(tmp_path / "a.bin"))
+    assert store.link(digest, str(tmp_path / "b.bin"))
+
+    inodes = {os.stat(p).st_ino for p in (store.path(digest), tmp_path / "a.bin", tmp_path / "b.bin")}
+    assert len(inodes) == 1
+    assert not os.stat(store.path(digest)).st_mode & stat.S_IWUSR
+    assert store.stats().linked_bytes == len(b"bundle")
+    assert not store.link("0" * 64, str(tmp_path / "c.bin"))
+
+
+def test_link_copies_when_hard_links_fail(tmp_path, mocker):
+    store = ArtifactStore(str(tmp_path / "cache"))
+    digest = _stored(store, b"bundle", tmp_path)
+    mocker.patch("openwebui_installer.artifacts.os.link", side_effect=OSError(18, "Invalid cross-device link"))
+    mocker.patch("openwebui_installer.artifacts._reflink", return_value=False)
+
+    assert store.link(digest, str(tmp_path / "copy.bin"))
+
+    assert (tmp_path / "copy.bin").read_bytes() == b"bundle"
+    assert os.stat(tmp_path / "copy.bin").st_ino != os.stat(store.path(digest)).st_ino
+    # Read-only like a hard-linked destination
+    assert not os.stat(tmp_path / "copy.bin").st_mode & stat.S_IWUSR
+    assert not store.link(digest, str(tmp_path / "shared.bin"), copy=False)
+    assert not (tmp_path / "shared.bin").exists()
+
+
+def test_add_stores_nothing_it_cannot_share(tmp_path, mocker):
+    store = ArtifactStore(str(tmp_path / "cache"))
+    mocker.patch("openwebui_installer.artifacts.os.link", side_effect=OSError(18, "Invalid cross-device link"))
+    mocker.patch("openwebui_installer.artifacts._reflink", return_value=False)
+    source = tmp_path / "bundle.bin"
+    source.write_bytes(b"bundle")
+
+    assert not store.add(str(source), hashlib.sha256(b"bundle").hexdigest())
+
+    assert store.stats().count == 0
+    assert source.read_bytes() == b"bundle"
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    store = ArtifactStore(str(tmp_path / "cache"), max_bytes=250)
+    old, used, new = (_stored(store, bytes([i]) * 100, tmp_path) for i in range(3))
+    _use(store, old, 1000)
+    _use(store, new, 2000)
+    _use(store, used, 3000)
+    store.link(old, str(tmp_path / "kept.bin"))
+    _use(store, old, 1000)
+
+    evicted = store.prune()
+
+    assert [entry.digest for entry in evicted] == [old]
+    assert old not in store and used in store and new in store
+    # A destination keeps its file
+    assert (tmp_path / "kept.bin").read_bytes() == bytes([0]) * 100
+    assert store.stats().bytes == 200
+
+    assert len(store.prune(0)) == 2
+    assert store.stats().count == 0
+
+
+def test_empty_store(tmp_path):
+    stats = ArtifactStore(str(tmp_path / "missing"), max_bytes=10).stats()
+    assert (stats.count, stats.bytes, stats.max_bytes) == (0, 0, 10)
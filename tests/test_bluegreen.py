@@ -0,0 +1,196 @@
+"""
+Tests for blue/green container swaps
+"""
+
+from unittest.mock import MagicMock
+
+import docker
+import pytest
+
+from openwebui_installer.bluegreen import (
+    ACTIVE_ALIAS,
+    DATA_VOLUME,
+    PROXY_CONTAINER_NAME,
+    SNAPSHOT_VOLUME,
+    BlueGreenSwap,
+    SwapError,
+)
+from openwebui_installer.installer import Installer
+
+
+def _client(containers):
+    """Docker client mock whose ``containers.get`` serves ``containers`` by name."""
+    client = MagicMock()
+
+    def get(name):
+        if name not in containers:
+            raise docker.errors.NotFound(name)
+        return containers[name]
+
+    client.containers.get.side_effect = get
+    network = MagicMock()
+    network.name = "open-webui-net"
+    client.networks.list.return_value = [network]
+    return client, network
+
+
+def _swap(client, green, green_ok=True, proxy_ok=True):
+    swap = BlueGreenSwap(
+        client,
+        "example/open-webui:new",
+        3000,
+        start_container=MagicMock(return_value=green),
+        wait=lambda probe, timeout: probe(),
+        http_ready=lambda port: proxy_ok,
+    )
+    green.exec_run.return_value = MagicMock(exit_code=0 if green_ok else 1)
+    return swap
+
+
+def _copies(client):
+    """(source, target) volume pairs of the database copy containers run."""
+    pairs = []
+    for call in client.containers.run.call_args_list:
+        volumes = call.kwargs.get("volumes")
+        if volumes and call.kwargs.get("remove"):
+            source = next(v for v, b in volumes.items() if b["bind"] == "/from")
+            target = next(v for v, b in volumes.items() if b["bind"] == "/to")
+            pairs.append((source, target))
+    return pairs
+
+
+def test_green_not_ready_restores_blue_data():
+    """A replacement that never becomes healthy is discarded and blue gets its snapshot back."""
+    blue, green = MagicMock(status="running"), MagicMock()
+    client, network = _client({"open-webui": blue})
+    order = MagicMock()
+    order.attach_mock(green.remove, "remove_green")
+    order.attach_mock(blue.stop, "stop")
+    order.attach_mock(client.containers.run, "copy")
+    order.attach_mock(blue.start, "start")
+
+    with pytest.raises(SwapError, match="kept the current one running"):
+        _swap(client, green, green_ok=False).run()
+
+    green.remove.assert_called_once_with(force=True)
+    blue.pause.assert_called_once()
+    blue.unpause.assert_called_once()
+    # Green may have migrated the shared volume; blue only serves the snapshot again
+    assert _copies(client) == [(DATA_VOLUME, SNAPSHOT_VOLUME), (SNAPSHOT_VOLUME, DATA_VOLUME)]
+    assert [c[0] for c in order.mock_calls] == ["copy", "remove_green", "stop", "copy", "start"]
+    blue.remove.assert_not_called()
+    network.connect.assert_not_called()
+
+
+def test_first_swap_hands_port_to_proxy():
+    """Without a proxy, blue releases the port to a new proxy pointed at green."""
+    blue, green = MagicMock(status="running"), MagicMock()
+    client, network = _client({"open-webui": blue})
+
+    _swap(client, green).run()
+
+    network.connect.assert_called_once_with(green, aliases=[ACTIVE_ALIAS])
+    proxy_run = [c for c in client.containers.run.call_args_list if c.kwargs.get("name") == PROXY_CONTAINER_NAME]
+    assert proxy_run[0].kwargs["ports"] == {"8080/tcp": 3000}
+    blue.remove.assert_called_once()
+    green.rename.assert_called_once_with("open-webui")
+
+
+def test_swap_behind_existing_proxy_moves_alias():
+    """With a proxy in place blue is only detached, then drained after the switch."""
+    blue, green = MagicMock(status="running"), MagicMock()
+    proxy = MagicMock(status="running")
+    client, network = _client({"open-webui": blue, PROXY_CONTAINER_NAME: proxy})
+    order = MagicMock()
+    order.attach_mock(network.disconnect, "disconnect")
+    order.attach_mock(blue.stop, "stop")
+
+    _swap(client, green).run()
+
+    assert [c[0] for c in order.mock_calls] == ["disconnect", "stop"]
+    assert not any(c.kwargs.get("name") == PROXY_CONTAINER_NAME for c in client.containers.run.call_args_list)
+    green.rename.assert_called_once_with("open-webui")
+
+
+def test_failed_cutover_restores_blue():
+    """If the proxy never answers, the new proxy is removed and blue restarted on its snapshot."""
+    blue, green, proxy = MagicMock(status="running"), MagicMock(), MagicMock()
+    blue.stop.side_effect = lambda **kwargs: setattr(blue, "status", "exited")
+    containers = {"open-webui": blue}
+    client, _ = _client(containers)
+    client.containers.run.side_effect = lambda *a, **kw: (
+        containers.setdefault(PROXY_CONTAINER_NAME, proxy) if kw.get("name") == PROXY_CONTAINER_NAME else None
+    )
+
+    with pytest.raises(SwapError, match="did not answer on port 3000"):
+        _swap(client, green, proxy_ok=False).run()
+
+    green.remove.assert_called_once_with(force=True)
+    proxy.remove.assert_called_once_with(force=True)
+    assert _copies(client)[-1] == (SNAPSHOT_VOLUME, DATA_VOLUME)
+    blue.start.assert_called_once()
+    green.rename.assert_not_called()
+
+
+def test_failed_cutover_behind_proxy_restores_running_blue():
+    """Blue still running behind the proxy is restarted on its snapshot and gets the alias back."""
+    blue, green = MagicMock(status="running"), MagicMock()
+    proxy = MagicMock(status="running")
+    client, network = _client({"open-webui": blue, PROXY_CONTAINER_NAME: proxy})
+
+    with pytest.raises(SwapError):
+        _swap(client, green, proxy_ok=False).run()
+
+    assert _copies(client)[-1] == (SNAPSHOT_VOLUME, DATA_VOLUME)
+    blue.stop.assert_called_once()
+    blue.start.assert_called_once()
+    network.connect.assert_called_with(blue, aliases=[ACTIVE_ALIAS])
+    proxy.remove.assert_not_called()
+
+
+def test_nothing_serving_starts_directly():
+    """A first install has nothing to keep up and starts on the port directly."""
+    client, _ = _client({})
+    green = MagicMock()
+    swap = _swap(client, green)
+    swap.run()
+    swap.start_container.assert_called_once_with(3000, "example/open-webui:new")
+
+
+@pytest.fixture
+def installer(mocker, tmp_path):
+    mocker.patch("docker.from_env", return_value=MagicMock())
+    inst = Installer()
+    inst.config_dir = str(tmp_path)
+    return inst
+
+
+def test_uninstall_removes_swap_leftovers(installer, mocker):
+    """Proxy, green container, network and snapshot volume go with the install."""
+    mocker.patch("shutil.rmtree")
+    client = installer.docker_client
+    leftovers = {name: MagicMock() for name in ("open-webui-green", PROXY_CONTAINER_NAME, "open-webui-other")}
+    for name, container in leftovers.items():
+        container.name = name
+    client.containers.list.return_value = list(leftovers.values())
+    network = MagicMock()
+    client.networks.list.return_value = [network]
+    snapshot = MagicMock()
+    snapshot.name = SNAPSHOT_VOLUME
+    client.volumes.list.return_value = [snapshot]
+
+    installer.uninstall()
+
+    leftovers["open-webui-green"].remove.assert_called_once_with(force=True)
+    leftovers[PROXY_CONTAINER_NAME].remove.assert_called_once_with(force=True)
+    leftovers["open-webui-other"].remove.assert_not_called()
+    network.remove.assert_called_once()
+    snapshot.remove.assert_called_once_with(force=True)
+
+
+def test_swap_error_becomes_installer_error(installer, mocker):
+    from openwebui_installer.installer import InstallerError
+
+    mocker.patch("openwebui_installer.installer.BlueGreenSwap.run", side_effect=SwapError("not ready"))
+    with pytest.raises(InstallerError, match="not ready"):
+        installer._swap_container(3000, "example/open-webui:new")
@@ -2,6 +2,7 @@
 Tests for the CLI module
 """
 
+import json
 from unittest.mock import MagicMock, patch, Mock
 
 import pytest
@@ -20,7 +21,7 @@ def runner():
 @pytest.fixture
 def mock_installer():
     """Mock installer instance supporting context manager usage."""
-    with patch("openwebui_installer.cli.Installer") as mock_cls:
+    with patch("openwebui_installer.installer.Installer") as mock_cls:
         installer = Mock()
         # Configure the mock to behave as a context manager
         mock_instance = mock_cls.return_value
@@ -54,6 +55,18 @@ def test_install_with_options(runner, mock_installer):
     )
 
 
+def test_install_validates_with_same_installer(runner):
+    """Validation and installation share a single installer and connection."""
+    with patch("openwebui_installer.installer.Installer") as mock_cls:
+        installer = mock_cls.return_value.__enter__.return_value
+        result = runner.invoke(cli, ["install"])
+
+    assert result.exit_code == 0
+    mock_cls.assert_called_once()
+    installer._check_system_requirements.assert_called_once()
+    installer.install.assert_called_once()
+
+
 def test_install_system_requirements_error(runner, mock_installer):
     """Test installation with system requirements error."""
     mock_installer.install.side_effect = SystemRequirementsError("Docker not running")
@@ -259,7 +272,7 @@ class TestCLI:
         log_file = log_dir / "openwebui_installer.log"
         log_file.write_text("line1\nline2")
 
-        with patch("openwebui_installer.cli.Installer") as mock_inst:
+        with patch("openwebui_installer.installer.Installer") as mock_inst:
             inst = Mock()
             inst.log_file = str(log_file)
             inst._setup_logger = Mock()
@@ -278,3 +291,181 @@ class TestCLI:
             result = runner.invoke(cli, ["logs", "--lines", "1"])
             assert result.exit_code == 0
             assert "line2" in result.output
+
+
+def test_preflight_json(runner, mock_installer):
+    """preflight --json prints the report and fails when a check failed."""
+    from openwebui_installer.preflight import CheckResult, PreflightReport
+
+    mock_installer.preflight.return_value = PreflightReport([
+        CheckResult("os", True),
+        CheckResult("ollama", False, "Ollama is not running"),
+    ])
+    result = runner.invoke(cli, ["preflight", "--json"])
+    assert result.exit_code == 1
+    data = json.loads(result.output)
+    assert data["ok"] is False
+    assert [c["name"] for c in data["checks"]] == ["os", "ollama"]
+
+
+def test_install_multiple_models(runner, mock_installer, tmp_path):
+    """Models from --model and --models-file are installed together."""
+    from openwebui_installer.models import ModelPullResult
+
+    manifest = tmp_path / "models.txt"
+    manifest.write_text("# workstation set\nmistral\nllama2\n")
+    mock_installer.model_results = [ModelPullResult("llama2", "present"), ModelPullResult("mistral", "pulled", 4.2)]
+
+    result = runner.invoke(
+        cli, ["install", "-m", "llama2", "--models-file", str(manifest), "--concurrency", "2"]
+    )
+
+    assert result.exit_code == 0
+    mock_installer.install.assert_called_once_with(
+        model=["llama2", "mistral"], port=3000, force=False, image=None
+    )
+    assert mock_installer.model_concurrency == 2
+    assert "mistral pulled in 4.2s" in result.output
+
+
+def test_models_pull_reports_each_model(runner, mock_installer):
+    """models pull prints per-model outcomes and fails if any pull failed."""
+    from openwebui_installer.models import ModelPullResult
+
+    mock_installer.pull_models.return_value = [
+        ModelPullResult("llama2", "present"),
+        ModelPullResult("missing", "failed", 0.5, error=Exception("model not found")),
+    ]
+
+    result = runner.invoke(cli, ["models", "pull", "llama2", "missing"])
+
+    assert result.exit_code == 1
+    mock_installer.pull_models.assert_called_once_with(["llama2", "missing"], concurrency=3)
+    assert "llama2 already available" in result.output
+    assert "missing failed after 0.5s: model not found" in result.output
+
+
+def test_models_pull_requires_a_model(runner, mock_installer):
+    result = runner.invoke(cli, ["models", "pull"])
+    assert result.exit_code == 2
+    mock_installer.pull_models.assert_not_called()
+
+
+def test_status_json(runner, mock_installer):
+    mock_installer.get_status.return_value = {"installed": True, "running": True, "port": 3000}
+    result = runner.invoke(cli, ["status", "--json"])
+    assert result.exit_code == 0
+    assert json.loads(result.output)["running"] is True
+
+
+def test_status_watch_json_lines(runner, mock_installer):
+    """status --watch --json prints one JSON object per change."""
+    from openwebui_installer.watcher import StatusChange
+
+    def run(self):
+        self.on_change(StatusChange("snapshot", {"running": True}, 1.0))
+        self.on_change(StatusChange("die", {"running": False, "exit_code": 137}, 2.0))
+
+    with patch("openwebui_installer.watcher.StatusWatcher.run", run):
+        result = runner.invoke(cli, ["status", "--watch", "--json"])
+
+    assert result.exit_code == 0
+    lines = [json.loads(line) for line in result.output.splitlines()]
+    assert [line["action"] for line in lines] == ["snapshot", "die"]
+    assert lines[1]["status"]["exit_code"] == 137
+
+
+def test_logs_container_follow(runner, mock_installer, tmp_path):
+    """--container streams the container logs with the requested tail."""
+    mock_installer.log_file = str(tmp_path / "missing.log")
+    result = runner.invoke(cli, ["logs", "--container", "-n", "5", "--follow"])
+    assert result.exit_code == 0
+    mock_installer.show_logs.assert_called_once_with(
+        tail=5, follow=True, since=None, until=None, pattern=None, level=None, count=False, ignore_case=False
+    )
+
+
+def test_logs_tail_reads_rotated_backups(runner, mock_installer, tmp_path):
+    log_file = tmp_path / "openwebui_installer.log"
+    log_file.write_text("new\n")
+    (tmp_path / "openwebui_installer.log.1").write_text("older\nold\n")
+    mock_installer.log_file = str(log_file)
+
+    result = runner.invoke(cli, ["logs", "-n", "2"])
+
+    assert result.exit_code == 0
+    assert result.output.splitlines() == ["old", "new"]
+    mock_installer.show_logs.assert_not_called()
+
+
+def test_logs_filters_go_to_the_runtime(runner, mock_installer, tmp_path):
+    """--since selects container logs, scans the whole window and --count prints the total."""
+    mock_installer.log_file = str(tmp_path / "openwebui_installer.log")
+    (tmp_path / "openwebui_installer.log").write_text("x\n")
+    mock_installer.show_logs.return_value = 42
+
+    result = runner.invoke(cli, ["logs", "--since", "2h", "--grep", "timeout", "--level", "ERROR", "--count"])
+
+    assert result.exit_code == 0
+    assert result.output.strip() == "42"
+    mock_installer.show_logs.assert_called_once_with(
+        tail="all", follow=False, since="2h", until=None, pattern="timeout", level="error",
+        count=True, ignore_case=False,
+    )
+
+
+def test_logs_grep_installer_log(runner, mock_installer, tmp_path):
+    log_file = tmp_path / "openwebui_installer.log"
+    log_file.write_text("INFO start\nERROR boom\nINFO done\nERROR bang\n")
+    mock_installer.log_file = str(log_file)
+
+    result = runner.invoke(cli, ["logs", "--grep", "b[ao]", "--level", "error"])
+
+    assert result.output.splitlines() == ["ERROR boom", "ERROR bang"]
+
+
+def test_export_diagnostics(runner, mock_installer, tmp_path, mocker):
+    """export-diagnostics and logs --export both write the bundle."""
+    export = mocker.patch(
+        "openwebui_installer.diagnostics.export_diagnostics",
+        return_value={"files": ["a", "b"], "errors": {"container.log": "No such container"}},
+    )
+    out = str(tmp_path / "bundle.zip")
+
+    result = runner.invoke(cli, ["export-diagnostics", out, "--lines", "10", "--since", "1h"])
+    assert result.exit_code == 0
+    export.assert_called_once_with(mock_installer, out, container_lines=10, since="1h")
+    assert "2 files" in result.output
+    assert "container.log not included" in result.output
+
+    export.reset_mock()
+    result = runner.invoke(cli, ["logs", "--export", out])
+    assert result.exit_code == 0
+    export.assert_called_once_with(mock_installer, out, container_lines=5000, since=None)
+
+
+def test_cache_stats_and_prune(runner, tmp_path, monkeypatch):
+    """cache stats reports the artifact store; cache prune empties it with --all."""
+    from openwebui_installer.artifacts import ArtifactStore
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    store = ArtifactStore()
+    part = tmp_path / "part"
+    part.write_bytes(b"x" * 10)
+    store.add(str(part), "a" * 64)
+
+    result = runner.invoke(cli, ["cache", "stats", "--json"])
+    assert result.exit_code == 0
+    stats = json.loads(result.output)
+    assert (stats["count"], stats["bytes"]) == (1, 10)
+
+    result = runner.invoke(cli, ["cache", "prune", "--max-size", "lots"])
+    assert result.exit_code == 2
+
+    result = runner.invoke(cli, ["cache", "prune"])
+    assert "Removed 0 artifacts" in result.output
+
+    result = runner.invoke(cli, ["cache", "prune", "--all"])
+    assert result.exit_code == 0
+    assert "Removed 1 artifacts (10 B)" in result.output
+    assert store.stats().count == 0
@@ -0,0 +1,85 @@
+"""
+Tests for diagnostics bundles
+"""
+
+import gzip
+import json
+import zipfile
+from unittest.mock import MagicMock
+
+from openwebui_installer.diagnostics import REDACTED, export_diagnostics, redact
+from openwebui_installer.preflight import CheckResult, PreflightReport
+
+
+def test_redact():
+    config = {
+        "port": 3000,
+        "WEBUI_SECRET_KEY": "s3cret",
+        "api_token": "",
+        "nested": {"Env": ["OPENAI_API_KEY=sk-123", "PORT=8080", "HF_TOKEN=hf"]},
+        "url": "https://user:pw@example.com/path",
+    }
+    assert redact(config) == {
+        "port": 3000,
+        "WEBUI_SECRET_KEY": REDACTED,
+        "api_token": "",
+        "nested": {"Env": [f"OPENAI_API_KEY={REDACTED}", "PORT=8080", f"HF_TOKEN={REDACTED}"]},
+        "url": f"https://{REDACTED}@example.com/path",
+    }
+
+
+def _installer(tmp_path):
+    installer = MagicMock()
+    installer.config_dir = str(tmp_path)
+    installer.runtime = "docker"
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    installer.log_file = str(log_dir / "openwebui_installer.log")
+    (log_dir / "openwebui_installer.log").write_text("current\n")
+    with gzip.open(log_dir / "openwebui_installer.log.1.gz", "wt") as f:
+        f.write("older\n")
+    (tmp_path / "config.json").write_text(json.dumps({"port": 3000, "openai_api_key": "sk-1"}))
+
+    container = installer.docker_client.containers.get.return_value
+    container.logs.return_value = iter([b"2024-01-01T00:00:00Z started\n", b"2024-01-01T00:00:01Z ready\n"])
+    container.attrs = {"Config": {"Env": ["WEBUI_SECRET_KEY=abc", "PORT=8080"]}}
+    installer.docker_client.version.return_value = {"Version": "24.0"}
+    installer.preflight.return_value = PreflightReport([CheckResult("os", True, "Operating system check")])
+    return installer, container
+
+
+def test_export_bundle_contents(tmp_path):
+    installer, container = _installer(tmp_path)
+    path = tmp_path / "bundle.zip"
+
+    manifest = export_diagnostics(installer, str(path), container_lines=100, since="1700000000")
+
+    container.logs.assert_called_once_with(stream=True, follow=False, tail=100, timestamps=True, since=1700000000)
+    assert manifest["errors"] == {}
+    with zipfile.ZipFile(path) as archive:
+        assert sorted(archive.namelist()) == [
+            "config.json", "container.log", "inspect.json",
+            "logs/openwebui_installer.log", "logs/openwebui_installer.log.1.gz",
+            "manifest.json", "preflight.json",
+        ]
+        assert archive.read("logs/openwebui_installer.log") == b"current\n"
+        assert gzip.decompress(archive.read("logs/openwebui_installer.log.1.gz")) == b"older\n"
+        assert archive.read("container.log").endswith(b"ready\n")
+        assert json.loads(archive.read("config.json"))["openai_api_key"] == REDACTED
+        inspect = json.loads(archive.read("inspect.json"))
+        assert inspect["container"]["Config"]["Env"] == [f"WEBUI_SECRET_KEY={REDACTED}", "PORT=8080"]
+        assert json.loads(archive.read("preflight.json"))["ok"] is True
+        assert json.loads(archive.read("manifest.json"))["files"] == manifest["files"]
+
+
+def test_export_records_missing_parts(tmp_path):
+    """A missing container or config is noted in the manifest, not fatal."""
+    installer, _ = _installer(tmp_path)
+    (tmp_path / "config.json").unlink()
+    installer.docker_client.containers.get.side_effect = RuntimeError("No such container")
+
+    manifest = export_diagnostics(installer, str(tmp_path / "bundle.zip"))
+
+    assert set(manifest["errors"]) == {"container.log", "config.json", "inspect.json"}
+    assert "No such container" in manifest["errors"]["container.log"]
+    assert "preflight.json" in manifest["files"]
@@ -1,4 +1,6 @@
+import hashlib
 import os
+import stat
 from io import BytesIO
 from unittest.mock import MagicMock
 
@@ -10,9 +12,16 @@ import requests
 
 import pytest
 
+from openwebui_installer import downloader
 from openwebui_installer.downloader import DownloadError, Downloader
 
 
+@pytest.fixture(autouse=True)
+def home(tmp_path, monkeypatch):
+    """Keep the checksum cache and download index out of the real home directory."""
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+
+
 class FakeResponse:
     def __init__(self, data: bytes, status_code: int = 200):
         self._data = data
@@ -77,3 +86,407 @@ def test_failed_download_raises(tmp_path):
 
     with pytest.raises(DownloadError):
         dl.download_if_needed("http://example.com/file", str(dest))
+
+
+class RangeResponse(FakeResponse):
+    def __init__(self, data: bytes, status_code: int = 200, headers=None):
+        super().__init__(data, status_code)
+        self.headers = headers or {}
+        self.closed = False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"Status {self.status_code}")
+
+    def close(self):
+        self.closed = True
+
+
+class RangeServer:
+    """Fake session serving ``data``, honouring Range headers when ``ranges`` is set."""
+
+    def __init__(self, data: bytes, ranges: bool = True, etag: str = '"v1"'):
+        self.data = data
+        self.ranges = ranges
+        self.etag = etag
+        self.requests = []
+        self.conditions = []
+        self.fail = set()
+
+    def get(self, url, stream=False, timeout=None, headers=None):
+        headers = headers or {}
+        requested = headers.get("Range")
+        self.requests.append(requested)
+        if requested in self.fail:
+            raise requests.exceptions.ConnectionError("connection reset")
+        if "If-None-Match" in headers:
+            self.conditions.append(headers["If-None-Match"])
+            if headers["If-None-Match"] == self.etag:
+                return RangeResponse(b"", 304, {"ETag": self.etag})
+        if not self.ranges or requested is None:
+            return RangeResponse(self.data, headers={"Content-Length": str(len(self.data))})
+        start, _, end = requested[len("bytes="):].partition("-")
+        start, end = int(start), int(end) if end else len(self.data) - 1
+        body = self.data[start:end + 1]
+        return RangeResponse(body, 206, {
+            "Content-Range": f"bytes {start}-{end}/{len(self.data)}",
+            "Content-Length": str(len(body)),
+            "ETag": self.etag,
+        })
+
+
+DATA = bytes(range(256)) * 40  # 10240 bytes
+
+
+def test_parallel_ranged_download(tmp_path):
+    server = RangeServer(DATA)
+    dl = Downloader(session=server, connections=3, segment_size=1024)
+    dest = tmp_path / "big.bin"
+
+    dl.download_if_needed("http://example.com/big", str(dest))
+
+    assert dest.read_bytes() == DATA
+    # The probe, then one request per segment
+    assert server.requests[0] == "bytes=0-"
+    assert sorted(server.requests[1:]) == sorted(f"bytes={i * 1024}-{i * 1024 + 1023}" for i in range(10))
+    assert not (tmp_path / "big.bin.part").exists()
+    assert not (tmp_path / "big.bin.part.journal").exists()
+
+
+def test_interrupted_download_resumes_missing_segments(tmp_path, mocker):
+    mocker.patch("openwebui_installer.downloader.SEGMENT_ATTEMPTS", 1)
+    server = RangeServer(DATA)
+    server.fail = {"bytes=3072-4095", "bytes=8192-9215"}
+    dl = Downloader(session=server, connections=1, segment_size=1024)
+    dest = tmp_path / "big.bin"
+
+    with pytest.raises(DownloadError):
+        dl.download_if_needed("http://example.com/big", str(dest))
+    assert not dest.exists()
+    assert (tmp_path / "big.bin.part").exists()
+    assert (tmp_path / "big.bin.part.journal").exists()
+
+    server.fail = set()
+    server.requests = []
+    dl.download_if_needed("http://example.com/big", str(dest))
+
+    assert dest.read_bytes() == DATA
+    fetched = set(server.requests[1:])
+    # Segments 0-2 finished before the failure; only the rest is fetched again
+    assert "bytes=0-1023" not in fetched
+    assert {"bytes=3072-4095", "bytes=8192-9215"} <= fetched
+    assert not (tmp_path / "big.bin.part.journal").exists()
+
+
+def test_changed_remote_file_restarts(tmp_path, mocker):
+    """A journal written for another version of the file is not trusted."""
+    mocker.patch("openwebui_installer.downloader.SEGMENT_ATTEMPTS", 1)
+    server = RangeServer(DATA)
+    server.fail = {"bytes=5120-6143"}
+    dl = Downloader(session=server, connections=1, segment_size=1024)
+    dest = tmp_path / "big.bin"
+    with pytest.raises(DownloadError):
+        dl.download_if_needed("http://example.com/big", str(dest))
+
+    new = bytes(reversed(DATA))
+    server.data, server.etag, server.fail, server.requests = new, '"v2"', set(), []
+    dl.download_if_needed("http://example.com/big", str(dest))
+
+    assert dest.read_bytes() == new
+    assert len(server.requests) == 11
+
+
+def test_falls_back_to_single_stream_without_ranges(tmp_path):
+    server = RangeServer(DATA, ranges=False)
+    dl = Downloader(session=server, segment_size=1024)
+    dest = tmp_path / "big.bin"
+
+    dl.download_if_needed("http://example.com/big", str(dest))
+
+    assert dest.read_bytes() == DATA
+    assert len(server.requests) == 1
+
+
+def test_small_file_uses_one_request(tmp_path):
+    server = RangeServer(b"small")
+    dl = Downloader(session=server, segment_size=1024)
+    dest = tmp_path / "small.bin"
+
+    dl.download_if_needed("http://example.com/small", str(dest))
+
+    assert dest.read_bytes() == b"small"
+    assert server.requests == ["bytes=0-"]
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+@pytest.mark.parametrize("ranges", [True, False])
+def test_download_is_hashed_while_streaming(tmp_path, mocker, ranges):
+    """The checksum is computed as bytes arrive; the file is never read back in full."""
+    reread = mocker.patch("openwebui_installer.downloader._sha256", side_effect=AssertionError("re-read"))
+    dl = Downloader(session=RangeServer(DATA, ranges=ranges), connections=3, segment_size=1024, cache_dir=str(tmp_path))
+    dest = tmp_path / "big.bin"
+
+    dl.download_if_needed("http://example.com/big", str(dest), checksum=_digest(DATA))
+
+    assert dest.read_bytes() == DATA
+    reread.assert_not_called()
+
+
+def test_resumed_download_checksum_covers_kept_segments(tmp_path, mocker):
+    mocker.patch("openwebui_installer.downloader.SEGMENT_ATTEMPTS", 1)
+    server = RangeServer(DATA)
+    server.fail = {"bytes=4096-5119"}
+    dl = Downloader(session=server, connections=2, segment_size=1024, cache_dir=str(tmp_path))
+    dest = tmp_path / "big.bin"
+    with pytest.raises(DownloadError):
+        dl.download_if_needed("http://example.com/big", str(dest), checksum=_digest(DATA))
+
+    server.fail = set()
+    dl.download_if_needed("http://example.com/big", str(dest), checksum=_digest(DATA))
+    assert dest.read_bytes() == DATA
+
+
+def test_verified_checksums_are_cached(tmp_path, mocker):
+    dest = tmp_path / "file.bin"
+    dest.write_bytes(b"payload")
+    session = MagicMock()
+    hashed = mocker.spy(downloader, "_sha256")
+
+    Downloader(session=session, cache_dir=str(tmp_path)).download_if_needed(
+        "http://example.com/f", str(dest), checksum=_digest(b"payload")
+    )
+    assert hashed.call_count == 1
+
+    # A later run trusts the cache while the file is unchanged
+    Downloader(session=session, cache_dir=str(tmp_path)).download_if_needed(
+        "http://example.com/f", str(dest), checksum=_digest(b"payload")
+    )
+    assert hashed.call_count == 1
+    session.get.assert_not_called()
+
+    dest.write_bytes(b"tampered")
+    session.get.return_value = FakeResponse(b"payload")
+    Downloader(session=session, cache_dir=str(tmp_path)).download_if_needed(
+        "http://example.com/f", str(dest), checksum=_digest(b"payload")
+    )
+    assert hashed.call_count == 2
+    assert dest.read_bytes() == b"payload"
+
+
+def test_fresh_download_is_not_revalidated(tmp_path):
+    server = RangeServer(b"v1 data")
+    dl = Downloader(session=server, cache_dir=str(tmp_path), max_age=3600)
+    dest = tmp_path / "f.bin"
+    dl.download_if_needed("http://example.com/f", str(dest))
+    server.requests = []
+
+    dl.download_if_needed("http://example.com/f", str(dest))
+
+    assert server.requests == []
+
+
+def test_unchanged_file_revalidates_with_304(tmp_path):
+    server = RangeServer(b"v1 data")
+    dl = Downloader(session=server, cache_dir=str(tmp_path), max_age=0)
+    dest = tmp_path / "f.bin"
+    dl.download_if_needed("http://example.com/f", str(dest))
+    checked = dl.index.lookup("http://example.com/f", str(dest))["checked_at"]
+
+    dl.download_if_needed("http://example.com/f", str(dest))
+
+    assert server.conditions == ['"v1"']
+    assert dest.read_bytes() == b"v1 data"
+    assert dl.index.lookup("http://example.com/f", str(dest))["checked_at"] >= checked
+
+
+def test_changed_file_is_downloaded_from_the_revalidation_response(tmp_path):
+    server = RangeServer(b"v1 data")
+    dl = Downloader(session=server, cache_dir=str(tmp_path), max_age=0)
+    dest = tmp_path / "f.bin"
+    dl.download_if_needed("http://example.com/f", str(dest))
+
+    server.data, server.etag, server.requests = b"v2 data!", '"v2"', []
+    dl.download_if_needed("http://example.com/f", str(dest))
+
+    assert dest.read_bytes() == b"v2 data!"
+    # The conditional request doubled as the download
+    assert server.requests == ["bytes=0-"]
+    assert dl.index.lookup("http://example.com/f", str(dest))["etag"] == '"v2"'
+
+
+def test_revalidation_keeps_file_when_offline_or_unknown(tmp_path):
+    server = RangeServer(b"v1 data")
+    dl = Downloader(session=server, cache_dir=str(tmp_path), max_age=0)
+    dest = tmp_path / "f.bin"
+    dl.download_if_needed("http://example.com/f", str(dest))
+
+    server.fail = {"bytes=0-"}
+    assert dl.download_if_needed("http://example.com/f", str(dest)) == str(dest)
+    assert dest.read_bytes() == b"v1 data"
+
+    # A file changed locally is no longer described by the stored validators
+    os.chmod(dest, 0o644)
+    dest.write_bytes(b"edited")
+    server.requests = []
+    dl.download_if_needed("http://example.com/f", str(dest))
+    assert server.requests == []
+    assert dest.read_bytes() == b"edited"
+
+
+@pytest.mark.parametrize("status", [404, 503])
+def test_revalidation_keeps_file_on_server_errors(tmp_path, mocker, status):
+    server = RangeServer(b"v1 data")
+    dl = Downloader(session=server, cache_dir=str(tmp_path), max_age=0)
+    dest = tmp_path / "f.bin"
+    dl.download_if_needed("http://example.com/f", str(dest))
+    error = RangeResponse(b"unavailable", status)
+    mocker.patch.object(server, "get", return_value=error)
+
+    assert dl.download_if_needed("http://example.com/f", str(dest)) == str(dest)
+
+    assert dest.read_bytes() == b"v1 data"
+    assert error.closed
+    assert not os.path.exists(f"{dest}.part")
+
+
+class Hosts:
+    """Fake session dispatching on the URL to one RangeServer per file."""
+
+    def __init__(self, files):
+        self.servers = {url: RangeServer(data) for url, data in files.items()}
+        self.order = []
+
+    def get(self, url, **kwargs):
+        self.order.append(url)
+        if url not in self.servers:
+            raise requests.exceptions.ConnectionError("no route to host")
+        return self.servers[url].get(url, **kwargs)
+
+
+def test_download_many_reports_each_item(tmp_path):
+    session = Hosts({"http://a/one": b"one", "http://b/big": DATA})
+    (tmp_path / "kept.bin").write_bytes(b"kept")
+    dl = Downloader(session=session, segment_size=1024, cache_dir=str(tmp_path))
+
+    results = dl.download_many([
+        ("http://a/one", str(tmp_path / "one.bin")),
+        ("http://a/kept", str(tmp_path / "kept.bin")),
+        ("http://a/missing", str(tmp_path / "missing.bin")),
+        downloader.DownloadItem("http://b/big", str(tmp_path / "big.bin"), _digest(DATA)),
+    ], concurrency=2)
+
+    assert [r.status for r in results] == ["downloaded", "hit", "failed", "downloaded"]
+    assert [r.bytes for r in results] == [3, 0, 0, len(DATA)]
+    assert isinstance(results[2].error, DownloadError)
+    assert not results[2].ok and results[3].ok
+    assert all(r.seconds >= 0 for r in results)
+    assert (tmp_path / "big.bin").read_bytes() == DATA
+
+
+def test_download_many_starts_higher_priority_first(tmp_path):
+    files = {f"http://a/{name}": name.encode() for name in ("low", "high", "mid")}
+    session = Hosts(files)
+    dl = Downloader(session=session, cache_dir=str(tmp_path))
+
+    dl.download_many([
+        downloader.DownloadItem("http://a/low", str(tmp_path / "low"), priority=0),
+        downloader.DownloadItem("http://a/high", str(tmp_path / "high"), priority=10),
+        downloader.DownloadItem("http://a/mid", str(tmp_path / "mid"), priority=5),
+    ], concurrency=1)
+
+    assert session.order == ["http://a/high", "http://a/mid", "http://a/low"]
+    with pytest.raises(ValueError):
+        dl.download_many([], concurrency=0)
+
+
+def test_connection_pools_are_sized_per_host(tmp_path):
+    dl = Downloader(connections=2, cache_dir=str(tmp_path))
+    items = [downloader.DownloadItem(f"https://a.example/{i}", str(tmp_path / str(i))) for i in range(5)]
+    items.append(downloader.DownloadItem("https://b.example/x", str(tmp_path / "x")))
+
+    dl._size_pools(items, concurrency=3)
+
+    assert dl.session.get_adapter("https://a.example/0")._pool_maxsize == 6
+    # A single file from a host needs no more than the default pool
+    assert dl.session.get_adapter("https://b.example/x")._pool_maxsize == 2
+
+
+def test_bandwidth_cap_is_shared(tmp_path, mocker):
+    sleeps = []
+    mocker.patch("openwebui_installer.downloader.time.sleep", side_effect=sleeps.append)
+    session = Hosts({"http://a/1": DATA, "http://a/2": DATA})
+    dl = Downloader(session=session, cache_dir=str(tmp_path), max_bytes_per_second=len(DATA))
+
+    dl.download_many([("http://a/1", str(tmp_path / "1")), ("http://a/2", str(tmp_path / "2"))], concurrency=2)
+
+    # At one file per second the last chunk is booked about two seconds out
+    assert max(sleeps) == pytest.approx(2, abs=0.2)
+
+
+def test_identical_downloads_are_stored_once(tmp_path):
+    server = RangeServer(DATA)
+    dl = Downloader(session=server, segment_size=1024, cache_dir=str(tmp_path))
+
+    dl.download_if_needed("http://a/one", str(tmp_path / "one.bin"))
+    dl.download_if_needed("http://b/two", str(tmp_path / "two.bin"))
+
+    stored = dl.store.path(_digest(DATA))
+    assert os.stat(tmp_path / "one.bin").st_ino == os.stat(tmp_path / "two.bin").st_ino == os.stat(stored).st_ino
+    assert dl.store.stats().count == 1
+    assert not os.path.exists(tmp_path / "two.bin.part")
+    assert not os.stat(tmp_path / "one.bin").st_mode & stat.S_IWUSR
+
+
+def test_download_is_not_stored_when_it_cannot_be_shared(tmp_path, mocker):
+    """A destination on another filesystem keeps the only copy."""
+    mocker.patch("openwebui_installer.artifacts._share", return_value=False)
+    dl = Downloader(session=RangeServer(DATA), cache_dir=str(tmp_path))
+
+    dl.download_if_needed("http://a/file", str(tmp_path / "f.bin"), checksum=_digest(DATA))
+
+    assert (tmp_path / "f.bin").read_bytes() == DATA
+    assert dl.store.stats().count == 0
+    assert not os.path.exists(tmp_path / "f.bin.part")
+
+
+def test_known_checksum_is_linked_from_the_store(tmp_path):
+    server = RangeServer(DATA)
+    dl = Downloader(session=server, cache_dir=str(tmp_path))
+    dl.download_if_needed("http://a/file", str(tmp_path / "first.bin"), checksum=_digest(DATA))
+    fetched = len(server.requests)
+
+    result = dl.download_many([("http://b/file", str(tmp_path / "sub" / "second.bin"), _digest(DATA))])[0]
+
+    assert (result.status, result.bytes) == ("hit", 0)
+    assert len(server.requests) == fetched
+    assert (tmp_path / "sub" / "second.bin").read_bytes() == DATA
+
+
+def test_corrupted_store_copy_is_downloaded_again(tmp_path):
+    server = RangeServer(DATA)
+    dl = Downloader(session=server, cache_dir=str(tmp_path))
+    first = tmp_path / "first.bin"
+    dl.download_if_needed("http://a/file", str(first), checksum=_digest(DATA))
+    # Written through the hard link, as only root can
+    os.chmod(first, 0o644)
+    first.write_bytes(b"tampered")
+
+    dl.download_if_needed("http://a/file", str(tmp_path / "second.bin"), checksum=_digest(DATA))
+
+    assert (tmp_path / "second.bin").read_bytes() == DATA
+    with open(dl.store.path(_digest(DATA)), "rb") as f:
+        assert f.read() == DATA
+
+
+def test_store_evicts_over_its_cap(tmp_path):
+    session = Hosts({"http://a/1": b"1" * 100, "http://a/2": b"2" * 100})
+    dl = Downloader(session=session, cache_dir=str(tmp_path), store=downloader.ArtifactStore(str(tmp_path / "c"), 150))
+
+    dl.download_if_needed("http://a/1", str(tmp_path / "1"))
+    dl.download_if_needed("http://a/2", str(tmp_path / "2"))
+
+    assert [e.size for e in dl.store.entries()] == [100]
+    assert (tmp_path / "1").read_bytes() == b"1" * 100
@@ -2,6 +2,7 @@
 Tests for the GUI module
 """
 import sys
+import time
 from unittest.mock import patch, MagicMock
 import pytest
 pytest.importorskip("PyQt6.QtWidgets", reason="PyQt6 not available")
@@ -9,6 +10,12 @@ from PyQt6.QtWidgets import QApplication, QMessageBox
 from openwebui_installer.gui import MainWindow
 from openwebui_installer import __version__
 
+def _drain(window, qapp):
+    """Wait for pool work and deliver its signals to the UI thread."""
+    window.pool.waitForDone(5000)
+    qapp.processEvents()
+
+
 @pytest.fixture
 def window(qapp):
     """Create a MainWindow instance for testing, ensuring it's closed after."""
@@ -34,20 +41,18 @@ def test_initial_status_call(mock_installer, qapp):
         qapp.processEvents()
 
 def test_start_installation(window):
-    """Test that the UI is disabled and the installer thread is started."""
-    with patch("openwebui_installer.gui.InstallerThread") as mock_thread_class, \
+    """Test that the UI is disabled and the install runs on the worker pool."""
+    with patch.object(window, "pool") as mock_pool, \
          patch.object(window.install_button, 'setEnabled') as mock_set_install_enabled, \
          patch.object(window.uninstall_button, 'setEnabled') as mock_set_uninstall_enabled, \
          patch.object(window.progress_bar, 'show') as mock_show_progress:
 
-        mock_thread_instance = mock_thread_class.return_value
         window.start_installation()
 
         mock_set_install_enabled.assert_called_with(False)
         mock_set_uninstall_enabled.assert_called_with(False)
         mock_show_progress.assert_called_once()
-        mock_thread_class.assert_called_once()
-        mock_thread_instance.start.assert_called_once()
+        mock_pool.start.assert_called_once_with(window.install_worker)
 
 @patch("openwebui_installer.gui.QMessageBox")
 def test_handle_success(mock_msg_box, window):
@@ -85,7 +90,7 @@ def test_update_progress(window):
         window.update_progress(message)
         mock_set_format.assert_called_with(message)
 
-def test_uninstall_confirmed(window):
+def test_uninstall_confirmed(window, qapp):
     """Test that installer.uninstall is called when the user confirms."""
     # Let's mock QMessageBox at the window level instead
     with patch.object(window, 'update_status') as mock_update:
@@ -98,6 +103,7 @@ def test_uninstall_confirmed(window):
                     mock_installer_instance.uninstall = MagicMock()
 
                     window.uninstall()
+                    _drain(window, qapp)
 
                     # Check that question was asked
                     mock_question.assert_called_once()
@@ -110,17 +116,18 @@ def test_uninstall_confirmed(window):
 
 @patch("openwebui_installer.gui.QMessageBox")
 @patch("openwebui_installer.gui.Installer")
-def test_uninstall_cancelled(mock_installer_class, mock_msg_box, window):
+def test_uninstall_cancelled(mock_installer_class, mock_msg_box, window, qapp):
     """Test that installer.uninstall is NOT called when the user cancels."""
     mock_msg_box.question.return_value = QMessageBox.StandardButton.No
     mock_installer_instance = mock_installer_class.return_value
 
     window.uninstall()
+    _drain(window, qapp)
 
     mock_msg_box.question.assert_called_once()
     mock_installer_instance.uninstall.assert_not_called()
 
-def test_uninstall_with_error(window):
+def test_uninstall_with_error(window, qapp):
     """Test the error handling logic during uninstallation."""
     with patch.object(window, 'update_status') as mock_update:
         with patch("openwebui_installer.gui.Installer") as mock_installer_class:
@@ -133,6 +140,7 @@ def test_uninstall_with_error(window):
                     mock_installer_instance.uninstall.side_effect = Exception(error_message)
 
                     window.uninstall()
+                    _drain(window, qapp)
 
                     # Check that installer was created and uninstall called
                     mock_installer_class.assert_called_once()
@@ -143,3 +151,92 @@ def test_uninstall_with_error(window):
                     warning_args = mock_warning.call_args[0]
                     assert "Could not uninstall" in warning_args[2]  # message is third argument
                     mock_update.assert_called_once()
+
+def test_add_models_offers_local_models(window):
+    """Models Ollama already has are offered in the model list."""
+    window.add_models(["llama2:latest", "phi3:mini"])
+    items = [window.model_combo.itemText(i) for i in range(window.model_combo.count())]
+    assert items == ["llama2", "codellama", "mistral", "phi3:mini"]
+
+
+def test_status_refresh_runs_off_the_ui_thread(qapp):
+    """Status is fetched on the pool with one shared installer, and bursts are coalesced."""
+    import threading
+
+    calls = []
+
+    def get_status():
+        calls.append(threading.current_thread())
+        return {"installed": True, "running": True, "version": "main", "port": 3000, "model": "llama2"}
+
+    with patch("openwebui_installer.gui.Installer") as mock_installer_class:
+        installer = mock_installer_class.return_value
+        installer.get_status.side_effect = get_status
+        installer.ollama.list_models.return_value = []
+        win = MainWindow()
+        win.update_status()
+        win.update_status()
+        deadline = time.monotonic() + 5
+        while win.status_label.isHidden() and time.monotonic() < deadline:
+            qapp.processEvents()
+            time.sleep(0.01)
+
+        assert len(calls) == 1
+        assert calls[0] is not threading.main_thread()
+        assert "Status: Running" in win.status_label.text()
+        assert win.install_button.text() == "Reinstall"
+        mock_installer_class.assert_called_once()
+        win.close()
+
+
+def test_stale_status_result_is_dropped(window):
+    """A cancelled status refresh never updates the window."""
+    from openwebui_installer.gui import Worker
+
+    shown = []
+    worker = Worker(lambda w: {"installed": True})
+    worker.signals.result.connect(shown.append)
+    worker.cancel()
+    worker.run()
+    assert shown == []
+
+
+def test_dashboard_draws_decimated_window(qapp):
+    """Plots read only their window and never draw more points than pixels."""
+    from openwebui_installer.gui import DashboardPanel
+
+    panel = DashboardPanel()
+    now = time.time()
+    for i in range(3600):
+        panel.buffer.append(now - 3600 + i, {"cpu": float(i % 100), "memory": 1e6})
+    panel.window_combo.setCurrentIndex(3)
+    plot = panel.plots[0]
+    plot.resize(300, 80)
+
+    times, values = plot.points("cpu", 300)
+    assert 0 < len(times) <= 300
+    plot.window = 60
+    assert len(plot.points("cpu", 300)[0]) <= 60
+    panel.resize(300, 400)
+    panel.grab()
+    panel.stop()
+
+
+def test_dashboard_sampler_leaves_the_pool_free(window, qapp):
+    """The never-ending sampler runs on its own thread and stops with the container."""
+    from openwebui_installer import gui
+
+    window.pool.setMaxThreadCount(1)
+    started = []
+    with patch.object(gui.StatsSampler, "run", lambda self: self._stop.wait()), \
+         patch.object(window, "installer"):
+        window.show_status({"installed": True, "running": True, "version": "1", "port": 3000, "model": "m"})
+        sampler = window.dashboard.sampler
+        window.submit(lambda worker: started.append(True))
+        _drain(window, qapp)
+        assert started == [True]
+
+        window.show_status({"installed": True, "running": False, "version": "1", "port": 3000, "model": "m"})
+        assert sampler._stop.is_set()
+        assert window.dashboard.sampler is None
+        assert window.dashboard.isHidden()
@@ -6,7 +6,6 @@ import json
 import os
 import platform
 import shutil
-import subprocess
 from unittest.mock import MagicMock, mock_open
 
 import docker
@@ -40,7 +39,7 @@ class TestInstallerSuite:
         mocker.patch("platform.system", return_value="Darwin")
         mocker.patch("sys.version_info", (3, 9, 0))
         installer.docker_client.ping.return_value = True
-        mock_requests_get = mocker.patch("requests.get")
+        mock_requests_get = mocker.patch("requests.Session.get")
         mock_requests_get.return_value.status_code = 200
 
         # This should not raise any exception
@@ -51,7 +50,7 @@ class TestInstallerSuite:
         mocker.patch("platform.system", return_value="Linux")
         mocker.patch("sys.version_info", (3, 9, 0))
         installer.docker_client.ping.return_value = True
-        mock_requests_get = mocker.patch("requests.get")
+        mock_requests_get = mocker.patch("requests.Session.get")
         mock_requests_get.return_value.status_code = 200
 
         installer._check_system_requirements()
@@ -83,7 +82,7 @@ class TestInstallerSuite:
         mocker.patch("platform.system", return_value="Darwin")
         mocker.patch("sys.version_info", (3, 9, 0))
         installer.docker_client.ping.return_value = True
-        mock_requests_get = mocker.patch("requests.get")
+        mock_requests_get = mocker.patch("requests.Session.get")
         mock_requests_get.side_effect = requests.exceptions.RequestException("Connection failed")
 
         with pytest.raises(SystemRequirementsError, match="Ollama is not running. Please install and start Ollama first:"):
@@ -96,12 +95,15 @@ class TestInstallerSuite:
         mock_open_patch = mocker.patch("builtins.open", mock_open())
         mocker.patch("os.makedirs")
         mock_json_dump = mocker.patch("json.dump")
-        mock_subprocess_run = mocker.patch("subprocess.run")
+        mock_post = mocker.patch("requests.Session.post")
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.iter_lines.return_value = [b'{"status": "success"}']
+        mocker.patch.object(installer, "_wait_for_container")
         mocker.patch("os.chmod")
         # Avoid real HTTP requests to Ollama
         mock_resp = mocker.Mock(status_code=200)
         mock_resp.json.return_value = {"models": []}
-        mocker.patch("requests.get", return_value=mock_resp)
+        mocker.patch("requests.Session.get", return_value=mock_resp)
 
         mocker.patch.dict(os.environ, {
             "OLLAMA_BASE_URL": "http://customhost:9999",
@@ -110,14 +112,10 @@ class TestInstallerSuite:
         installer.install(model="test-model", port=1234, force=False)
 
         installer._check_system_requirements.assert_called_once()
-        installer.docker_client.images.pull.assert_called_with(installer.webui_image)
-        mock_subprocess_run.assert_called_with(
-            ["ollama", "pull", "test-model"],
-            check=True,
-            capture_output=True,
-            text=True,
-            timeout=300,
+        installer.docker_client.api.pull.assert_called_with(
+            "ghcr.io/open-webui/open-webui", tag="main", stream=True, decode=True
         )
+        assert mock_post.call_args.kwargs["json"]["model"] == "test-model"
         assert mock_json_dump.call_args[0][0]["port"] == 1234
         assert mock_json_dump.call_args[0][0]["model"] == "test-model"
 
@@ -129,7 +127,10 @@ class TestInstallerSuite:
         mock_open_patch = mocker.patch("builtins.open", mock_open())
         mocker.patch("os.makedirs")
         mock_json_dump = mocker.patch("json.dump")
-        mock_subprocess_run = mocker.patch("subprocess.run")
+        mock_post = mocker.patch("requests.Session.post")
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.iter_lines.return_value = [b'{"status": "success"}']
+        mocker.patch.object(installer, "_wait_for_container")
         mocker.patch("os.chmod")
 
         custom_image = "custom/open-webui:latest"
@@ -140,10 +141,12 @@ class TestInstallerSuite:
         # Avoid real HTTP requests to Ollama
         mock_resp = mocker.Mock(status_code=200)
         mock_resp.json.return_value = {"models": []}
-        mocker.patch("requests.get", return_value=mock_resp)
+        mocker.patch("requests.Session.get", return_value=mock_resp)
         installer.install(model="test-model", port=1234, force=False, image=custom_image)
 
-        installer.docker_client.images.pull.assert_called_with(custom_image)
+        installer.docker_client.api.pull.assert_called_with(
+            "custom/open-webui", tag="latest", stream=True, decode=True
+        )
         # Check that custom image is stored in config
         config_data = mock_json_dump.call_args[0][0]
         assert config_data["image"] == custom_image
@@ -152,16 +155,19 @@ class TestInstallerSuite:
         """Ensure log file is created during install."""
         mocker.patch.object(installer, "_check_system_requirements")
         mocker.patch.object(installer, "get_status", return_value={"installed": False})
-        mocker.patch("subprocess.run")
+        mock_post = mocker.patch("requests.Session.post")
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.iter_lines.return_value = [b'{"status": "success"}']
+        mocker.patch.object(installer, "_wait_for_container")
         mocker.patch("os.chmod")
         mocker.patch("json.dump")
 
         # Avoid real HTTP requests to Ollama
         mock_resp = mocker.Mock(status_code=200)
         mock_resp.json.return_value = {"models": []}
-        mocker.patch("requests.get", return_value=mock_resp)
+        mocker.patch("requests.Session.get", return_value=mock_resp)
 
-        installer.docker_client.images.pull.return_value = None
+        installer.docker_client.api.pull.return_value = iter([])
         installer.install(model="test", port=1234)
 
         assert os.path.exists(installer.log_file)
@@ -265,7 +271,7 @@ class TestInstallerSuite:
             installer, "_check_system_requirements"
         )  # Mock to prevent its execution
         # installer.docker_client is already a MagicMock from the fixture.
-        installer.docker_client.images.pull.side_effect = docker.errors.APIError("pull failed")
+        installer.docker_client.api.pull.side_effect = docker.errors.APIError("pull failed")
 
         expected_err = (
             f"Failed to pull Docker image {installer.webui_image}: pull failed"
@@ -297,31 +303,27 @@ class TestInstallerSuite:
         mocker.patch.object(installer, "get_status", return_value={"installed": False})
         mocker.patch.object(installer, "_check_system_requirements")
         # Mock the docker image pull to prevent it from running
-        installer.docker_client.images.pull.return_value = None
+        installer.docker_client.api.pull.return_value = iter([])
 
-        # Mock subprocess.run to fail for the ollama pull
-        mock_subprocess_run = mocker.patch("subprocess.run")
-        mock_subprocess_run.side_effect = subprocess.CalledProcessError(
-            1, ["ollama", "pull", model_name]
-        )
+        # Make the ollama pull report an error
+        mock_post = mocker.patch("requests.Session.post")
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.iter_lines.return_value = [
+            b'{"status": "pulling manifest"}',
+            b'{"error": "pull model manifest: file does not exist"}',
+        ]
 
         # Avoid real HTTP requests to Ollama
         mock_resp = mocker.Mock(status_code=200)
         mock_resp.json.return_value = {"models": []}
-        mocker.patch("requests.get", return_value=mock_resp)
+        mocker.patch("requests.Session.get", return_value=mock_resp)
 
         expected_error_message = f"Failed to pull Ollama model {model_name}"
         with pytest.raises(InstallerError, match=expected_error_message):
             installer.install(model=model_name, force=False)
 
-        # Ensure subprocess.run was called with the correct model
-        mock_subprocess_run.assert_called_with(
-            ["ollama", "pull", model_name],
-            check=True,
-            capture_output=True,
-            text=True,
-            timeout=300,
-        )
+        # Ensure the pull was run for the correct model
+        assert mock_post.call_args.kwargs["json"]["model"] == model_name
 
     def test_stop_open_webui(self, installer, mocker):  # Renaming to reflect what it does
         """Test that uninstall stops and removes the container."""
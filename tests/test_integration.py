@@ -106,10 +106,13 @@ def test_config_directory_creation(installer):
 def test_installation_workflow(installer):
     """Test complete installation workflow"""
     with patch.object(installer, '_check_system_requirements'), \
-         patch.object(installer.docker_client.images, 'pull'), \
-         patch('subprocess.run') as mock_run, \
-         patch('requests.get') as mock_get:
+         patch.object(installer.docker_client.api, 'pull', return_value=iter([])), \
+         patch('requests.Session.post') as mock_post, \
+         patch.object(installer, '_wait_for_container'), \
+         patch('requests.Session.get') as mock_get:
 
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.iter_lines.return_value = [b'{"status": "success"}']
         mock_resp = Mock(status_code=200)
         mock_resp.json.return_value = {"models": []}
         mock_get.return_value = mock_resp
@@ -117,16 +120,13 @@ def test_installation_workflow(installer):
         installer.install(model="llama2", port=3000)
 
         # Verify Docker image was pulled
-        installer.docker_client.images.pull.assert_called_once_with(installer.webui_image)
+        installer.docker_client.api.pull.assert_called_once_with(
+            "ghcr.io/open-webui/open-webui", tag="main", stream=True, decode=True
+        )
 
         # Verify Ollama model was pulled
-        mock_run.assert_called_once_with(
-            ["ollama", "pull", "llama2"],
-            check=True,
-            capture_output=True,
-            text=True,
-            timeout=300,
-        )
+        mock_post.assert_called_once()
+        assert mock_post.call_args.kwargs["json"]["model"] == "llama2"
 
 def test_uninstall_workflow(installer):
     """Test uninstall workflow"""
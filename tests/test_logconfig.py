@@ -0,0 +1,83 @@
+"""
+Tests for the queue-backed log file setup
+"""
+
+import json
+import logging
+import logging.handlers
+import threading
+
+import pytest
+
+from openwebui_installer import logconfig, logtail
+from openwebui_installer.installer import Installer
+
+
+@pytest.fixture(autouse=True)
+def reset_logging():
+    yield
+    logconfig.shutdown()
+
+
+def _handlers():
+    return [h for h in logging.getLogger(logconfig.LOGGER_NAME).handlers if isinstance(h, logging.handlers.QueueHandler)]
+
+
+def test_configured_once_per_process(tmp_path, monkeypatch):
+    """Verbose installers share one handler, so each record is written once."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    installers = [Installer(verbose=True) for _ in range(3)]
+    assert len(_handlers()) == 1
+
+    logging.getLogger("openwebui_installer.installer").info("hello once")
+    logconfig.shutdown()
+    with open(installers[0].log_file) as f:
+        assert f.read().count("hello once") == 1
+    assert _handlers() == []
+
+
+def test_file_is_written_off_the_callers_thread(tmp_path, mocker):
+    writers = []
+    emit = logging.handlers.RotatingFileHandler.emit
+    mocker.patch.object(
+        logging.handlers.RotatingFileHandler,
+        "emit",
+        lambda self, record: writers.append(threading.current_thread()) or emit(self, record),
+    )
+    logconfig.configure(str(tmp_path / "app.log"), json_format=False)
+    logging.getLogger("openwebui_installer.test").info("queued")
+    logconfig.shutdown()
+
+    assert writers and threading.current_thread() not in writers
+
+
+def test_json_records_carry_phase_and_duration(tmp_path):
+    path = tmp_path / "app.log"
+    logconfig.configure(str(path), json_format=True)
+    logging.getLogger("openwebui_installer.installer").info(
+        "Phase %s done", "pull_image", extra={"phase": "pull_image", "duration": 1.5}
+    )
+    logconfig.shutdown()
+
+    record = json.loads(path.read_text().splitlines()[-1])
+    assert record["message"] == "Phase pull_image done"
+    assert record["level"] == "INFO"
+    assert record["phase"] == "pull_image"
+    assert record["duration"] == 1.5
+
+
+def test_rotated_files_are_compressed(tmp_path, monkeypatch):
+    monkeypatch.setattr(logconfig, "MAX_BYTES", 200)
+    path = tmp_path / "app.log"
+    logconfig.configure(str(path), json_format=False)
+    log = logging.getLogger("openwebui_installer.test")
+    for i in range(20):
+        log.info("message %d", i)
+    logconfig.shutdown()
+
+    assert (tmp_path / "app.log.1.gz").exists()
+    assert not (tmp_path / "app.log.1").exists()
+    assert len(logtail.backups(str(path))) == logconfig.BACKUP_COUNT
+    # The backups read back in order, right up to the current file
+    numbers = [int(line.rsplit(" ", 1)[1]) for line in logtail.tail(str(path), 100)]
+    assert numbers == list(range(numbers[0], 20))
@@ -0,0 +1,122 @@
+"""
+Tests for container log filtering
+"""
+
+import io
+import time
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from openwebui_installer.console import LineWriter
+from openwebui_installer.installer import Installer
+from openwebui_installer.logfilter import LineFilter, parse_time, split_lines
+
+
+def test_parse_time():
+    assert parse_time("10m", now=10000) == 9400
+    assert parse_time("1.5h", now=10000) == 4600
+    assert parse_time("1700000000") == 1700000000
+    assert parse_time("2024-05-01T12:00:00Z") == datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+    assert parse_time("2024-05-01") == datetime(2024, 5, 1, tzinfo=timezone.utc)
+    with pytest.raises(ValueError):
+        parse_time("yesterday")
+
+
+def test_level_filter_keeps_continuation_lines():
+    line_filter = LineFilter(level="warning")
+    lines = [
+        "INFO:     started",
+        "2024-05-01 | ERROR | open_webui.main - failed",
+        "Traceback (most recent call last):",
+        '  File "main.py", line 1',
+        "INFO:     GET /health 200",
+        "WARN something odd",
+    ]
+    assert list(line_filter.apply(lines)) == lines[1:4] + lines[5:]
+
+
+def test_regex_filter():
+    line_filter = LineFilter("time(d )?out", ignore_case=True)
+    assert list(line_filter.apply(["Timed out", "TIMEOUT", "ok"])) == ["Timed out", "TIMEOUT"]
+    assert not LineFilter().active
+    with pytest.raises(ValueError):
+        LineFilter(level="loud")
+
+
+def test_split_lines_reassembles_chunks():
+    assert list(split_lines([b"one\r\ntw", b"o\nthr", b"ee"])) == ["one", "two", "three"]
+    assert list(split_lines([b"long", b" line", b" here\n", b"\n"])) == ["long line here", ""]
+
+
+def test_split_lines_decodes_across_chunks():
+    """A character split between chunks is decoded whole; invalid bytes don't raise."""
+    data = "caf\u00e9 \u2713\n".encode()
+    assert list(split_lines([data[:4], data[4:8], data[8:]])) == ["caf\u00e9 \u2713"]
+    assert list(split_lines([b"bad \xff byte\n"])) == ["bad \ufffd byte"]
+
+
+class _Stream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+def test_line_writer_batches_by_size():
+    stream = _Stream()
+    with LineWriter(stream=stream, max_bytes=10, interval=60) as out:
+        for line in ("aaaa", "bbbb", "cccc"):
+            out.write(line)
+        assert stream.getvalue() == "aaaa\nbbbb\n"
+    assert stream.getvalue() == "aaaa\nbbbb\ncccc\n"
+    assert stream.writes == 2
+
+
+def test_line_writer_flushes_after_interval():
+    """A lone line is written shortly after it arrives, without waiting for more."""
+    stream = _Stream()
+    console = MagicMock()
+    with LineWriter(console, stream=stream, interval=0.01) as out:
+        out.write("one")
+        out.write("two")
+        deadline = time.monotonic() + 5
+        while not stream.getvalue() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert stream.getvalue() == "one\ntwo\n"
+    # Not a terminal, so the console is bypassed
+    console.print.assert_not_called()
+
+
+def test_line_writer_uses_console_on_terminal():
+    stream = _Stream()
+    stream.isatty = lambda: True
+    console = MagicMock()
+    with LineWriter(console, stream=stream, interval=60) as out:
+        out.write("[red]x[/red]")
+        out.write("y")
+    console.print.assert_called_once_with("[red]x[/red]\ny", markup=False, highlight=False)
+
+
+def test_show_logs_passes_window_to_runtime(mocker, tmp_path, capsys):
+    """The time window and tail go to the runtime; the regex is applied to the stream."""
+    mocker.patch("docker.from_env", return_value=MagicMock())
+    installer = Installer()
+    container = installer.docker_client.containers.get.return_value
+    container.logs.return_value = iter([b"INFO ok\nERROR db timeout\n", b"ERROR disk full\n"])
+
+    matched = installer.show_logs(tail="all", since="1700000000", until="1700003600", pattern="timeout")
+
+    container.logs.assert_called_once_with(
+        stream=True, follow=False, tail="all", since=1700000000, until=1700003600
+    )
+    assert matched == 1
+    assert capsys.readouterr().out == "ERROR db timeout\n"
+
+    container.logs.return_value = iter([b"ERROR a\nERROR b\n"])
+    assert installer.show_logs(level="error", count=True) == 2
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,88 @@
+"""
+Tests for the log tail reader
+"""
+
+import gzip
+import os
+import threading
+import time
+
+import pytest
+
+from openwebui_installer import logtail
+
+
+def _write(path, lines, newline_at_end=True):
+    text = "\n".join(lines) + ("\n" if newline_at_end else "")
+    path.write_text(text)
+
+
+@pytest.mark.parametrize("newline_at_end", [True, False])
+def test_tail_file_reads_only_the_end(tmp_path, mocker, newline_at_end):
+    path = tmp_path / "big.log"
+    _write(path, [f"line {i}" for i in range(100000)], newline_at_end)
+    read = mocker.spy(logtail, "_decode")
+
+    assert logtail.tail_file(str(path), 3, block_size=4096) == ["line 99997", "line 99998", "line 99999"]
+    assert read.call_count == 3
+
+
+def test_tail_file_short_and_empty(tmp_path):
+    path = tmp_path / "short.log"
+    _write(path, ["only"])
+    assert logtail.tail_file(str(path), 10) == ["only"]
+    path.write_text("")
+    assert logtail.tail_file(str(path), 10) == []
+
+
+def test_tail_spans_rotated_backups(tmp_path):
+    path = tmp_path / "app.log"
+    _write(path, ["c1", "c2"])
+    _write(tmp_path / "app.log.1", ["b1", "b2"])
+    _write(tmp_path / "app.log.2", ["a1", "a2"])
+    _write(tmp_path / "app.log.4", ["orphan"])
+
+    assert logtail.backups(str(path)) == [f"{path}.1", f"{path}.2"]
+    assert logtail.tail(str(path), 3) == ["b2", "c1", "c2"]
+    assert logtail.tail(str(path), 50) == ["a1", "a2", "b1", "b2", "c1", "c2"]
+
+
+def test_tail_reads_compressed_backups(tmp_path):
+    path = tmp_path / "app.log"
+    _write(path, ["c1"])
+    with gzip.open(f"{path}.1.gz", "wt") as f:
+        f.write("b1\nb2\n")
+    _write(tmp_path / "app.log.2", ["a1"])
+
+    assert logtail.backups(str(path)) == [f"{path}.1.gz", f"{path}.2"]
+    assert logtail.tail(str(path), 2) == ["b2", "c1"]
+    assert logtail.tail(str(path), 10) == ["a1", "b1", "b2", "c1"]
+    assert logtail.tail_gzip(f"{path}.1.gz", 1) == ["b2"]
+
+
+def test_follow_handles_rotation(tmp_path):
+    path = tmp_path / "app.log"
+    _write(path, ["old"])
+    stop = threading.Event()
+    seen = []
+
+    def reader():
+        for line in logtail.follow(str(path), stop, interval=0.01):
+            seen.append(line)
+            if line == "after":
+                stop.set()
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    time.sleep(0.05)
+    with open(path, "a") as f:
+        f.write("new 1\nnew")
+        f.flush()
+        time.sleep(0.05)
+        f.write(" 2\nlast")
+    os.rename(path, f"{path}.1")
+    _write(path, ["after"])
+    thread.join(5)
+
+    assert not thread.is_alive()
+    assert seen == ["new 1", "new 2", "last", "after"]
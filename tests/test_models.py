@@ -0,0 +1,108 @@
+"""
+Tests for multi-model pulls
+"""
+
+import json
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from openwebui_installer.installer import Installer, InstallerError
+from openwebui_installer.models import load_manifest, normalize_model, pull_models, unique_models
+
+
+def test_normalize_and_dedupe():
+    assert normalize_model("llama2") == "llama2:latest"
+    assert normalize_model("registry.local:5000/team/llama2") == "registry.local:5000/team/llama2:latest"
+    assert normalize_model("llama2:7b") == "llama2:7b"
+    assert unique_models(["llama2", "llama2:latest", " ", "mistral"]) == ["llama2", "mistral"]
+
+
+@pytest.mark.parametrize("content", [
+    '["llama2", "mistral"]',
+    '{"models": ["llama2", "mistral"]}',
+    "llama2  # default\n\n# code\nmistral\n",
+])
+def test_load_manifest_formats(tmp_path, content):
+    path = tmp_path / "models"
+    path.write_text(content)
+    assert load_manifest(str(path)) == ["llama2", "mistral"]
+
+
+def test_load_manifest_rejects_other_json(tmp_path):
+    path = tmp_path / "models.json"
+    path.write_text('{"models": [1, 2]}')
+    with pytest.raises(ValueError):
+        load_manifest(str(path))
+
+
+def test_pull_models_bounds_concurrency_and_reports_each():
+    """At most ``concurrency`` pulls overlap; present models are skipped; failures don't stop others."""
+    lock = threading.Lock()
+    active = peak = 0
+
+    def pull(name):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        if name == "bad":
+            raise InstallerError("model not found")
+
+    names = ["a", "b", "c", "d", "bad", "llama2"]
+    results = pull_models(names, pull, {"llama2:latest"}, concurrency=2)
+
+    assert [r.name for r in results] == names
+    assert [r.status for r in results] == ["pulled"] * 4 + ["failed", "present"]
+    assert peak == 2
+    assert all(r.duration >= 0.05 for r in results[:5])
+    assert str(results[4].error) == "model not found"
+
+
+def test_pull_models_stops_starting_after_cancel():
+    cancel = threading.Event()
+
+    def pull(name):
+        cancel.set()
+
+    results = pull_models(["a", "b", "c"], pull, set(), concurrency=1, cancel_event=cancel)
+    assert [r.status for r in results] == ["pulled", "cancelled", "cancelled"]
+
+
+def test_installer_lists_models_once(mocker):
+    """One /api/tags request decides which of many models need pulling."""
+    mocker.patch("docker.from_env", return_value=MagicMock())
+    installer = Installer()
+    tags = mocker.patch("requests.Session.get", return_value=MagicMock(
+        status_code=200, json=lambda: {"models": [{"name": "llama2:latest"}]}
+    ))
+    response = MagicMock(status_code=200)
+    response.iter_lines.return_value = [json.dumps({"status": "success"}).encode()]
+    post = mocker.patch("requests.Session.post", return_value=response)
+
+    results = installer.pull_models(["llama2", "mistral", "phi3", "gemma"], concurrency=3)
+
+    assert tags.call_count == 1
+    assert sorted(c.kwargs["json"]["model"] for c in post.call_args_list) == ["gemma", "mistral", "phi3"]
+    assert [r.status for r in results] == ["present", "pulled", "pulled", "pulled"]
+    assert installer.model_results == results
+
+
+def test_install_phase_fails_when_a_model_fails(mocker):
+    mocker.patch("docker.from_env", return_value=MagicMock())
+    installer = Installer()
+    mocker.patch.object(installer, "_available_models", return_value=set())
+    mocker.patch.object(
+        installer, "_download_model",
+        side_effect=lambda name: (_ for _ in ()).throw(InstallerError(f"Failed to pull Ollama model {name}: x"))
+        if name == "bad" else None,
+    )
+
+    with pytest.raises(InstallerError, match="Failed to pull Ollama model bad"):
+        installer._pull_ollama_models(["good", "bad"])
+    assert [r.status for r in installer.model_results] == ["pulled", "failed"]
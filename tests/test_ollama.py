@@ -0,0 +1,102 @@
+"""
+Tests for the Ollama API client
+"""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from openwebui_installer.ollama import OllamaClient, OllamaError, resolve_url
+
+
+@pytest.mark.parametrize("env, expected", [
+    ({}, "http://localhost:11434"),
+    ({"OLLAMA_HOST": "0.0.0.0"}, "http://localhost:11434"),
+    ({"OLLAMA_HOST": "https://ollama.lan:8443/"}, "https://ollama.lan:8443"),
+    ({"OLLAMA_BASE_URL": "http://host.docker.internal:11434"}, "http://localhost:11434"),
+    ({"OLLAMA_HOST": "[::1]:9999", "OLLAMA_BASE_URL": "http://other:1"}, "http://[::1]:9999"),
+])
+def test_resolve_url(monkeypatch, env, expected):
+    monkeypatch.delenv("OLLAMA_HOST", raising=False)
+    monkeypatch.delenv("OLLAMA_BASE_URL", raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    assert resolve_url() == expected
+
+
+def _response(status=200, body=None, lines=None):
+    response = MagicMock(status_code=status)
+    response.json.return_value = body or {}
+    response.iter_lines.return_value = [json.dumps(line).encode() for line in lines or []]
+    return response
+
+
+@pytest.fixture
+def session():
+    return MagicMock()
+
+
+@pytest.fixture
+def client(session):
+    return OllamaClient("http://ollama:11434", session=session)
+
+
+def test_model_listing_is_cached(client, session):
+    """Repeated checks within the TTL share one request; max_age=0 forces a refresh."""
+    session.get.return_value = _response(body={"models": [{"name": "llama2:latest"}]})
+
+    assert client.model_names() == {"llama2:latest"}
+    assert client.list_models() == [{"name": "llama2:latest"}]
+    assert session.get.call_count == 1
+    session.get.assert_called_with("http://ollama:11434/api/tags", timeout=10)
+
+    client.list_models(max_age=0)
+    assert session.get.call_count == 2
+
+
+def test_pull_streams_messages_and_invalidates_cache(client, session):
+    session.get.return_value = _response(body={"models": []})
+    client.list_models()
+    session.post.return_value = _response(lines=[{"status": "pulling manifest"}, {"status": "success"}])
+
+    with client.pull("llama2", idle_timeout=30) as stream:
+        messages = list(stream)
+
+    assert messages[-1] == {"status": "success"}
+    assert session.post.call_args.kwargs["stream"] is True
+    assert session.post.call_args.kwargs["timeout"] == (10, 30)
+    session.post.return_value.close.assert_called()
+    client.list_models()
+    assert session.get.call_count == 2
+
+
+def test_stream_error_message_raises(client, session):
+    session.post.return_value = _response(lines=[{"response": "Hel"}, {"error": "model crashed"}])
+    stream = client.generate("llama2", "hi", temperature=0)
+    assert session.post.call_args.kwargs["json"]["options"] == {"temperature": 0}
+    with pytest.raises(OllamaError, match="model crashed"):
+        list(stream)
+
+
+def test_http_error_includes_ollama_detail(client, session):
+    session.post.return_value = _response(404, body={"error": "model 'nope' not found"})
+    with pytest.raises(OllamaError, match="not found") as exc:
+        client.generate("nope", "hi")
+    assert exc.value.status == 404
+    session.post.return_value.close.assert_called_once()
+
+
+def test_embed(client, session):
+    session.post.return_value = _response(body={"embeddings": [[0.1, 0.2], [0.3, 0.4]]})
+    assert client.embed("nomic-embed-text", ["a", "b"]) == [[0.1, 0.2], [0.3, 0.4]]
+    assert session.post.call_args.kwargs["json"] == {"model": "nomic-embed-text", "input": ["a", "b"]}
+
+
+def test_session_is_pooled_and_closed():
+    client = OllamaClient()
+    session = client.session
+    assert client.session is session
+    assert session.get_adapter("http://localhost:11434")._pool_maxsize == client.pool_size
+    client.close()
+    assert client._session is None
@@ -0,0 +1,175 @@
+"""
+Tests for the install pipeline
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from openwebui_installer.installer import Installer, InstallerError
+from openwebui_installer.pipeline import Phase, Pipeline
+
+
+def _recorder(log, name, delay=0.0, error=None):
+    def func(*args):
+        log.append(("start", name, time.monotonic()))
+        time.sleep(delay)
+        log.append(("end", name, time.monotonic()))
+        if error:
+            raise error
+
+    return func
+
+
+def _span(log, name):
+    start = next(t for kind, n, t in log if kind == "start" and n == name)
+    end = next(t for kind, n, t in log if kind == "end" and n == name)
+    return start, end
+
+
+def test_independent_phases_overlap():
+    """Phases without dependencies between them run concurrently."""
+    log = []
+    report = Pipeline([
+        Phase("a", _recorder(log, "a", 0.3)),
+        Phase("b", _recorder(log, "b", 0.3)),
+        Phase("c", _recorder(log, "c"), requires=("a", "b")),
+    ]).run()
+
+    a_start, a_end = _span(log, "a")
+    b_start, b_end = _span(log, "b")
+    c_start, _ = _span(log, "c")
+    assert b_start < a_end and a_start < b_end
+    assert c_start >= max(a_end, b_end)
+    assert report.duration < 0.55
+    assert set(report.timings) == {"a", "b", "c"}
+    assert report.timings["a"] >= 0.3
+
+
+def test_failure_cancels_dependents():
+    """A failing phase stops later phases and re-raises its error."""
+    log = []
+    pipeline = Pipeline([
+        Phase("slow", _recorder(log, "slow", 0.2)),
+        Phase("bad", _recorder(log, "bad", error=RuntimeError("boom"))),
+        Phase("after", _recorder(log, "after"), requires=("slow", "bad")),
+    ])
+
+    with pytest.raises(RuntimeError, match="boom"):
+        pipeline.run()
+
+    statuses = {p.name: p.status for p in pipeline.report.phases}
+    assert statuses == {"slow": "done", "bad": "failed", "after": "cancelled"}
+    assert pipeline.cancel_event.is_set()
+    # The in-flight phase was allowed to finish
+    assert ("end", "slow") in [(k, n) for k, n, _ in log]
+
+
+def test_first_declared_failure_wins():
+    """With several failures the earliest declared phase's error is raised."""
+    pipeline = Pipeline([
+        Phase("first", _recorder([], "first", 0.1, error=ValueError("first"))),
+        Phase("second", _recorder([], "second", error=ValueError("second"))),
+    ])
+    with pytest.raises(ValueError, match="first"):
+        pipeline.run()
+
+
+def test_unknown_dependency_rejected():
+    """Dependencies must name declared phases."""
+    with pytest.raises(ValueError, match="unknown"):
+        Pipeline([Phase("a", lambda: None, requires=("missing",))])
+
+
+def test_install_pulls_image_and_model_concurrently(mocker, tmp_path):
+    """The image and model pulls overlap and the container starts last."""
+    mocker.patch("docker.from_env", return_value=MagicMock())
+    installer = Installer()
+    installer.config_dir = str(tmp_path)
+    mocker.patch.object(installer, "_check_system_requirements")
+    mocker.patch.object(installer, "get_status", return_value={"installed": False})
+
+    log = []
+    mocker.patch.object(installer, "_pull_webui_image", side_effect=_recorder(log, "image", 0.3))
+    mocker.patch.object(installer, "_pull_ollama_models", side_effect=_recorder(log, "model", 0.3))
+    mocker.patch.object(installer, "_stop_existing_container")
+    mocker.patch.object(installer, "_start_container", side_effect=_recorder(log, "start"))
+
+    report = installer.install(model="m", port=1234)
+
+    image, model, start = _span(log, "image"), _span(log, "model"), _span(log, "start")
+    assert model[0] < image[1] and image[0] < model[1]
+    assert start[0] >= max(image[1], model[1])
+    assert [p.name for p in report.phases] == [
+        "pull_image", "pull_model", "launch_script", "write_config", "stop_existing", "start_container",
+    ]
+    assert (tmp_path / "config.json").exists()
+
+
+def test_install_failure_keeps_running_container(mocker, tmp_path):
+    """A failed pull never stops the existing container."""
+    mocker.patch("docker.from_env", return_value=MagicMock())
+    installer = Installer()
+    installer.config_dir = str(tmp_path)
+    mocker.patch.object(installer, "_check_system_requirements")
+    mocker.patch.object(installer, "get_status", return_value={"installed": False})
+    mocker.patch.object(installer, "_pull_webui_image")
+    mocker.patch.object(installer, "_pull_ollama_models", side_effect=InstallerError("model failed"))
+    stop = mocker.patch.object(installer, "_stop_existing_container")
+
+    with pytest.raises(InstallerError, match="model failed"):
+        installer.install(model="m", port=1234)
+
+    stop.assert_not_called()
+    assert installer.install_report.timings.keys() == {"pull_image", "pull_model", "launch_script"}
+
+
+def test_dependency_cycle_rejected():
+    """Circular requirements would never run, so they are refused up front."""
+    with pytest.raises(ValueError, match="circular"):
+        Pipeline([
+            Phase("a", lambda: None, requires=("b",)),
+            Phase("b", lambda: None, requires=("a",)),
+        ])
+
+
+def test_failed_pull_terminates_model_pull(mocker, tmp_path):
+    """An image pull failure aborts the in-flight model pull instead of waiting for it."""
+    mocker.patch("docker.from_env", return_value=MagicMock())
+    installer = Installer()
+    installer.config_dir = str(tmp_path)
+    mocker.patch.object(installer, "_check_system_requirements")
+    mocker.patch.object(installer, "get_status", return_value={"installed": False})
+    mocker.patch("requests.Session.get", return_value=MagicMock(status_code=200, json=lambda: {"models": []}))
+
+    response = MagicMock(status_code=200)
+    streaming = threading.Event()
+    closed = threading.Event()
+    response.close.side_effect = closed.set
+
+    def fail_image(image):
+        streaming.wait(5)
+        raise InstallerError("image failed")
+
+    mocker.patch.object(installer, "_pull_webui_image", side_effect=fail_image)
+
+    def iter_lines():
+        yield b'{"status": "pulling manifest"}'
+        streaming.set()
+        # Block like a slow download until the response is closed
+        closed.wait(10)
+        raise requests.exceptions.ConnectionError("closed")
+
+    response.iter_lines.side_effect = iter_lines
+    mocker.patch("requests.Session.post", return_value=response)
+
+    start = time.monotonic()
+    with pytest.raises(InstallerError, match="image failed"):
+        installer.install(model="m", port=1234)
+
+    assert time.monotonic() - start < 3
+    assert closed.is_set()
+    assert not installer._cancel_event.is_set()
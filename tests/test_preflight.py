@@ -0,0 +1,121 @@
+"""
+Tests for the preflight engine
+"""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from openwebui_installer.installer import Installer, InstallerError, SystemRequirementsError
+from openwebui_installer.preflight import Check, CheckFailed, run_checks
+
+
+def _sleeper(seconds, fail=False):
+    def check():
+        time.sleep(seconds)
+        if fail:
+            raise CheckFailed("failed", slept=seconds)
+        return {"slept": seconds}
+
+    return check
+
+
+def test_checks_run_concurrently():
+    """Wall time is bounded by the slowest check, not the sum."""
+    checks = [Check(f"c{i}", _sleeper(0.3)) for i in range(4)]
+    start = time.monotonic()
+    report = run_checks(checks)
+    assert time.monotonic() - start < 1.0
+    assert report.ok
+    assert [r.detail["slept"] for r in report.results] == [0.3] * 4
+
+
+def test_all_failures_are_reported():
+    """Every failing check is reported, in declaration order."""
+    report = run_checks([
+        Check("a", _sleeper(0.05, fail=True)),
+        Check("b", _sleeper(0)),
+        Check("c", _sleeper(0, fail=True)),
+        Check("d", _sleeper(0, fail=True), required=False),
+    ])
+    assert not report.ok
+    assert [r.name for r in report.failures] == ["a", "c"]
+    assert report.get("a").detail == {"slept": 0.05}
+    assert report.to_dict()["checks"][1]["ok"] is True
+
+
+def test_check_deadline():
+    """A hung probe is reported as timed out once its deadline passes."""
+    start = time.monotonic()
+    report = run_checks([
+        Check("hung", _sleeper(5), timeout=0.2, description="Hung probe"),
+        Check("fast", _sleeper(0)),
+    ])
+    assert time.monotonic() - start < 1.0
+    hung = report.get("hung")
+    assert hung.timed_out
+    assert "Hung probe did not respond within 0.2s" == hung.message
+    assert report.get("fast").ok
+
+
+def test_unexpected_exception_becomes_failure():
+    """Errors other than CheckFailed are captured rather than raised."""
+    def boom():
+        raise RuntimeError("boom")
+
+    report = run_checks([Check("boom", boom)])
+    assert report.failures[0].message == "boom"
+
+
+@pytest.fixture
+def installer(mocker):
+    """Installer with a mocked runtime client."""
+    mocker.patch("docker.from_env", return_value=MagicMock())
+    return Installer()
+
+
+def test_installer_preflight_collects_docker_and_ollama(installer, mocker):
+    """Docker and Ollama failures are both reported in one pass."""
+    mocker.patch("platform.system", return_value="Linux")
+    installer.docker_client.ping.side_effect = Exception("down")
+    mocker.patch.object(installer, "_podman_available", return_value=True)
+    mocker.patch("requests.Session.get", side_effect=requests.exceptions.ConnectionError("refused"))
+
+    report = installer.preflight()
+
+    assert [r.name for r in report.failures] == ["runtime", "ollama"]
+    assert "Podman detected; use --runtime podman" in report.get("runtime").message
+    with pytest.raises(SystemRequirementsError, match="Podman detected"):
+        installer._check_system_requirements()
+
+
+def test_system_requirements_checked_once(installer, mocker):
+    """A passing check is not repeated for the same installer."""
+    mocker.patch("platform.system", return_value="Darwin")
+    get = mocker.patch("requests.Session.get")
+    get.return_value.status_code = 200
+
+    installer._check_system_requirements()
+    installer._check_system_requirements()
+
+    get.assert_called_once()
+    installer.docker_client.ping.assert_called_once()
+
+
+def test_each_install_checks_requirements_again(installer, mocker):
+    """A long-lived installer does not reuse a check from an earlier install."""
+    mocker.patch("platform.system", return_value="Darwin")
+    get = mocker.patch("requests.Session.get")
+    get.return_value.status_code = 200
+    mocker.patch.object(installer, "get_status", side_effect=InstallerError("stop here"))
+
+    installer._check_system_requirements()
+    with pytest.raises(InstallerError):
+        installer.install()
+    installer.docker_client.ping.side_effect = Exception("down")
+    with pytest.raises(InstallerError, match="Docker service is not running"):
+        installer.install()
+
+    assert installer.docker_client.ping.call_count == 2
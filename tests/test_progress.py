@@ -0,0 +1,211 @@
+"""
+Tests for pull progress tracking
+"""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from openwebui_installer.installer import Installer, InstallerError
+from openwebui_installer.progress import TransferTracker, format_bytes, format_duration
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _tracker(**kwargs):
+    clock = FakeClock()
+    events = []
+    tracker = TransferTracker("image", "repo:tag", events.append, min_interval=0, clock=clock, **kwargs)
+    return tracker, clock, events
+
+
+def test_aggregates_layers_with_rate_and_eta():
+    """Bytes are summed across layers and throughput drives the ETA."""
+    tracker, clock, events = _tracker()
+    tracker.update("a", downloaded=0, total=1000)
+    tracker.update("b", downloaded=0, total=3000)
+    clock.now += 2
+    tracker.update("a", downloaded=1000)
+    clock.now += 2
+    tracker.update("b", downloaded=1000)
+
+    event = events[-1]
+    assert (event.completed, event.total, event.percent) == (2000, 4000, 50)
+    assert event.layers_total == 2
+    assert event.rate == pytest.approx(500)
+    assert event.eta == pytest.approx(4)
+    assert not event.stalled
+
+
+def test_stall_is_reported_after_threshold():
+    """A transfer with no byte movement is flagged, a slow one is not."""
+    tracker, clock, _ = _tracker(stall_after=30)
+    tracker.update("a", downloaded=10, total=1000)
+    clock.now += 20
+    tracker.update("a", downloaded=11)
+    clock.now += 29
+    assert not tracker.publish(force=True).stalled
+    clock.now += 1
+    event = tracker.publish(force=True)
+    assert event.stalled and event.stalled_for == pytest.approx(30)
+    assert "stalled for 30s" in event.describe()
+
+
+def test_docker_stream_messages():
+    """Docker pull messages map onto layer progress and completion."""
+    tracker, _, events = _tracker()
+    for message in [
+        {"status": "Pulling from open-webui/open-webui", "id": "main"},
+        {"status": "Already exists", "id": "l1"},
+        {"status": "Downloading", "id": "l2", "progressDetail": {"current": 50, "total": 200}},
+        {"status": "Download complete", "id": "l2"},
+        {"status": "Extracting", "id": "l2", "progressDetail": {"current": 10, "total": 200}},
+    ]:
+        tracker.update_from_docker(message)
+    tracker.finish()
+
+    assert events[-1].status == "complete"
+    assert events[-1].completed == 200
+    assert (events[-1].layers_done, events[-1].layers_total) == (2, 2)
+
+
+def test_formatting():
+    assert format_bytes(512) == "512 B"
+    assert format_bytes(1536) == "1.5 KB"
+    assert format_duration(65) == "1m05s"
+    assert format_duration(3720) == "1h02m"
+
+
+@pytest.fixture
+def installer(mocker):
+    mocker.patch("docker.from_env", return_value=MagicMock())
+    return Installer()
+
+
+def test_installer_streams_image_pull(installer):
+    """The image pull reports per-layer progress to the registered callback."""
+    installer.docker_client.api.pull.return_value = iter([
+        {"status": "Downloading", "id": "l1", "progressDetail": {"current": 5, "total": 10}},
+        {"status": "Pull complete", "id": "l1"},
+    ])
+    events = []
+    installer.progress_callback = events.append
+
+    installer._pull_webui_image("ghcr.io/open-webui/open-webui:main")
+
+    assert events[-1].status == "complete"
+    assert events[-1].percent == 100
+
+
+def test_installer_stream_error(installer):
+    """Errors reported inside the pull stream fail the pull."""
+    installer.docker_client.api.pull.return_value = iter([{"error": "manifest unknown"}])
+    with pytest.raises(InstallerError, match="manifest unknown"):
+        installer._pull_webui_image("example/missing:tag")
+
+
+def _pull_response(lines):
+    response = MagicMock(status_code=200)
+    response.iter_lines.return_value = [json.dumps(line).encode() for line in lines]
+    return response
+
+
+def test_installer_streams_model_pull(installer, mocker):
+    """Model pulls report per-blob progress from Ollama's pull stream."""
+    mocker.patch("requests.Session.get", return_value=MagicMock(status_code=200, json=lambda: {"models": []}))
+    post = mocker.patch("requests.Session.post", return_value=_pull_response([
+        {"status": "pulling manifest"},
+        {"status": "pulling aa", "digest": "sha256:aa", "total": 100, "completed": 40},
+        {"status": "pulling bb", "digest": "sha256:bb", "total": 50, "completed": 50},
+        {"status": "pulling aa", "digest": "sha256:aa", "total": 100, "completed": 100},
+        {"status": "verifying sha256 digest"},
+        {"status": "success"},
+    ]))
+    events = []
+    installer.progress_callback = events.append
+
+    installer._download_model("llama3")
+
+    assert post.call_args.kwargs["stream"] is True
+    # An idle (read) timeout rather than a limit on the whole download
+    assert post.call_args.kwargs["timeout"][1] > 0
+    assert any(e.completed == 90 and e.total == 150 for e in events)
+    assert events[-1].status == "complete"
+    assert (events[-1].layers_done, events[-1].layers_total) == (2, 2)
+
+
+def test_installer_resumes_interrupted_model_pull(installer, mocker):
+    """A stalled or dropped pull is retried; Ollama resumes from the blobs it has."""
+    import requests
+
+    mocker.patch("requests.Session.get", return_value=MagicMock(status_code=200, json=lambda: {"models": []}))
+    stalled = MagicMock(status_code=200)
+
+    def stall():
+        yield json.dumps({"digest": "sha256:aa", "total": 100, "completed": 30}).encode()
+        raise requests.exceptions.ConnectionError("Read timed out")
+
+    stalled.iter_lines.side_effect = stall
+    resumed = _pull_response([
+        {"digest": "sha256:aa", "total": 100, "completed": 100},
+        {"status": "success"},
+    ])
+    post = mocker.patch("requests.Session.post", side_effect=[stalled, resumed])
+    mocker.patch("openwebui_installer.installer.Backoff.next", return_value=0)
+    events = []
+    installer.progress_callback = events.append
+
+    installer._download_model("llama3")
+
+    assert post.call_count == 2
+    stalled.close.assert_called()
+    assert events[-1].status == "complete"
+    assert events[-1].completed == 100
+
+
+def test_model_pull_keeps_resuming_while_it_progresses(installer, mocker):
+    """Only drops without new bytes count towards the attempt limit."""
+    import requests
+
+    from openwebui_installer.installer import MODEL_PULL_ATTEMPTS
+
+    def dropping(completed):
+        response = MagicMock(status_code=200)
+
+        def lines():
+            yield json.dumps({"digest": "sha256:aa", "total": 1000, "completed": completed}).encode()
+            raise requests.exceptions.ConnectionError("connection reset")
+
+        response.iter_lines.side_effect = lines
+        return response
+
+    drops = [dropping(100 * i) for i in range(1, MODEL_PULL_ATTEMPTS + 3)]
+    finished = _pull_response([{"digest": "sha256:aa", "total": 1000, "completed": 1000}, {"status": "success"}])
+    post = mocker.patch("requests.Session.post", side_effect=drops + [finished])
+    mocker.patch("openwebui_installer.installer.Backoff.next", return_value=0)
+
+    installer._download_model("llama3")
+    assert post.call_count == MODEL_PULL_ATTEMPTS + 3
+
+    # Without progress the limit still applies
+    post = mocker.patch("requests.Session.post", side_effect=[dropping(0) for _ in range(MODEL_PULL_ATTEMPTS)])
+    with pytest.raises(InstallerError, match="connection reset"):
+        installer._download_model("llama3")
+    assert post.call_count == MODEL_PULL_ATTEMPTS
+
+
+def test_installer_model_pull_error(installer, mocker):
+    """Errors reported inside the pull stream fail without retrying."""
+    mocker.patch("requests.Session.get", return_value=MagicMock(status_code=200, json=lambda: {"models": []}))
+    post = mocker.patch("requests.Session.post", return_value=_pull_response([{"error": "model not found"}]))
+
+    with pytest.raises(InstallerError, match="model not found"):
+        installer._download_model("missing")
+    assert post.call_count == 1
@@ -0,0 +1,146 @@
+"""
+Tests for readiness probing
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from openwebui_installer.installer import Installer, InstallerError
+from openwebui_installer.readiness import (
+    PROGRESS,
+    READY,
+    WAITING,
+    Backoff,
+    ProbeFailed,
+    container_probe,
+    wait_until_ready,
+)
+
+
+def _sequence(*outcomes):
+    it = iter(outcomes)
+    return lambda: next(it)
+
+
+def test_backoff_grows_to_maximum():
+    backoff = Backoff(initial=0.1, factor=2, maximum=0.5, jitter=0)
+    assert [backoff.next() for _ in range(5)] == [0.1, 0.2, 0.4, 0.5, 0.5]
+    backoff.reset()
+    assert backoff.next() == 0.1
+
+
+def test_ready_after_waiting_reports_latency_and_attempts():
+    backoff = Backoff(initial=0.01, jitter=0)
+    result = wait_until_ready(_sequence(WAITING, False, PROGRESS, READY), timeout=5, backoff=backoff)
+    assert result.ready and result.attempts == 4
+    assert 0 < result.elapsed < 1
+
+
+def test_first_progress_resets_backoff():
+    """Signs of life drop the polling interval back to its initial value."""
+    backoff = Backoff(initial=0.01, factor=10, maximum=10, jitter=0)
+    start = time.monotonic()
+    result = wait_until_ready(_sequence(WAITING, WAITING, PROGRESS, READY), timeout=5, backoff=backoff)
+    # Without the reset the last sleep would have been 1s
+    assert result.ready and time.monotonic() - start < 0.5
+
+
+def test_deadline_bounds_the_wait():
+    start = time.monotonic()
+    result = wait_until_ready(lambda: WAITING, timeout=0.3, backoff=Backoff(initial=1, jitter=0))
+    assert not result.ready
+    assert "not ready after 0.3s" == result.reason
+    assert time.monotonic() - start < 0.6
+
+
+def test_deadline_counts_from_start_request():
+    """started_at makes the deadline and latency cover the start request too."""
+    result = wait_until_ready(lambda: READY, timeout=5, started_at=time.monotonic() - 2)
+    assert result.elapsed >= 2
+
+
+def test_probe_failure_stops_early():
+    def probe():
+        raise ProbeFailed("container exited with code 1")
+
+    result = wait_until_ready(probe, timeout=60)
+    assert not result.ready and result.attempts == 1
+    assert result.reason == "container exited with code 1"
+
+
+def test_cancel_wakes_waiter():
+    cancel = threading.Event()
+    threading.Timer(0.1, cancel.set).start()
+    start = time.monotonic()
+    result = wait_until_ready(lambda: WAITING, timeout=60, backoff=Backoff(initial=30), cancel_event=cancel)
+    assert result.reason == "cancelled"
+    assert time.monotonic() - start < 1
+
+
+def _container(status="running", health=None):
+    state = {"Status": status, "ExitCode": 137}
+    if health:
+        state["Health"] = {"Status": health}
+    return MagicMock(attrs={"State": state})
+
+
+def test_container_probe_states(mocker):
+    get = mocker.patch("requests.get", return_value=MagicMock(status_code=200))
+    assert container_probe(_container("created"), "http://x/health")() == WAITING
+    assert container_probe(_container(health="starting"), "http://x/health")() == READY
+    assert container_probe(_container(health="unhealthy"), "http://x/health")() == PROGRESS
+    assert container_probe(_container(health="starting"))() == WAITING
+    assert container_probe(_container(health="healthy"))() == READY
+    get.return_value.status_code = 503
+    assert container_probe(_container(), "http://x/health")() == PROGRESS
+    with pytest.raises(ProbeFailed, match="exited with code 137"):
+        container_probe(_container("exited"), "http://x/health")()
+
+
+@pytest.fixture
+def installer(mocker, tmp_path):
+    mocker.patch("docker.from_env", return_value=MagicMock())
+    inst = Installer()
+    inst.config_dir = str(tmp_path)
+    (tmp_path / "config.json").write_text('{"port": 4321}')
+    return inst
+
+
+def test_start_waits_and_returns_time_to_ready(installer, mocker):
+    container = _container("exited")
+    container.status = "exited"
+    installer.docker_client.containers.get.return_value = container
+    container.start.side_effect = lambda: container.attrs["State"].update(Status="running")
+    get = mocker.patch("requests.get", return_value=MagicMock(status_code=200))
+
+    result = installer.start()
+
+    assert result.ready and result is installer.readiness
+    get.assert_called_with("http://localhost:4321/health", timeout=2.0)
+
+
+@pytest.mark.parametrize("base_url", ["tcp://10.0.0.5:2376", "http://build-host:2375", "http+docker://ssh"])
+def test_remote_runtime_is_ready_without_localhost_probe(installer, mocker, base_url):
+    """Ports of a remote runtime are published on its host, so only the container is checked."""
+    installer.docker_client.api.base_url = base_url.replace("tcp://", "http://")
+    container = _container(health="healthy")
+    installer.docker_client.containers.get.return_value = container
+    get = mocker.patch("requests.get", side_effect=AssertionError("probed localhost"))
+
+    assert installer.start().ready
+    assert installer._http_ready(4321)
+    get.assert_not_called()
+
+
+def test_local_socket_is_probed_on_localhost(installer):
+    installer.docker_client.api.base_url = "http+docker://localhost"
+    assert installer._health_url(4321) == "http://localhost:4321/health"
+
+
+def test_restart_reports_container_crash(installer):
+    installer.docker_client.containers.get.return_value = _container("exited")
+    with pytest.raises(InstallerError, match="did not become ready: container exited"):
+        installer.restart()
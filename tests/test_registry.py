@@ -0,0 +1,131 @@
+"""
+Tests for digest-aware updates against a local stand-in registry
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import MagicMock
+
+import pytest
+
+from openwebui_installer.installer import Installer
+from openwebui_installer.registry import RegistryClient, RegistryError, parse_reference
+
+DIGEST = "sha256:" + "a" * 64
+
+
+class _RegistryHandler(BaseHTTPRequestHandler):
+    """Minimal registry: bearer-token auth plus manifest HEAD."""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith("/token"):
+            body = self.server.token_body
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_response(404)
+            self.end_headers()
+
+    def do_HEAD(self):
+        self.server.requests.append(self.path)
+        if self.headers.get("Authorization") != "Bearer secret":
+            host, port = self.server.server_address
+            self.send_response(401)
+            self.send_header(
+                "WWW-Authenticate", f'Bearer realm="http://{host}:{port}/token",service="stand-in"'
+            )
+            self.end_headers()
+        elif self.path == "/v2/open-webui/manifests/main":
+            self.send_response(200)
+            self.send_header("Docker-Content-Digest", self.server.digest)
+            self.end_headers()
+        else:
+            self.send_response(404)
+            self.end_headers()
+
+
+@pytest.fixture
+def registry():
+    server = HTTPServer(("127.0.0.1", 0), _RegistryHandler)
+    server.digest = DIGEST
+    server.requests = []
+    server.token_body = json.dumps({"token": "secret"}).encode()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("image,expected", [
+    ("ghcr.io/open-webui/open-webui:main", ("ghcr.io", "open-webui/open-webui", "main")),
+    ("ubuntu", ("registry-1.docker.io", "library/ubuntu", "latest")),
+    ("localhost:5000/app", ("localhost:5000", "app", "latest")),
+])
+def test_parse_reference(image, expected):
+    assert parse_reference(image) == expected
+
+
+def test_resolve_digest_with_token(registry):
+    """The client answers the bearer challenge and returns the digest header."""
+    image = f"127.0.0.1:{registry.server_address[1]}/open-webui:main"
+    assert RegistryClient().resolve_digest(image) == DIGEST
+
+
+def test_resolve_digest_unknown_tag(registry):
+    image = f"127.0.0.1:{registry.server_address[1]}/open-webui:nope"
+    with pytest.raises(RegistryError, match="HTTP 404"):
+        RegistryClient().resolve_digest(image)
+
+
+def test_token_endpoint_not_json(registry):
+    """A broken token endpoint is a RegistryError, so update falls back to pulling."""
+    registry.token_body = b"<html>oops</html>"
+    image = f"127.0.0.1:{registry.server_address[1]}/open-webui:main"
+    with pytest.raises(RegistryError, match="not a JSON token"):
+        RegistryClient().resolve_digest(image)
+
+
+@pytest.fixture
+def installer(tmp_path, mocker, registry):
+    """Installed Open WebUI whose running container uses the local image."""
+    mocker.patch("docker.from_env", return_value=MagicMock())
+    inst = Installer()
+    inst.config_dir = str(tmp_path)
+    image = f"127.0.0.1:{registry.server_address[1]}/open-webui:main"
+    (tmp_path / "config.json").write_text(json.dumps({"image": image, "port": 3000}))
+    mocker.patch.object(inst, "get_status", return_value={"installed": True})
+
+    local = MagicMock(id="sha256:local", attrs={"RepoDigests": [f"{image.split(':main')[0]}@{DIGEST}"]})
+    container = MagicMock(status="running", attrs={"Image": "sha256:local"})
+    inst.docker_client.images.get.return_value = local
+    inst.docker_client.containers.get.return_value = container
+    return inst
+
+
+def test_update_skips_when_digest_matches(installer):
+    """No pull and no restart when the running image is the remote digest."""
+    start = time.monotonic()
+    assert installer.update() is False
+    assert time.monotonic() - start < 1.0
+    installer.docker_client.api.pull.assert_not_called()
+    installer.docker_client.containers.run.assert_not_called()
+
+
+def test_update_pulls_and_restarts_when_digest_changed(installer, registry, mocker):
+    """A new remote digest triggers the pull and a container swap."""
+    registry.digest = "sha256:" + "b" * 64
+    swap = mocker.patch.object(installer, "_swap_container")
+    pulled = MagicMock(id="sha256:new", attrs={"RepoDigests": []})
+    installer.docker_client.images.get.return_value = pulled
+
+    assert installer.update() is True
+    installer.docker_client.api.pull.assert_called_once()
+    swap.assert_called_once_with(3000, mocker.ANY)
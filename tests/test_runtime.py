@@ -0,0 +1,236 @@
+"""
+Tests for the runtime connection module
+"""
+
+import os
+import socket
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from openwebui_installer.installer import Installer
+from openwebui_installer.runtime import RuntimeCache, RuntimeConnection
+
+
+@pytest.fixture
+def docker_client(mocker):
+    """Patch docker.from_env and return the client it hands out."""
+    client = MagicMock()
+    mocker.patch("docker.from_env", return_value=client)
+    return client
+
+
+@pytest.fixture
+def docker_socket(tmp_path, mocker):
+    """Point Docker socket detection at a file under tmp_path."""
+    sock = tmp_path / "docker.sock"
+    sock.write_text("")
+    mocker.patch("openwebui_installer.runtime.docker_socket_path", return_value=str(sock))
+    return sock
+
+
+def test_connection_is_lazy(docker_client, mocker):
+    """Creating a connection must not contact the runtime."""
+    import docker
+
+    conn = RuntimeConnection()
+    docker.from_env.assert_not_called()
+    assert not conn.opened
+
+    assert conn.client is docker_client
+    assert conn.client is docker_client
+    docker.from_env.assert_called_once()
+
+
+def test_close_does_not_open(mocker):
+    """Closing an unused connection must not open one."""
+    from_env = mocker.patch("docker.from_env")
+    RuntimeConnection().close()
+    from_env.assert_not_called()
+
+
+def test_close_does_not_wait_for_hung_open(tmp_path, mocker):
+    """close() returns at once while a connect is stuck; the late client is closed."""
+    client = MagicMock()
+
+    def slow_connect(*args, **kwargs):
+        time.sleep(0.5)
+        return client
+
+    mocker.patch("docker.from_env", side_effect=slow_connect)
+    conn = RuntimeConnection(cache_dir=str(tmp_path))
+    opener = threading.Thread(target=lambda: conn.client)
+    opener.start()
+    time.sleep(0.1)
+
+    start = time.monotonic()
+    conn.close()
+    assert time.monotonic() - start < 0.1
+
+    opener.join()
+    client.close.assert_called_once()
+    assert not conn.opened
+
+
+def test_fallback_to_podman(tmp_path, mocker):
+    """An unreachable Docker daemon falls back to Podman when installed."""
+    mocker.patch("docker.from_env", side_effect=Exception("no docker"))
+    podman_client = MagicMock()
+    podman_sock = tmp_path / "podman.sock"
+    podman_sock.write_text("")
+    mocker.patch("openwebui_installer.runtime.podman_socket_paths", return_value=[str(podman_sock)])
+    client_cls = mocker.patch("docker.DockerClient", return_value=podman_client)
+    probe = mocker.patch("openwebui_installer.runtime.podman_available", return_value=True)
+
+    conn = RuntimeConnection(cache_dir=str(tmp_path))
+    assert conn.client is podman_client
+    client_cls.assert_called_once_with(base_url=f"unix://{podman_sock}")
+    assert conn.runtime == "podman"
+    assert conn.podman_available()
+    probe.assert_called_once()
+
+
+def test_no_runtime_available(mocker):
+    """Without Docker or Podman the client is None and the error is kept."""
+    mocker.patch("docker.from_env", side_effect=Exception("no docker"))
+    mocker.patch("openwebui_installer.runtime.podman_available", return_value=False)
+
+    conn = RuntimeConnection()
+    assert conn.client is None
+    assert "no docker" in str(conn.error)
+
+
+def test_installers_share_connection(docker_client, tmp_path, mocker):
+    """Installers built on one connection reuse its client and leave it open."""
+    import docker
+
+    conn = RuntimeConnection()
+    with Installer(connection=conn) as first:
+        first.docker_client.ping()
+    with Installer(connection=conn) as second:
+        assert second.docker_client is docker_client
+
+    docker.from_env.assert_called_once()
+    docker_client.close.assert_not_called()
+
+
+def test_installer_does_not_connect_on_init(mocker):
+    """Building an Installer must not open the runtime client."""
+    from_env = mocker.patch("docker.from_env")
+    Installer()
+    from_env.assert_not_called()
+
+
+def _real_looking_client():
+    client = MagicMock()
+    client.api.api_version = "1.43"
+    client.version.return_value = {"Version": "24.0.7", "ApiVersion": "1.43", "Os": "linux"}
+    return client
+
+
+def test_warm_connection_skips_detection(tmp_path, docker_socket, mocker):
+    """A cached detection result opens the runtime without probing."""
+    from_env = mocker.patch("docker.from_env", return_value=_real_looking_client())
+    assert RuntimeConnection(cache_dir=str(tmp_path)).client is not None
+    from_env.assert_called_once_with()
+
+    from_env.reset_mock()
+    probe = mocker.patch("openwebui_installer.runtime.podman_available")
+    conn = RuntimeConnection(cache_dir=str(tmp_path))
+    assert conn.client is not None
+    from_env.assert_called_once_with(version="1.43")
+    probe.assert_not_called()
+    assert conn.capabilities["version"] == "24.0.7"
+
+
+def test_cached_podman_fallback_skips_failing_docker(tmp_path, docker_socket, mocker):
+    """Once Podman won the fallback, warm runs go straight to its socket."""
+    podman_sock = tmp_path / "podman.sock"
+    podman_sock.write_text("")
+    mocker.patch("openwebui_installer.runtime.podman_socket_paths", return_value=[str(podman_sock)])
+    from_env = mocker.patch("docker.from_env", side_effect=Exception("no docker"))
+    client_cls = mocker.patch("docker.DockerClient", return_value=_real_looking_client())
+    probe = mocker.patch("openwebui_installer.runtime.podman_available", return_value=True)
+    RuntimeConnection(cache_dir=str(tmp_path)).client
+
+    from_env.reset_mock()
+    probe.reset_mock()
+    conn = RuntimeConnection(cache_dir=str(tmp_path))
+    conn.client
+    assert conn.runtime == "podman"
+    from_env.assert_not_called()
+    probe.assert_not_called()
+    assert conn.podman_available()
+    client_cls.assert_called_with(base_url=f"unix://{podman_sock}", version="1.43")
+
+
+def test_cache_invalidated_by_socket_change(tmp_path, docker_socket):
+    """Recreating a watched socket invalidates the entry."""
+    cache = RuntimeCache(str(tmp_path / "cache.json"))
+    cache.store("docker|", {"runtime": "docker"}, sockets=[str(docker_socket)])
+    assert cache.load("docker|") is not None
+
+    # Daemon restart: the socket is recreated
+    docker_socket.unlink()
+    docker_socket.write_text("")
+    later = time.time_ns() + 5_000_000_000
+    os.utime(docker_socket, ns=(later, later))
+    assert cache.load("docker|") is None
+
+
+def test_cache_entry_expires(tmp_path, mocker):
+    """Entries older than the TTL are ignored."""
+    cache = RuntimeCache(str(tmp_path / "cache.json"), ttl=60)
+    cache.store("docker|", {"runtime": "docker"}, sockets=[])
+    assert cache.load("docker|") is not None
+
+    mocker.patch("time.time", return_value=time.time() + 120)
+    assert cache.load("docker|") is None
+
+
+def test_mock_clients_are_not_cached(tmp_path, docker_client):
+    """Clients without a concrete API version are never persisted."""
+    RuntimeConnection(cache_dir=str(tmp_path)).client
+    assert not (tmp_path / "runtime-cache.json").exists()
+
+
+def _serve_once(path, response):
+    """Answer one connection on Unix socket ``path`` with ``response``."""
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(1)
+
+    def serve():
+        conn, _ = server.accept()
+        conn.recv(65536)
+        conn.sendall(response)
+        conn.close()
+        server.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+
+
+@pytest.mark.parametrize("response,expected", [
+    (b'HTTP/1.0 200 OK\r\n\r\n{"State": {"Status": "running"}}', "running"),
+    (b'HTTP/1.0 404 Not Found\r\n\r\n{"message": "No such container"}', None),
+])
+def test_peek_container_status(tmp_path, mocker, response, expected):
+    """Status comes straight from the socket without opening the SDK client."""
+    from_env = mocker.patch("docker.from_env")
+    sock_path = str(tmp_path / "docker.sock")
+    mocker.patch.dict(os.environ, {"DOCKER_HOST": f"unix://{sock_path}"})
+    mocker.patch("openwebui_installer.runtime.podman_socket_paths", return_value=[])
+    _serve_once(sock_path, response)
+
+    conn = RuntimeConnection(cache_dir=str(tmp_path))
+    assert conn.peek_container_status("open-webui") == expected
+    assert not conn.opened
+    from_env.assert_not_called()
+
+
+def test_peek_needs_local_socket(tmp_path, mocker):
+    mocker.patch.dict(os.environ, {"DOCKER_HOST": "tcp://10.0.0.1:2375"})
+    with pytest.raises(LookupError):
+        RuntimeConnection(cache_dir=str(tmp_path)).peek_container_status("open-webui")
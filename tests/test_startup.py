@@ -0,0 +1,103 @@
+"""
+Startup cost tests for the CLI
+
+Each command is run in a fresh interpreter with ``-X importtime`` and the
+import time spent after interpreter startup is compared with a budget.
+``--version`` and ``--help`` must stay under 100 ms and ``status`` (which
+also loads the installer and rich for its output) under 150 ms, both before
+and after installation. Set
+``OPENWEBUI_IMPORT_BUDGET_SCALE`` to stretch the budgets on slow machines.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+IMPORT_BUDGET_MS = {
+    "--version": 100,
+    "--help": 100,
+    "status": 150,
+    "status-installed": 150,
+}
+
+# Cases run with an existing config, which is what monitoring scripts poll
+INSTALLED_CASES = {"status-installed": "status"}
+
+HEAVY_MODULES = ("docker", "requests", "dotenv", "rich", "PyQt6")
+
+# status prints styled output, so it is allowed to load rich; once installed
+# it also reads .env, which may point DOCKER_HOST elsewhere
+ALLOWED_MODULES = {"status": ["rich"], "status-installed": ["dotenv", "rich"]}
+
+MARKER = "@@openwebui-start"
+
+SCRIPT = f"""
+import sys
+sys.stderr.write({MARKER!r} + "\\n")
+sys.stderr.flush()
+sys.argv = ["openwebui-installer", sys.argv[1]]
+from openwebui_installer.cli import main
+try:
+    main()
+except SystemExit:
+    pass
+print("loaded:" + ",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))
+"""
+
+
+def _run_cli(case: str, home: Path):
+    """Run the CLI entry point and return (import time in ms, heavy modules loaded)."""
+    arg = INSTALLED_CASES.get(case, case)
+    if case in INSTALLED_CASES:
+        config_dir = home / ".openwebui"
+        config_dir.mkdir(exist_ok=True)
+        (config_dir / "config.json").write_text('{"port": 3000, "model": "llama2", "version": "main"}')
+    # Point the runtime at a socket that does not exist so nothing real is queried
+    env = dict(os.environ, HOME=str(home), PYTHONPATH=str(ROOT), DOCKER_HOST=f"unix://{home}/docker.sock")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SCRIPT, arg],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+
+    stderr = result.stderr.split(MARKER, 1)[1]
+    total_us = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative_us, name = line.split("|")
+        # Only top-level entries; their cumulative time already covers children
+        if not name.startswith("   "):
+            total_us += int(cumulative_us)
+
+    loaded_line = result.stdout.rsplit("loaded:", 1)[1].strip()
+    loaded = [m for m in loaded_line.split(",") if m]
+    return total_us / 1000, loaded
+
+
+@pytest.mark.parametrize("arg", sorted(IMPORT_BUDGET_MS))
+def test_cli_does_not_import_heavy_modules(arg, tmp_path):
+    """Runtime and HTTP libraries must not load for cheap commands."""
+    _, loaded = _run_cli(arg, tmp_path)
+    assert loaded == ALLOWED_MODULES.get(arg, [])
+
+
+@pytest.mark.parametrize("arg", sorted(IMPORT_BUDGET_MS))
+def test_cli_import_time_budget(arg, tmp_path):
+    """Import time after interpreter startup stays within the stated budget."""
+    scale = float(os.environ.get("OPENWEBUI_IMPORT_BUDGET_SCALE", "1"))
+    budget = IMPORT_BUDGET_MS[arg] * scale
+
+    # Warm the bytecode cache so compilation is not counted
+    _run_cli(arg, tmp_path)
+    elapsed = min(_run_cli(arg, tmp_path)[0] for _ in range(3))
+
+    assert elapsed <= budget, f"{arg}: {elapsed:.1f} ms of imports exceeds {budget:.0f} ms budget"
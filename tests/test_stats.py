@@ -0,0 +1,93 @@
+"""
+Tests for container resource sampling
+"""
+
+import math
+from unittest.mock import MagicMock
+
+import pytest
+
+from openwebui_installer.stats import RingBuffer, StatsSampler, container_sample, decimate
+
+
+def test_ring_buffer_keeps_last_capacity_samples():
+    buffer = RingBuffer(("cpu", "memory"), capacity=4)
+    for i in range(10):
+        buffer.append(float(i), {"cpu": i * 10.0})
+
+    times, values = buffer.series("cpu")
+    assert len(buffer) == 4
+    assert list(times) == [6.0, 7.0, 8.0, 9.0]
+    assert list(values) == [60.0, 70.0, 80.0, 90.0]
+    assert math.isnan(buffer.latest("memory"))
+    assert list(buffer.series("cpu", since=8.0)[1]) == [80.0, 90.0]
+
+
+def test_decimate_bounds_points_and_keeps_spikes():
+    times = list(range(10000))
+    values = [1.0] * 10000
+    values[4321] = 99.0
+    values[10] = math.nan
+
+    out_t, out_v = decimate(times, values, 200)
+
+    assert len(out_t) <= 200
+    assert out_t == sorted(out_t)
+    assert 99.0 in out_v
+    assert not any(math.isnan(v) for v in out_v)
+    assert decimate([1, 2], [3.0, 4.0], 200) == ([1, 2], [3.0, 4.0])
+
+
+def _stats(total, system, rx, read, usage=300, cache=100):
+    return {
+        "cpu_stats": {"cpu_usage": {"total_usage": total}, "system_cpu_usage": system, "online_cpus": 4},
+        "precpu_stats": {"cpu_usage": {"total_usage": 0}, "system_cpu_usage": 0},
+        "memory_stats": {"usage": usage, "stats": {"inactive_file": cache}},
+        "networks": {"eth0": {"rx_bytes": rx, "tx_bytes": 0}, "eth1": {"rx_bytes": rx, "tx_bytes": 5}},
+        "blkio_stats": {"io_service_bytes_recursive": [
+            {"op": "Read", "value": read}, {"op": "write", "value": 7},
+        ]},
+    }
+
+
+def test_container_sample():
+    sample = container_sample(_stats(total=50, system=100, rx=10, read=3))
+    assert sample["cpu"] == pytest.approx(200.0)
+    assert sample["memory"] == 200
+    assert (sample["net_rx"], sample["net_tx"]) == (20, 5)
+    assert (sample["block_read"], sample["block_write"]) == (3, 7)
+
+
+def test_sampler_turns_counters_into_rates_and_samples_ollama():
+    clock = iter([100.0, 102.0])
+    ollama = MagicMock()
+    ollama.cpu_percent.return_value = 150.0
+    ollama.memory_info.return_value.rss = 4096
+    sampler = StatsSampler(MagicMock(), None, ollama_finder=lambda: ollama, clock=lambda: next(clock))
+
+    _, first = sampler.sample(_stats(total=50, system=100, rx=1000, read=0))
+    now, second = sampler.sample(_stats(total=50, system=100, rx=3000, read=2048))
+
+    assert "net_rx" not in first
+    assert now == 102.0
+    assert second["net_rx"] == 2000  # (6000 - 2000) bytes over 2 seconds
+    assert second["block_read"] == 1024
+    assert (second["ollama_cpu"], second["ollama_memory"]) == (150.0, 4096)
+
+
+def test_sampler_streams_into_buffer_until_stopped():
+    client = MagicMock()
+    buffer = RingBuffer()
+    sampler = StatsSampler(client, buffer.append, ollama_finder=lambda: None)
+
+    def stream(**kwargs):
+        for i in range(3):
+            yield _stats(total=50, system=100, rx=i, read=0)
+        sampler.stop()
+        yield _stats(total=50, system=100, rx=9, read=0)
+
+    client.containers.get.return_value.stats.side_effect = stream
+    sampler.run()
+
+    client.containers.get.return_value.stats.assert_called_once_with(stream=True, decode=True)
+    assert len(buffer) == 3
@@ -0,0 +1,104 @@
+"""
+Tests for the event-driven status watcher
+"""
+
+import threading
+from unittest.mock import MagicMock
+
+import docker
+import pytest
+
+from openwebui_installer.watcher import StatusWatcher
+
+
+def _event(action, **attributes):
+    return {"Type": "container", "Action": action, "Actor": {"Attributes": {"name": "open-webui", **attributes}}}
+
+
+def _stop_after(events, watcher):
+    yield from events
+    watcher.stop()
+
+
+@pytest.fixture
+def installer():
+    installer = MagicMock()
+    installer.get_status.return_value = {"installed": True, "running": True, "port": 3000}
+    container = installer.docker_client.containers.get.return_value
+    container.status = "running"
+    container.attrs = {"State": {"Running": True, "Health": {"Status": "healthy"}}}
+    return installer
+
+
+def test_snapshot_then_events(installer):
+    """One snapshot, then every watched event is applied and reported, including crash loops."""
+    changes = []
+    watcher = StatusWatcher(installer, changes.append)
+    installer.docker_client.events.return_value = _stop_after([
+        _event("die", exitCode="1"),
+        _event("start"),
+        _event("exec_create: sh"),
+        _event("health_status: unhealthy"),
+        _event("oom"),
+        _event("die", exitCode="137"),
+    ], watcher)
+
+    watcher.run()
+
+    installer.docker_client.events.assert_called_once_with(
+        decode=True, filters={"type": "container", "container": "open-webui"}
+    )
+    assert installer.get_status.call_count == 1
+    assert [c.action for c in changes] == ["snapshot", "die", "start", "health_status", "oom", "die"]
+    assert changes[0].status["health"] == "healthy"
+    assert (changes[1].status["running"], changes[1].status["exit_code"]) == (False, 1)
+    assert changes[2].status["running"] is True
+    assert changes[3].status["health"] == "unhealthy"
+    final = changes[-1].status
+    assert (final["running"], final["exit_code"], final["oom"]) == (False, 137, True)
+
+
+def test_missing_container_snapshot(installer):
+    installer.docker_client.containers.get.side_effect = docker.errors.NotFound("gone")
+    watcher = StatusWatcher(installer, lambda change: None)
+    assert watcher.snapshot()["running"] is False
+
+
+def test_reconnects_after_stream_error(installer, mocker):
+    """A broken stream is reopened and a fresh snapshot taken."""
+    mocker.patch("openwebui_installer.watcher.Backoff.next", return_value=0)
+    changes = []
+    watcher = StatusWatcher(installer, changes.append)
+
+    def broken():
+        yield _event("die", exitCode="0")
+        raise ConnectionError("daemon restarted")
+
+    installer.docker_client.events.side_effect = [broken(), _stop_after([_event("start")], watcher)]
+
+    watcher.run()
+
+    assert [c.action for c in changes] == ["snapshot", "die", "snapshot", "start"]
+    assert installer.get_status.call_count == 2
+
+
+def test_stop_interrupts_blocked_stream(installer):
+    """stop() closes the stream so a watcher blocked on a quiet container returns."""
+    closed = threading.Event()
+
+    class Stream:
+        def __iter__(self):
+            closed.wait(5)
+            return iter(())
+
+        def close(self):
+            closed.set()
+
+    installer.docker_client.events.return_value = Stream()
+    watcher = StatusWatcher(installer, lambda change: None)
+    thread = threading.Thread(target=watcher.run)
+    thread.start()
+    watcher.stop()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert closed.is_set()